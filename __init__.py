@@ -7,7 +7,8 @@ try:
         SelfConsistencyStrategy,
         TreeOfThoughtStrategy,
         SkeletonOfThoughtStrategy,
-        ReActStrategy
+        ReActStrategy,
+        register_strategy
     )
 except ImportError:
     # Fallback for when running as a script
@@ -19,7 +20,8 @@ except ImportError:
         SelfConsistencyStrategy,
         TreeOfThoughtStrategy,
         SkeletonOfThoughtStrategy,
-        ReActStrategy
+        ReActStrategy,
+        register_strategy
     )
 
 __all__ = [
@@ -31,5 +33,6 @@ __all__ = [
     'TreeOfThoughtStrategy',
     'SkeletonOfThoughtStrategy',
     'ReActStrategy',
+    'register_strategy',
 ]
 
@@ -0,0 +1,356 @@
+"""Streaming batch improvement of prompts read from JSONL or plain-text lines."""
+import argparse
+import io
+import json
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+
+FORMATS = ("auto", "jsonl", "lines")
+
+
+class BatchItem:
+    """One input line: a prompt with optional per-item strategy and kwargs."""
+    
+    __slots__ = ("id", "prompt", "strategy", "kwargs", "error")
+    
+    def __init__(
+        self,
+        id: Any,
+        prompt: Optional[str] = None,
+        strategy: Optional[str] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ):
+        self.id = id
+        self.prompt = prompt
+        self.strategy = strategy
+        self.kwargs = kwargs or {}
+        self.error = error
+
+
+def parse_line(line: str, line_number: int, format: str = "auto") -> Optional[BatchItem]:
+    """
+    Parse one input line into a BatchItem.
+    
+    JSONL lines are objects with a "prompt" and optional "id" (default: the line
+    number), "strategy" and "kwargs" (an object of strategy parameters), or a
+    bare JSON string. Plain lines are the prompt itself. In "auto" format, lines
+    starting with "{" that parse as a JSON object are JSONL, anything else is plain.
+    
+    Args:
+        line: Input line, with or without its newline
+        line_number: 1-based line number, the default item id
+        format: "auto", "jsonl" or "lines"
+    
+    Returns:
+        The parsed item (holding an error message if the line is invalid), or None
+        for a blank line
+    """
+    text = line.rstrip("\r\n")
+    if not text.strip():
+        return None
+    if format == "lines" or (format == "auto" and not text.lstrip().startswith("{")):
+        return BatchItem(line_number, prompt=text)
+    
+    try:
+        record = json.loads(text)
+    except ValueError as e:
+        if format == "auto":
+            return BatchItem(line_number, prompt=text)
+        return BatchItem(line_number, error=f"Invalid JSON: {e}")
+    
+    if isinstance(record, str):
+        return BatchItem(line_number, prompt=record)
+    if not isinstance(record, dict):
+        return BatchItem(line_number, error="Expected a JSON object or string")
+    item_id = record.get("id", line_number)
+    prompt = record.get("prompt")
+    kwargs = record.get("kwargs", {})
+    if not isinstance(prompt, str):
+        return BatchItem(item_id, error="Missing or non-string 'prompt'")
+    if not isinstance(kwargs, dict):
+        return BatchItem(item_id, error="'kwargs' must be a JSON object")
+    return BatchItem(item_id, prompt=prompt, strategy=record.get("strategy"), kwargs=kwargs)
+
+
+def read_items(lines: Iterable[str], format: str = "auto") -> Iterator[BatchItem]:
+    """
+    Lazily parse input lines into BatchItems, skipping blank lines.
+    
+    Args:
+        lines: Input lines (a file object works and is read one line at a time)
+        format: "auto", "jsonl" or "lines"
+    
+    Raises:
+        ValueError: If format is not recognized
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format: {format}. Use one of: {', '.join(FORMATS)}")
+    for line_number, line in enumerate(lines, 1):
+        item = parse_line(line, line_number, format)
+        if item is not None:
+            yield item
+
+
+def run_batch(
+    improver,
+    items: Iterable[BatchItem],
+    strategy: Optional[str] = None,
+    concurrency: int = 8,
+    ordered: bool = False,
+    **kwargs
+) -> Iterator[Dict[str, Any]]:
+    """
+    Improve a stream of items on a thread pool, yielding results as they complete.
+    
+    At most ``2 * concurrency`` items are read ahead of the results, so memory
+    stays bounded however long the input is. Failures are yielded as results
+    with an "error" key instead of stopping the batch.
+    
+    Args:
+        improver: PromptImprover used for every item
+        items: Items to improve (consumed lazily)
+        strategy: Strategy for items that do not name one
+        concurrency: Number of worker threads (default: 8)
+        ordered: Yield results in input order instead of completion order
+        **kwargs: Strategy parameters for every item; per-item kwargs take precedence
+    
+    Yields:
+        {"id", "strategy", "improved_prompt"} or {"id", "strategy", "error"} dicts
+    
+    Raises:
+        ValueError: If concurrency is less than 1
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    
+    def process(item: BatchItem) -> Dict[str, Any]:
+        name = item.strategy or strategy
+        if item.error is not None:
+            return {"id": item.id, "strategy": name, "error": item.error}
+        if name is None:
+            return {"id": item.id, "strategy": None, "error": "No strategy given for this item"}
+        try:
+            improved = improver.improve(item.prompt, name, **{**kwargs, **item.kwargs})
+        except Exception as e:
+            return {"id": item.id, "strategy": name, "error": str(e)}
+        return {"id": item.id, "strategy": name, "improved_prompt": improved}
+    
+    if concurrency == 1:
+        # No read-ahead or thread hand-off needed; results are already in order
+        for item in items:
+            yield process(item)
+        return
+    
+    max_pending = 2 * concurrency
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        if ordered:
+            queue = deque()
+            for item in items:
+                if len(queue) >= max_pending:
+                    yield queue.popleft().result()
+                queue.append(pool.submit(process, item))
+            while queue:
+                yield queue.popleft().result()
+        else:
+            pending = set()
+            for item in items:
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                pending.add(pool.submit(process, item))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+
+def write_results(results: Iterable[Dict[str, Any]], out: TextIO) -> Dict[str, int]:
+    """
+    Write results as JSON lines, flushing each so consumers see it immediately.
+    
+    Returns:
+        Counts of 'succeeded' and 'failed' results
+    """
+    counts = {"succeeded": 0, "failed": 0}
+    for result in results:
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+        counts["failed" if "error" in result else "succeeded"] += 1
+    return counts
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser of the batch subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Improve a stream of prompts read from JSONL or plain-text lines",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Input lines are either plain prompts or JSON objects:
+  {"id": "q1", "prompt": "Explain recursion", "strategy": "role", "kwargs": {"role": "a teacher"}}
+
+Each result is written as one JSON line, in completion order unless --ordered:
+  {"id": "q1", "strategy": "role", "improved_prompt": "..."}
+  {"id": 7, "strategy": "cot", "error": "..."}
+
+Examples:
+  python main.py batch prompts.txt --strategy cot --offline > improved.jsonl
+  cat prompts.jsonl | python main.py batch --strategy role -j 16 -o improved.jsonl
+
+Resumable jobs (--job-dir) shard the input file across worker processes and
+checkpoint completed lines; rerun the same command to resume after a crash:
+  python main.py batch corpus.jsonl --job-dir corpus.job --shards 8 -s cot --offline
+        """
+    )
+    parser.add_argument("input", nargs="?", default="-", help="Input file, or - for stdin (default)")
+    parser.add_argument("--output", "-o",
+                        help="Output file, or - for stdout (default: stdout, or output.jsonl in --job-dir)")
+    parser.add_argument("--strategy", "-s", help="Strategy for lines that do not name one")
+    parser.add_argument("--format", choices=FORMATS, default="auto", help="Input format (default: auto)")
+    parser.add_argument("--concurrency", "-j", type=int,
+                        help="Worker threads (default: 8, or 1 per process with --job-dir)")
+    parser.add_argument("--ordered", action="store_true", help="Write results in input order")
+    parser.add_argument("--job-dir", help="Run as a resumable, checkpointed job in this directory")
+    parser.add_argument("--shards", type=int, help="Input shards of a job (default: number of CPUs)")
+    parser.add_argument("--processes", type=int, help="Worker processes of a job (default: one per shard)")
+    parser.add_argument("--role", help="Role for role strategy")
+    parser.add_argument("--domain", help="Domain for react strategy")
+    parser.add_argument("--num-examples", type=int, help="Number of examples for few-shot strategy")
+    parser.add_argument("--num-paths", type=int, help="Number of paths for self-consistency strategy")
+    parser.add_argument("--num-branches", type=int, help="Number of branches for tree-of-thought strategy")
+    parser.add_argument("--num-points", type=int, help="Number of points for skeleton-of-thought strategy")
+    parser.add_argument("--provider", choices=["openai", "gemini"], default="openai",
+                        help="LLM provider to use: openai or gemini (default: openai)")
+    parser.add_argument("--model", help="Model name to use")
+    parser.add_argument("--offline", action="store_true",
+                        help="Template-only mode: no LLM client, provider SDK or API key is needed")
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Run the batch subcommand.
+    
+    Returns:
+        Exit status: 0 if every item succeeded, 1 if any failed
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.concurrency is not None and args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    
+    kwargs = {
+        name: getattr(args, name)
+        for name in ("role", "domain", "num_examples", "num_paths", "num_branches", "num_points")
+        if getattr(args, name) is not None
+    }
+    if args.job_dir:
+        return _run_job(parser, args, kwargs)
+    if args.shards is not None or args.processes is not None:
+        parser.error("--shards and --processes require --job-dir")
+    
+    try:
+        from .improver import PromptImprover
+    except ImportError:
+        from improver import PromptImprover
+    if args.offline:
+        improver = PromptImprover(offline=True)
+    else:
+        try:
+            from .llm_client import LLMClient
+        except ImportError:
+            from llm_client import LLMClient
+        improver = PromptImprover(llm_client=LLMClient(provider=args.provider, model_name=args.model))
+    if args.strategy is not None:
+        try:
+            improver.get_strategy_info(args.strategy)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    output = args.output or "-"
+    if args.input == "-":
+        source = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace")
+    else:
+        source = open(args.input, encoding="utf-8", errors="replace")
+    if output == "-":
+        out = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+    else:
+        out = open(output, "w", encoding="utf-8")
+    
+    try:
+        results = run_batch(
+            improver,
+            read_items(source, args.format),
+            strategy=args.strategy,
+            concurrency=args.concurrency or 8,
+            ordered=args.ordered,
+            **kwargs
+        )
+        counts = write_results(results, out)
+    except BrokenPipeError:
+        # The consumer (e.g. `head`) stopped reading; not an error
+        return 0
+    finally:
+        # Detach rather than close the stdio wrappers, leaving sys.stdin/stdout usable
+        for stream, is_stdio in ((source, args.input == "-"), (out, output == "-")):
+            try:
+                if is_stdio:
+                    stream.flush()
+                    stream.detach()
+                else:
+                    stream.close()
+            except (BrokenPipeError, ValueError):
+                pass
+    
+    print(f"Improved {counts['succeeded']} prompts ({counts['failed']} failed)", file=sys.stderr)
+    return 1 if counts["failed"] else 0
+
+
+def _run_job(parser: argparse.ArgumentParser, args: argparse.Namespace, kwargs: Dict[str, Any]) -> int:
+    """Run the batch subcommand as a resumable BatchJob (see jobs.BatchJob)."""
+    if args.input == "-":
+        parser.error("--job-dir needs an input file; stdin cannot be resumed")
+    if args.ordered:
+        parser.error("--ordered cannot be combined with --job-dir")
+    if args.output == "-":
+        parser.error("--job-dir writes its merged output to a file; pass a path to --output")
+    try:
+        from .improver import PromptImprover
+        from .jobs import BatchJob
+    except ImportError:
+        from improver import PromptImprover
+        from jobs import BatchJob
+    if args.strategy is not None:
+        try:
+            PromptImprover(offline=True).get_strategy_info(args.strategy)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    try:
+        job = BatchJob(
+            args.input,
+            args.job_dir,
+            strategy=args.strategy,
+            shards=args.shards,
+            processes=args.processes,
+            concurrency=args.concurrency or 1,
+            format=args.format,
+            offline=args.offline,
+            provider=args.provider,
+            model_name=args.model,
+            **kwargs
+        )
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    totals = job.run(args.output)
+    
+    print(
+        f"Improved {totals['succeeded']} prompts ({totals['failed']} failed, "
+        f"{totals['skipped']} already done); wrote {totals['merged']} results to {totals['output']}",
+        file=sys.stderr
+    )
+    return 1 if totals["failed"] else 0
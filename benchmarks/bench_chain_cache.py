@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-call overhead of LLMClient with and without the compiled chain cache.
+
+Uses an in-process fake chat model, so the numbers measure only template parsing,
+runnable construction and invocation overhead (no network).
+
+Usage:
+    python benchmarks/bench_chain_cache.py [--calls N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from llm_client import LLMClient
+
+TEMPLATE = """You are an expert prompt engineer.
+
+Task: {prompt}
+
+Instructions:
+1. Keep the original intent
+2. Make the request specific and unambiguous
+
+Improved prompt:"""
+
+
+def make_client(chain_cache_size: int) -> LLMClient:
+    """Build an OpenAI-configured client whose llm is replaced by a fake model."""
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    client = LLMClient(provider="openai", chain_cache_size=chain_cache_size)
+    client.llm = FakeListChatModel(responses=["ok"])
+    return client
+
+
+def time_calls(client: LLMClient, calls: int) -> float:
+    """Return mean microseconds per invoke() call."""
+    client.invoke(TEMPLATE, prompt="warm-up")
+    start = time.perf_counter()
+    for i in range(calls):
+        client.invoke(TEMPLATE, prompt=f"Explain recursion #{i}")
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    """Run the benchmark and print a small report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=2000, help='Calls per configuration (default: 2000)')
+    args = parser.parse_args()
+    
+    uncached = time_calls(make_client(chain_cache_size=0), args.calls)
+    cached_client = make_client(chain_cache_size=128)
+    cached = time_calls(cached_client, args.calls)
+    
+    print(f"calls per configuration : {args.calls}")
+    print(f"without chain cache     : {uncached:9.1f} us/call")
+    print(f"with chain cache        : {cached:9.1f} us/call")
+    print(f"overhead saved          : {uncached - cached:9.1f} us/call ({(1 - cached / uncached) * 100:.0f}%)")
+    print(f"cache stats             : {cached_client.get_chain_cache_stats()}")
+
+
+if __name__ == '__main__':
+    main()
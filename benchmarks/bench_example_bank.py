@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark building, loading and querying a few-shot ExampleBank.
+
+Builds a synthetic bank, saves it, memory-maps it back and times top-k
+retrieval against a brute-force Python scan over the same example dicts.
+
+Usage:
+    python benchmarks/bench_example_bank.py [--examples N] [--queries N] [--k K]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from example_bank import ExampleBank, tokenize
+
+WORDS = [f"w{i}" for i in range(5000)] + ["explain", "write", "list", "python", "summarize", "the", "a", "of"]
+
+
+def make_examples(n: int, rng: random.Random):
+    """Yield n synthetic examples with Zipf-like word frequencies."""
+    weights = [1 / (i + 1) for i in range(len(WORDS))]
+    for i in range(n):
+        words = rng.choices(WORDS, weights=weights, k=rng.randint(5, 20))
+        yield {"input": " ".join(words), "output": f"answer {i}"}
+
+
+def brute_force(examples, query: str, k: int):
+    """Rank examples by shared query terms with a plain Python scan."""
+    terms = set(tokenize(query))
+    scores = [(len(terms & set(tokenize(e["input"]))), -i) for i, e in enumerate(examples)]
+    return [-i for _, i in sorted(scores, reverse=True)[:k]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--examples", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    examples = list(make_examples(args.examples, rng))
+    queries = [" ".join(rng.choices(WORDS[:500], k=6)) for _ in range(args.queries)]
+    
+    start = time.perf_counter()
+    bank = ExampleBank.build(examples)
+    build_s = time.perf_counter() - start
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        bank.save(tmp)
+        start = time.perf_counter()
+        loaded = ExampleBank.load(tmp)
+        load_ms = (time.perf_counter() - start) * 1e3
+        
+        start = time.perf_counter()
+        for query in queries:
+            loaded.search(query, args.k)
+        search_us = (time.perf_counter() - start) / len(queries) * 1e6
+    
+    scan_queries = queries[:max(1, len(queries) // 20)]
+    start = time.perf_counter()
+    for query in scan_queries:
+        brute_force(examples, query, args.k)
+    scan_us = (time.perf_counter() - start) / len(scan_queries) * 1e6
+    
+    print(f"Examples:            {args.examples:,}")
+    print(f"Build:               {build_s:.2f} s")
+    print(f"Load (mmap):         {load_ms:.1f} ms")
+    print(f"Top-{args.k} search:        {search_us:,.0f} us/query")
+    print(f"Brute-force scan:    {scan_us:,.0f} us/query  ({scan_us / search_us:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark /improve throughput of the HTTP service with and without micro-batching.
+
+Starts an in-process offline server per configuration and drives it with
+concurrent keep-alive clients, reporting requests per second, mean latency and
+the mean micro-batch size.
+
+Template strategies are so cheap that batching them mostly adds waiting; the
+gain shows with LLM-backed strategies, simulated here by a strategy whose calls
+take --llm-ms milliseconds with at most --llm-concurrency calls in flight, one
+batched call costing the same as a single one.
+
+Usage:
+    python benchmarks/bench_server.py [--clients N] [--requests N] [--strategy cot]
+    python benchmarks/bench_server.py --strategy fake-llm [--llm-ms 20] [--llm-concurrency 4]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from improver import PromptImprover
+from server import ImproverServer
+from strategies import BaseStrategy, StrategyRegistry
+
+
+class FakeLLMStrategy(BaseStrategy):
+    """Strategy whose every call (single or batched) takes a fixed provider latency."""
+    
+    latency = 0.02
+    limit = None
+    
+    def improve(self, prompt: str, **kwargs) -> str:
+        return prompt
+    
+    async def aimprove(self, prompt: str, **kwargs) -> str:
+        async with self.limit:
+            await asyncio.sleep(self.latency)
+        return prompt
+    
+    async def aimprove_batch(self, prompts, **kwargs):
+        async with self.limit:
+            await asyncio.sleep(self.latency)
+        return list(prompts)
+    
+    def get_strategy_name(self) -> str:
+        return "Fake LLM"
+
+
+async def client(port: int, requests: int, body: bytes, latencies: list) -> None:
+    """Send requests one after another on one keep-alive connection."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = f"POST /improve HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+    for _ in range(requests):
+        start = time.perf_counter()
+        writer.write(head + body)
+        await writer.drain()
+        await reader.readline()
+        length = 0
+        while (line := await reader.readline()) != b"\r\n":
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def run(batch_window, args) -> dict:
+    FakeLLMStrategy.latency = args.llm_ms / 1000
+    FakeLLMStrategy.limit = asyncio.Semaphore(args.llm_concurrency)
+    registry = StrategyRegistry(entry_point_group=None)
+    registry.register("fake-llm", FakeLLMStrategy)
+    improver = PromptImprover(offline=True, registry=registry)
+    server = ImproverServer(improver, port=0, batch_window=batch_window)
+    await server.start()
+    body = json.dumps({"prompt": "Explain recursion " * 20, "strategy": args.strategy}).encode()
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(server.port, args.requests, body, latencies) for _ in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    stats = server.get_batching_stats()
+    await server.shutdown()
+    return {
+        "rps": len(latencies) / elapsed,
+        "latency_ms": sum(latencies) / len(latencies) * 1e3,
+        "mean_batch": stats["mean_batch_size"] if stats else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--strategy", default="cot", help="Strategy to request, or fake-llm")
+    parser.add_argument("--llm-ms", type=float, default=20.0, help="Latency of one fake-llm call")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="Fake-llm calls allowed in flight")
+    args = parser.parse_args()
+    
+    print(f"{args.clients} clients x {args.requests} requests, strategy {args.strategy}")
+    print(f"{'Batching':<18} {'req/s':>10} {'latency ms':>12} {'mean batch':>12}")
+    for label, window in [("off", None), ("same pass (0 ms)", 0.0), ("1 ms window", 0.001), ("5 ms window", 0.005)]:
+        result = asyncio.run(run(window, args))
+        print(f"{label:<18} {result['rps']:>10,.0f} {result['latency_ms']:>12.2f} {result['mean_batch']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark each strategy's improve() against per-call PromptTemplate rendering.
+
+The "PromptTemplate" column rebuilds and formats a langchain PromptTemplate (or
+FewShotPromptTemplate) on every call, which is what the strategies did before
+their templates were precompiled; the "improve()" column is the current strategy.
+
+Usage:
+    python benchmarks/bench_strategies.py [--calls N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.prompts import FewShotPromptTemplate, PromptTemplate
+from improver import PromptImprover
+
+PROMPT = "Explain how a hash map handles collisions"
+VARIABLES = {'num_paths': 3, 'num_branches': 3, 'num_points': 5, 'domain_context': ""}
+EXAMPLE_BANK = [{'input': f"Example input {i}", 'output': f"Example output {i}"} for i in range(20)]
+
+
+def time_call(func, calls: int) -> float:
+    """Return mean microseconds per call of func()."""
+    func()
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def few_shot_legacy() -> str:
+    """Render the example bank the way FewShotStrategy did before caching."""
+    example_prompt = PromptTemplate(input_variables=["input", "output"], template="Input: {input}\nOutput: {output}")
+    return FewShotPromptTemplate(
+        examples=EXAMPLE_BANK,
+        example_prompt=example_prompt,
+        prefix="Here are some examples:\n",
+        suffix="\nNow, following the pattern above:\n{prompt}",
+        input_variables=["prompt"]
+    ).format(prompt=PROMPT)
+
+
+def main():
+    """Run the benchmark and print one row per strategy."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=20000, help='Calls per strategy (default: 20000)')
+    args = parser.parse_args()
+    
+    improver = PromptImprover(offline=True)
+    print(f"{'strategy':18} {'PromptTemplate':>16} {'improve()':>12} {'speedup':>9}")
+    for key in improver.strategies.registry.keys():
+        strategy = improver.strategies[key]
+        current = time_call(lambda: strategy.improve(PROMPT), args.calls)
+        
+        compiled = getattr(strategy, 'TEMPLATE', None)
+        if compiled is None:
+            print(f"{key:18} {'-':>16} {current:9.2f} us {'-':>9}")
+            continue
+        variables = {name: VARIABLES.get(name, PROMPT) for name in compiled.input_variables}
+        legacy = time_call(
+            lambda: PromptTemplate(input_variables=compiled.input_variables, template=compiled.template).format(**variables),
+            args.calls
+        )
+        print(f"{key:18} {legacy:13.2f} us {current:9.2f} us {legacy / current:8.1f}x")
+    
+    # Few-shot with a 20-example bank: cached example block vs FewShotPromptTemplate
+    strategy = improver.strategies['few-shot']
+    strategy.examples = EXAMPLE_BANK
+    current = time_call(lambda: strategy.improve(PROMPT, num_examples=len(EXAMPLE_BANK)), args.calls)
+    legacy = time_call(few_shot_legacy, args.calls // 10 or 1)
+    print(f"{'few-shot (20 ex.)':18} {legacy:13.2f} us {current:9.2f} us {legacy / current:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
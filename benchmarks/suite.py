@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite with JSON results and regression checks against a stored baseline.
+
+Measures per-strategy improve() throughput for small, medium and multi-MB prompts,
+LLMClient.invoke overhead against an in-process fake chat model, PromptImprover
+construction and CLI cold start. Every result is the median time per operation
+over several repeats; each repeat runs enough loops to last at least --min-time.
+
+Usage:
+    python benchmarks/suite.py [--filter REGEX] [--quick] [--output results.json]
+    python benchmarks/suite.py --output benchmarks/baseline.json
+    python benchmarks/suite.py --compare benchmarks/baseline.json [--threshold 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from improver import PromptImprover
+from llm_client import LLMClient
+
+FORMAT_VERSION = 1
+
+PARAGRAPH = (
+    "Explain how a hash map handles collisions, compare separate chaining with open "
+    "addressing, and describe how the load factor affects lookup performance.\n"
+)
+PROMPTS = {
+    "small": "Explain how a hash map handles collisions",
+    "medium": PARAGRAPH * 25,
+    "large": PARAGRAPH * 12500,
+}
+
+TEMPLATE = """You are an expert prompt engineer.
+
+Task: {prompt}
+
+Improved prompt:"""
+
+# (name, function to time, bytes processed per call or None, fixed loop count or None)
+Benchmark = Tuple[str, Callable[[], Any], Optional[int], Optional[int]]
+
+
+def improve_benchmarks() -> Iterator[Benchmark]:
+    """Every registered strategy's improve() on each prompt size."""
+    improver = PromptImprover(offline=True)
+    for key in improver.strategies.registry.keys():
+        strategy = improver.strategies[key]
+        for size, prompt in PROMPTS.items():
+            yield f"improve/{key}/{size}", lambda s=strategy, p=prompt: s.improve(p), len(prompt.encode()), None
+
+
+def llm_client_benchmarks() -> Iterator[Benchmark]:
+    """LLMClient.invoke against a fake chat model, and the fake model on its own."""
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    fake = FakeListChatModel(responses=["ok"])
+    for name, cache_size in (("invoke", 128), ("invoke_uncached", 0)):
+        client = LLMClient(provider="openai", chain_cache_size=cache_size)
+        client.llm = fake
+        yield f"llm_client/{name}", lambda c=client: c.invoke(TEMPLATE, prompt=PROMPTS["small"]), None, None
+    # The floor: what the fake model itself costs per call
+    message = TEMPLATE.format(prompt=PROMPTS["small"])
+    yield "llm_client/fake_model", lambda: fake.invoke(message), None, None
+
+
+def construct_benchmarks() -> Iterator[Benchmark]:
+    """PromptImprover construction, offline and with a (lazily built) provider client."""
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    yield "construct/offline", lambda: PromptImprover(offline=True), None, None
+    yield "construct/openai", lambda: PromptImprover(provider="openai"), None, None
+
+
+def cli_benchmarks() -> Iterator[Benchmark]:
+    """Fresh-interpreter CLI runs, in-process (a daemon would hide the startup cost)."""
+    env = dict(os.environ, OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "benchmark"))
+    commands = {
+        "cli/interpreter": ["-c", "pass"],
+        "cli/list_strategies": ["main.py", "--list-strategies", "--no-daemon"],
+        "cli/offline_improve": ["main.py", PROMPTS["small"], "--strategy", "cot", "--offline", "--no-daemon"],
+    }
+    for name, args in commands.items():
+        command = [sys.executable, *args]
+        yield name, lambda c=command: subprocess.run(
+            c, cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True
+        ), None, 1
+
+
+GROUPS = {
+    "improve": improve_benchmarks,
+    "llm_client": llm_client_benchmarks,
+    "construct": construct_benchmarks,
+    "cli": cli_benchmarks,
+}
+
+
+def _time_loops(func: Callable[[], Any], loops: int) -> float:
+    """Return the seconds taken by loops calls of func()."""
+    start = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - start
+
+
+def measure(func: Callable[[], Any], min_time: float, repeats: int, loops: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Time func() and return seconds per call.
+    
+    Args:
+        func: Function to time
+        min_time: Minimum seconds per repeat; the loop count is calibrated to reach it
+        repeats: Number of timed repeats
+        loops: Fixed calls per repeat instead of calibrating
+    
+    Returns:
+        {"seconds": median, "best": minimum, "loops", "repeats"}
+    """
+    func()
+    if loops is None:
+        # Grow the loop count from the observed time until one repeat lasts min_time
+        loops = 1
+        while True:
+            elapsed = _time_loops(func, loops)
+            if elapsed >= min_time:
+                break
+            loops = max(loops + 1, int(loops * min_time / max(elapsed, 1e-9) * 1.2))
+    
+    timings = [_time_loops(func, loops) / loops for _ in range(repeats)]
+    return {"seconds": statistics.median(timings), "best": min(timings), "loops": loops, "repeats": repeats}
+
+
+def run_benchmarks(pattern: Optional[str] = None, min_time: float = 0.2, repeats: int = 5,
+                   progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Run the benchmarks whose names match pattern.
+    
+    Args:
+        pattern: Regular expression searched in benchmark names (default: all)
+        min_time: Minimum seconds per repeat
+        repeats: Timed repeats per benchmark
+        progress: Called with (name, result) after each benchmark
+    
+    Returns:
+        {"format", "metadata", "results": {name: result}}
+    """
+    regex = re.compile(pattern) if pattern else None
+    results = {}
+    for benchmarks in GROUPS.values():
+        for name, func, nbytes, loops in benchmarks():
+            if regex and not regex.search(name):
+                continue
+            result = measure(func, min_time, repeats, loops)
+            if nbytes is not None:
+                result["bytes"] = nbytes
+            results[name] = result
+            if progress:
+                progress(name, result)
+    return {"format": FORMAT_VERSION, "metadata": _metadata(min_time, repeats), "results": results}
+
+
+def _metadata(min_time: float, repeats: int) -> Dict[str, Any]:
+    """Describe the machine and revision the results were measured on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "min_time": min_time,
+        "repeats": repeats,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Compare two result sets benchmark by benchmark.
+    
+    Args:
+        baseline: Stored results (run_benchmarks output)
+        current: New results
+        threshold: Relative slowdown flagged as a regression (default: 0.25, i.e. 25% slower)
+    
+    Returns:
+        One row per benchmark with 'name', 'baseline' and 'current' seconds (None if
+        absent), 'ratio' (current / baseline) and 'status': "regression", "improvement",
+        "ok", "new" or "missing"
+    
+    Raises:
+        ValueError: If either result set has an unsupported format
+    """
+    for results in (baseline, current):
+        if results.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported benchmark results format: {results.get('format')}")
+    
+    rows = []
+    old, new = baseline["results"], current["results"]
+    for name in list(new) + [name for name in old if name not in new]:
+        before = old[name]["seconds"] if name in old else None
+        after = new[name]["seconds"] if name in new else None
+        ratio = after / before if before and after is not None else None
+        if before is None:
+            status = "new"
+        elif after is None:
+            status = "missing"
+        elif ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline": before, "current": after, "ratio": ratio, "status": status})
+    return rows
+
+
+def format_time(seconds: Optional[float]) -> str:
+    """Format seconds per call with a readable unit."""
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def format_rate(result: Dict[str, Any]) -> str:
+    """Format a result's throughput: MB/s for sized inputs, otherwise calls/s."""
+    if "bytes" in result:
+        return f"{result['bytes'] / result['seconds'] / 1e6:.1f} MB/s"
+    return f"{1 / result['seconds']:,.0f} /s"
+
+
+def main(argv=None) -> int:
+    """Run the suite, print a report and optionally save or compare JSON results."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"Groups: {', '.join(GROUPS)}. --compare exits with status 1 if any benchmark regressed."
+    )
+    parser.add_argument("--filter", "-k", help="Only run benchmarks whose name matches this regex (e.g. '^cli/')")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per repeat (default: 0.2)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed repeats per benchmark (default: 5)")
+    parser.add_argument("--quick", action="store_true", help="Shorthand for --min-time 0.05 --repeats 3")
+    parser.add_argument("--output", "-o", help="Write the results as JSON to this file")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON instead of a table")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a stored results file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative slowdown reported as a regression (default: 0.25)")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.min_time, args.repeats = 0.05, 3
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if args.filter:
+            # Benchmarks excluded by the filter are not missing
+            regex = re.compile(args.filter)
+            baseline["results"] = {name: r for name, r in baseline["results"].items() if regex.search(name)}
+    
+    def progress(name, result):
+        if not args.json:
+            print(f"{name:40} {format_time(result['seconds']):>12} {format_rate(result):>16}", flush=True)
+    
+    if not args.json:
+        print(f"{'benchmark':40} {'per call':>12} {'throughput':>16}")
+    current = run_benchmarks(args.filter, args.min_time, args.repeats, progress)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+    
+    rows = compare(baseline, current, args.threshold) if baseline is not None else []
+    if args.json:
+        if baseline is not None:
+            current = {**current, "comparison": rows}
+        print(json.dumps(current, indent=2))
+    elif baseline is not None:
+        print()
+        old_meta = baseline.get("metadata", {})
+        print(f"Baseline: commit {old_meta.get('commit')} at {old_meta.get('timestamp')} "
+              f"(Python {old_meta.get('python')}, {old_meta.get('cpu_count')} CPUs)")
+        print(f"{'benchmark':40} {'baseline':>12} {'current':>12} {'change':>9}  status")
+        for row in rows:
+            change = f"{(row['ratio'] - 1) * 100:+.0f}%" if row["ratio"] is not None else "-"
+            print(f"{row['name']:40} {format_time(row['baseline']):>12} {format_time(row['current']):>12} "
+                  f"{change:>9}  {row['status']}")
+    
+    regressions = [row["name"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""Process-wide registry of provider chat models sharing pooled HTTP connections."""
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_GEMINI_BASE_URL = "https://generativelanguage.googleapis.com"
+
+_LoopLocalAsyncClient = None
+
+
+def _loop_local_async_client_class():
+    """Define (importing httpx) and return the LoopLocalAsyncClient class on first use."""
+    global _LoopLocalAsyncClient
+    if _LoopLocalAsyncClient is not None:
+        return _LoopLocalAsyncClient
+    import httpx
+    
+    class LoopLocalAsyncClient(httpx.AsyncClient):
+        """``httpx.AsyncClient`` that sends each request through a client owned by the running loop.
+        
+        Keep-alive connections belong to the event loop that opened them, so a
+        single AsyncClient shared across ``asyncio.run()`` calls fails with
+        "Event loop is closed" once a later loop reuses an earlier connection.
+        Models hold one async client for life, so this facade keeps one real
+        client per loop behind it.
+        """
+        
+        def __init__(self, factory: Callable[[], Any]):
+            super().__init__()
+            self._factory = factory
+            self._loop_clients = weakref.WeakKeyDictionary()
+            self._loop_clients_lock = threading.Lock()
+        
+        def for_running_loop(self):
+            """Return the client of the running event loop, creating it on first use."""
+            loop = asyncio.get_running_loop()
+            with self._loop_clients_lock:
+                client = self._loop_clients.get(loop)
+                if client is None:
+                    # Connections of finished loops can never be reused
+                    for closed in [other for other in self._loop_clients if other.is_closed()]:
+                        del self._loop_clients[closed]
+                    client = self._loop_clients[loop] = self._factory()
+                return client
+        
+        async def send(self, request, **kwargs):
+            return await self.for_running_loop().send(request, **kwargs)
+        
+        async def aclose(self) -> None:
+            with self._loop_clients_lock:
+                client = self._loop_clients.pop(asyncio.get_running_loop(), None)
+            if client is not None:
+                await client.aclose()
+            await super().aclose()
+    
+    _LoopLocalAsyncClient = LoopLocalAsyncClient
+    return _LoopLocalAsyncClient
+
+
+class ClientRegistry:
+    """Registry that reuses provider chat models and one keep-alive HTTP pool.
+    
+    Chat models are keyed by (provider, model, temperature, api key), so every
+    LLMClient with the same configuration shares a single model instance. Models
+    that accept an httpx client (OpenAI) all share this registry's sync and async
+    httpx clients, whose connection pool limits are configurable; the async pool
+    is kept per event loop. Gemini models manage their own transport; sharing
+    the model instance reuses its channel.
+    """
+    
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 60.0
+    ):
+        """
+        Initialize the registry.
+        
+        Args:
+            max_connections: Maximum concurrent connections in the shared pool (default: 100)
+            max_keepalive_connections: Idle connections kept open for reuse (default: 20)
+            keepalive_expiry: Seconds an idle connection is kept alive (default: 30.0)
+            timeout: Default request timeout in seconds (default: 60.0)
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        # Bumped by clear(), so LLMClients know to look their shared model up again
+        self.generation = 0
+        self._models: Dict[Hashable, Any] = {}
+        self._http_client = None
+        self._async_http_client = None
+        self._lock = threading.RLock()
+    
+    def configure(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> None:
+        """
+        Change the pool limits.
+        
+        Existing models and HTTP clients are dropped (see clear()), so new limits
+        apply to every model built afterwards, including the next call of an
+        existing LLMClient.
+        
+        Args:
+            max_connections: Maximum concurrent connections in the shared pool
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept alive
+            timeout: Default request timeout in seconds
+        """
+        with self._lock:
+            if max_connections is not None:
+                self.max_connections = max_connections
+            if max_keepalive_connections is not None:
+                self.max_keepalive_connections = max_keepalive_connections
+            if keepalive_expiry is not None:
+                self.keepalive_expiry = keepalive_expiry
+            if timeout is not None:
+                self.timeout = timeout
+            self.clear()
+    
+    def _limits(self):
+        import httpx
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+    
+    @property
+    def http_client(self):
+        """Shared keep-alive ``httpx.Client`` for sync requests, created on first use."""
+        with self._lock:
+            if self._http_client is None:
+                import httpx
+                self._http_client = httpx.Client(limits=self._limits(), timeout=self.timeout)
+            return self._http_client
+    
+    @property
+    def async_http_client(self):
+        """Shared keep-alive ``httpx.AsyncClient`` for async requests, pooled per event loop."""
+        with self._lock:
+            if self._async_http_client is None:
+                import httpx
+                limits, timeout = self._limits(), self.timeout
+                self._async_http_client = _loop_local_async_client_class()(
+                    lambda: httpx.AsyncClient(limits=limits, timeout=timeout)
+                )
+            return self._async_http_client
+    
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the model registered under key, building it with factory on a miss.
+        
+        Args:
+            key: Hashable identity of the model configuration
+            factory: Zero-argument callable that builds the model
+        
+        Returns:
+            The shared model instance
+        """
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self.hits += 1
+                return model
+            self.misses += 1
+            model = factory()
+            self._models[key] = model
+            return model
+    
+    def prewarm(self, urls: Optional[list] = None, timeout: float = 5.0) -> Dict[str, bool]:
+        """
+        Open keep-alive connections ahead of the first real request.
+        
+        Sends a lightweight HEAD request to each URL through the shared sync
+        client, so DNS lookup and the TLS handshake are paid up front. The
+        response status is irrelevant; only connection failures count as misses.
+        
+        Args:
+            urls: Base URLs to warm (default: the OpenAI API base URL)
+            timeout: Per-request timeout in seconds (default: 5.0)
+        
+        Returns:
+            Dict mapping each URL to True if a connection was established
+        """
+        if urls is None:
+            urls = [os.getenv("OPENAI_BASE_URL") or DEFAULT_OPENAI_BASE_URL]
+        warmed = {}
+        for url in urls:
+            try:
+                self.http_client.head(url, timeout=timeout)
+                warmed[url] = True
+            except Exception:
+                warmed[url] = False
+        return warmed
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Return model reuse counters and the pool limits."""
+        with self._lock:
+            return {
+                'models': len(self._models),
+                'hits': self.hits,
+                'misses': self.misses,
+                'max_connections': self.max_connections,
+                'max_keepalive_connections': self.max_keepalive_connections,
+            }
+    
+    def clear(self) -> None:
+        """
+        Drop all registered models and the shared HTTP clients.
+        
+        The clients are not closed: models built earlier may still be using them
+        for in-flight requests. LLMClients switch to a newly built model on their
+        next call, and the old clients are released once no model refers to them.
+        """
+        with self._lock:
+            self._models.clear()
+            self._http_client = None
+            self._async_http_client = None
+            self.generation += 1
+            self.hits = 0
+            self.misses = 0
+
+
+_default_registry = ClientRegistry()
+
+
+def get_registry() -> ClientRegistry:
+    """Return the process-wide default ClientRegistry."""
+    return _default_registry
+
+
+def configure_pool(**limits) -> None:
+    """Configure pool limits of the default registry (see ClientRegistry.configure)."""
+    _default_registry.configure(**limits)
@@ -0,0 +1,425 @@
+"""Background daemon serving CLI requests over a Unix domain socket.
+
+The client half (``forward``) only uses the standard library, so a CLI call
+that reaches a running daemon never imports the improver, LangChain or rich.
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+PROTOCOL_VERSION = 1
+SOCKET_ENV = "PROMPT_IMPROVER_SOCKET"
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+# Environment variables that decide how the client's terminal renders output
+TERMINAL_ENV = ("TERM", "COLORTERM", "NO_COLOR", "FORCE_COLOR")
+
+
+def default_socket_path() -> str:
+    """Return the daemon socket path: $PROMPT_IMPROVER_SOCKET, else a per-user path."""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(directory, f"prompt-improver-{uid}.sock")
+
+
+def _owned_by_current_user(path: str) -> bool:
+    """Whether path is a socket owned by this user (not one planted by another local user)."""
+    if not hasattr(os, "getuid"):
+        return True
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def _peer_is_current_user(sock: socket.socket) -> bool:
+    """Whether the process listening on a connected socket runs as this user, where the OS tells."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    return struct.unpack("3i", creds)[1] == os.getuid()
+
+
+def _terminal_info() -> Dict[str, Any]:
+    """Describe the client's stdout so the daemon can render output for it."""
+    return {
+        "isatty": sys.stdout.isatty(),
+        "width": shutil.get_terminal_size().columns,
+        "env": {name: os.environ[name] for name in TERMINAL_ENV if name in os.environ},
+    }
+
+
+def _send(request: Dict[str, Any], socket_path: Optional[str], connect_timeout: float) -> Optional[Dict[str, Any]]:
+    """
+    Send one request and return the response, or None if no daemon is listening.
+    
+    Prompts are only sent to a daemon of this user: a socket owned by anyone
+    else (e.g. planted at the predictable path in the temp directory) is ignored.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    socket_path = socket_path or default_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+    if not _owned_by_current_user(socket_path):
+        print(f"Warning: ignoring daemon socket {socket_path}, which is not owned by you", file=sys.stderr)
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(connect_timeout)
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return None
+        if not _peer_is_current_user(sock):
+            print(f"Warning: ignoring daemon on {socket_path}, which runs as another user", file=sys.stderr)
+            return None
+        # Requests can wait on an LLM, so only connecting is time-limited
+        sock.settimeout(None)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except OSError:
+        return None
+    finally:
+        sock.close()
+    try:
+        return json.loads(b"".join(chunks))
+    except ValueError:
+        return None
+
+
+def forward(argv: List[str], socket_path: Optional[str] = None, connect_timeout: float = 0.5) -> Optional[Dict[str, Any]]:
+    """
+    Run a CLI request in the daemon.
+    
+    Args:
+        argv: CLI arguments (without the program name)
+        socket_path: Daemon socket (default: default_socket_path())
+        connect_timeout: Seconds to wait for the daemon to accept (default: 0.5)
+    
+    Returns:
+        {"exit_code", "output"} with the rendered output, or None if no compatible
+        daemon is running (the caller should then run the request itself)
+    """
+    response = _send(
+        {"version": PROTOCOL_VERSION, "command": "run", "argv": argv, "terminal": _terminal_info()},
+        socket_path,
+        connect_timeout
+    )
+    if response is None or response.get("version") != PROTOCOL_VERSION or "exit_code" not in response:
+        return None
+    return response
+
+
+def ping(socket_path: Optional[str] = None, connect_timeout: float = 0.5) -> Optional[Dict[str, Any]]:
+    """Return the daemon's status, or None if it is not running."""
+    response = _send({"version": PROTOCOL_VERSION, "command": "ping"}, socket_path, connect_timeout)
+    return response if response is not None and "pid" in response else None
+
+
+class ImproverDaemon:
+    """Serves CLI requests from a warm process, one thread per connection.
+    
+    Each connection carries one JSON request line. A "run" request holds the
+    CLI arguments and the client's terminal description; the daemon executes it
+    with cached PromptImprovers (one per provider, model and offline setting)
+    and replies with the exit status and the output rendered for that terminal.
+    """
+    
+    def __init__(self, socket_path: Optional[str] = None, idle_timeout: Optional[float] = None):
+        """
+        Initialize the daemon.
+        
+        Args:
+            socket_path: Socket to listen on (default: default_socket_path())
+            idle_timeout: Exit after this many seconds without requests (default: never)
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.idle_timeout = idle_timeout
+        self.started = time.time()
+        self.requests = 0
+        self._last_request = time.monotonic()
+        self._improvers: Dict[Any, Any] = {}
+        self._lock = threading.Lock()
+        self._server = None
+    
+    def warm_up(self) -> None:
+        """Import the CLI stack and build the offline improver ahead of the first request."""
+        try:
+            from . import utils  # noqa: F401
+        except ImportError:
+            import utils  # noqa: F401
+        self._get_improver(self._cli().build_parser().parse_args(["--list-strategies"]))
+    
+    @staticmethod
+    def _cli():
+        try:
+            from . import main as cli
+        except ImportError:
+            import main as cli
+        return cli
+    
+    def _get_improver(self, args: argparse.Namespace):
+        """Return the cached improver for the provider options in args."""
+        offline = args.offline or args.list_strategies
+        key = (True, None, None) if offline else (False, args.provider, args.model)
+        improver = self._improvers.get(key)
+        if improver is None:
+            with self._lock:
+                improver = self._improvers.get(key)
+                if improver is None:
+                    improver = self._cli().make_improver(args)
+                    self._improvers[key] = improver
+        return improver
+    
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle one decoded request.
+        
+        Args:
+            request: {"version", "command": "run" | "ping" | "shutdown", ...}
+        
+        Returns:
+            The response to send back
+        """
+        self._last_request = time.monotonic()
+        response: Dict[str, Any] = {"version": PROTOCOL_VERSION}
+        if request.get("version") != PROTOCOL_VERSION:
+            response["error"] = f"Unsupported protocol version: {request.get('version')}"
+            return response
+        
+        command = request.get("command", "run")
+        if command == "ping":
+            response.update(pid=os.getpid(), uptime=time.time() - self.started, requests=self.requests)
+        elif command == "shutdown":
+            response["stopping"] = True
+            threading.Thread(target=self.shutdown, daemon=True).start()
+        elif command == "run":
+            with self._lock:
+                self.requests += 1
+            response.update(self._run(request.get("argv", []), request.get("terminal", {})))
+        else:
+            response["error"] = f"Unknown command: {command}"
+        return response
+    
+    def _run(self, argv: List[str], terminal: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute CLI arguments, rendering the output for the client's terminal."""
+        import io
+        from rich.console import Console
+        try:
+            from .utils import print_error
+        except ImportError:
+            from utils import print_error
+        
+        cli = self._cli()
+        env = terminal.get("env", {})
+        isatty = bool(terminal.get("isatty")) or bool(env.get("FORCE_COLOR"))
+        if not isatty or env.get("TERM") == "dumb":
+            color_system = None
+        elif env.get("COLORTERM") in ("truecolor", "24bit"):
+            color_system = "truecolor"
+        elif "256color" in env.get("TERM", ""):
+            color_system = "256"
+        else:
+            color_system = "standard"
+        output = io.StringIO()
+        console = Console(
+            file=output,
+            force_terminal=isatty,
+            color_system=color_system,
+            no_color="NO_COLOR" in env,
+            width=terminal.get("width") or 80,
+        )
+        
+        try:
+            args = cli.build_parser().parse_args(argv)
+            exit_code = cli.execute(args, self._get_improver(args), console)
+        except SystemExit as e:
+            # Invalid arguments; clients validate before forwarding, so this is rare
+            exit_code = e.code if isinstance(e.code, int) else 2
+        except Exception as e:
+            print_error(f"Unexpected error: {str(e)}", console)
+            exit_code = 1
+        return {"exit_code": exit_code, "output": output.getvalue()}
+    
+    def serve_forever(self) -> None:
+        """Listen on the socket and serve until shutdown() is called."""
+        import socketserver
+        
+        daemon = self
+        
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline(MAX_REQUEST_SIZE)
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"version": PROTOCOL_VERSION, "error": "Invalid request"}
+                else:
+                    response = daemon.handle_request(request)
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+        
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+        
+        self._remove_stale_socket()
+        old_umask = os.umask(0o177)
+        try:
+            self._server = Server(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        
+        if self.idle_timeout:
+            threading.Thread(target=self._watch_idle, daemon=True).start()
+        try:
+            self._server.serve_forever(poll_interval=0.2)
+        finally:
+            self._server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+    
+    def _remove_stale_socket(self) -> None:
+        """Remove a socket file left by a daemon that is no longer running."""
+        if not os.path.lexists(self.socket_path):
+            return
+        if not _owned_by_current_user(self.socket_path):
+            raise RuntimeError(f"{self.socket_path} exists and is not a socket owned by you")
+        if ping(self.socket_path) is not None:
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        os.unlink(self.socket_path)
+    
+    def _watch_idle(self) -> None:
+        while self._server is not None:
+            time.sleep(min(1.0, self.idle_timeout))
+            if time.monotonic() - self._last_request > self.idle_timeout:
+                self.shutdown()
+                return
+    
+    def shutdown(self) -> None:
+        """Stop serving; in-flight requests finish on their own threads."""
+        server = self._server
+        if server is not None:
+            server.shutdown()
+
+
+def start_background(socket_path: Optional[str] = None, idle_timeout: Optional[float] = None,
+                     log_path: Optional[str] = None, wait: float = 30.0) -> Optional[Dict[str, Any]]:
+    """
+    Start the daemon as a detached background process and wait until it answers.
+    
+    Returns:
+        The daemon's status, or None if it did not come up within wait seconds
+    """
+    import subprocess
+    
+    socket_path = socket_path or default_socket_path()
+    command = [sys.executable, os.path.abspath(__file__), "run", "--socket", socket_path]
+    if idle_timeout:
+        command += ["--idle-timeout", str(idle_timeout)]
+    log = open(log_path or os.devnull, "ab")
+    try:
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+    finally:
+        log.close()
+    
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        status = ping(socket_path)
+        if status is not None:
+            return status
+        time.sleep(0.05)
+    return None
+
+
+def main(argv=None) -> int:
+    """Run the daemon subcommand: start, stop, status or run (foreground)."""
+    parser = argparse.ArgumentParser(
+        prog="main.py daemon",
+        description="Keep a warm prompt improver in a background process for fast CLI calls",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+While the daemon runs, `python main.py "..." --strategy ...` forwards requests to it
+(use --no-daemon to opt out). The daemon uses the environment (API keys, .env) it
+was started with.
+
+Examples:
+  python main.py daemon start
+  python main.py daemon status
+  python main.py daemon stop
+        """
+    )
+    parser.add_argument("action", choices=["start", "stop", "status", "run"])
+    parser.add_argument("--socket", help=f"Socket path (default: ${SOCKET_ENV} or a per-user path)")
+    parser.add_argument("--idle-timeout", type=float, help="Exit after this many idle seconds")
+    parser.add_argument("--log", help="Log file of a started daemon (default: discard output)")
+    args = parser.parse_args(argv)
+    socket_path = args.socket or default_socket_path()
+    
+    if args.action == "status":
+        status = ping(socket_path)
+        if status is None:
+            print(f"No daemon running on {socket_path}")
+            return 1
+        print(f"Daemon running on {socket_path} (pid {status['pid']}, up {status['uptime']:.0f}s, "
+              f"{status['requests']} requests)")
+        return 0
+    
+    if args.action == "stop":
+        if _send({"version": PROTOCOL_VERSION, "command": "shutdown"}, socket_path, 0.5) is None:
+            print(f"No daemon running on {socket_path}")
+            return 1
+        print("Daemon stopped")
+        return 0
+    
+    if args.action == "start":
+        status = ping(socket_path)
+        if status is None:
+            status = start_background(socket_path, args.idle_timeout, args.log)
+            if status is None:
+                print("Daemon did not start; run `python main.py daemon run` to see why", file=sys.stderr)
+                return 1
+        print(f"Daemon running on {socket_path} (pid {status['pid']})")
+        return 0
+    
+    daemon = ImproverDaemon(socket_path, idle_timeout=args.idle_timeout)
+    try:
+        daemon.warm_up()
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
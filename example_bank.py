@@ -0,0 +1,292 @@
+"""Indexed bank of few-shot examples with BM25 similarity retrieval."""
+import json
+import os
+import re
+from array import array
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, List
+
+# NumPy is an optional dependency, only needed for the example bank
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+FORMAT_VERSION = 1
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class ExampleBank:
+    """Few-shot examples indexed for BM25 retrieval over their inputs.
+    
+    The index is an inverted index of precomputed BM25 weights stored as flat
+    NumPy arrays (one postings list per term), so a query only touches the
+    postings of its own terms. Example texts are stored as one UTF-8 buffer plus
+    offsets rather than Python dicts; a bank loaded from disk memory-maps every
+    array, so banks of 100k+ examples open instantly and only the pages of the
+    examples actually returned are read.
+    """
+    
+    def __init__(
+        self,
+        vocabulary: List[str],
+        postings_ptr,
+        postings_doc,
+        postings_weight,
+        text_offsets,
+        text_data,
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        """
+        Initialize a bank from prebuilt index arrays (see ``build`` and ``load``).
+        
+        Args:
+            vocabulary: Index terms; a term's position is its id
+            postings_ptr: Start of each term's postings (length: terms + 1)
+            postings_doc: Example id of each posting
+            postings_weight: BM25 weight of each posting
+            text_offsets: Offsets of each example's input and output in text_data
+                          (length: 2 * examples + 1)
+            text_data: UTF-8 bytes of all example inputs and outputs
+            k1: BM25 term frequency saturation used to build the weights
+            b: BM25 length normalization used to build the weights
+        
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError(
+                "numpy is not installed. "
+                "Install it with: pip install numpy"
+            )
+        self.vocabulary = {term: i for i, term in enumerate(vocabulary)}
+        self._terms = vocabulary
+        self.postings_ptr = postings_ptr
+        self.postings_doc = postings_doc
+        self.postings_weight = postings_weight
+        self.text_offsets = text_offsets
+        self.text_data = text_data
+        self.k1 = k1
+        self.b = b
+    
+    @classmethod
+    def build(
+        cls,
+        examples: Iterable[Dict[str, str]],
+        k1: float = 1.5,
+        b: float = 0.75
+    ) -> "ExampleBank":
+        """
+        Build the index from examples.
+        
+        Examples are consumed one at a time (a generator reading a JSONL file
+        works), and only compact arrays are kept, never the example dicts.
+        
+        Args:
+            examples: Example dicts with 'input' and 'output' keys
+            k1: BM25 term frequency saturation (default: 1.5)
+            b: BM25 length normalization (default: 0.75)
+        
+        Returns:
+            The built ExampleBank
+        
+        Raises:
+            ImportError: If numpy is not installed
+            KeyError: If an example lacks 'input' or 'output'
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError(
+                "numpy is not installed. "
+                "Install it with: pip install numpy"
+            )
+        vocabulary: Dict[str, int] = {}
+        term_ids, doc_ids, term_freqs, doc_lengths = array('i'), array('i'), array('f'), array('i')
+        text_data = bytearray()
+        text_offsets = array('q', [0])
+        
+        for doc, example in enumerate(examples):
+            for text in (str(example['input']), str(example['output'])):
+                text_data += text.encode('utf-8')
+                text_offsets.append(len(text_data))
+            tokens = tokenize(str(example['input']))
+            doc_lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+                doc_ids.append(doc)
+                term_freqs.append(count)
+        
+        num_docs = len(doc_lengths)
+        terms = np.frombuffer(term_ids, dtype=np.int32) if term_ids else np.zeros(0, np.int32)
+        docs = np.frombuffer(doc_ids, dtype=np.int32) if doc_ids else np.zeros(0, np.int32)
+        tf = np.frombuffer(term_freqs, dtype=np.float32) if term_freqs else np.zeros(0, np.float32)
+        lengths = np.frombuffer(doc_lengths, dtype=np.int32) if doc_lengths else np.zeros(0, np.int32)
+        
+        # BM25 weight of every (term, example) pair, precomputed so queries only sum
+        df = np.bincount(terms, minlength=len(vocabulary))
+        idf = np.log1p((num_docs - df + 0.5) / (df + 0.5))
+        avg_length = float(lengths.mean()) if num_docs and lengths.mean() > 0 else 1.0
+        norm = k1 * (1 - b + b * lengths[docs] / avg_length)
+        weights = idf[terms] * tf * (k1 + 1) / (tf + norm)
+        
+        order = np.argsort(terms, kind='stable')
+        postings_ptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(df, out=postings_ptr[1:])
+        
+        return cls(
+            vocabulary=sorted(vocabulary, key=vocabulary.get),
+            postings_ptr=postings_ptr,
+            postings_doc=docs[order].astype(np.int32),
+            postings_weight=weights[order].astype(np.float32),
+            text_offsets=np.frombuffer(text_offsets, dtype=np.int64).copy(),
+            text_data=np.frombuffer(bytes(text_data), dtype=np.uint8),
+            k1=k1,
+            b=b
+        )
+    
+    @classmethod
+    def from_jsonl(cls, path: str, **kwargs) -> "ExampleBank":
+        """
+        Build the index from a JSONL file with one example object per line.
+        
+        Args:
+            path: Path of the JSONL file
+            **kwargs: BM25 parameters passed to ``build``
+        
+        Returns:
+            The built ExampleBank
+        """
+        def read():
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        
+        return cls.build(read(), **kwargs)
+    
+    def save(self, path: str) -> None:
+        """
+        Write the index to a directory.
+        
+        Args:
+            path: Directory to write (created if missing)
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in ('postings_ptr', 'postings_doc', 'postings_weight', 'text_offsets', 'text_data'):
+            np.save(os.path.join(path, f'{name}.npy'), np.asarray(getattr(self, name)))
+        with open(os.path.join(path, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+            json.dump(self._terms, f, ensure_ascii=False)
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'version': FORMAT_VERSION, 'examples': len(self), 'k1': self.k1, 'b': self.b}, f)
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "ExampleBank":
+        """
+        Open an index written by ``save``.
+        
+        Args:
+            path: Index directory
+            mmap: Memory-map the arrays instead of reading them into memory (default: True)
+        
+        Returns:
+            The loaded ExampleBank
+        
+        Raises:
+            ImportError: If numpy is not installed
+            ValueError: If the index was written by an incompatible version
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError(
+                "numpy is not installed. "
+                "Install it with: pip install numpy"
+            )
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported example bank format: {meta.get('version')}")
+        with open(os.path.join(path, 'vocabulary.json'), encoding='utf-8') as f:
+            vocabulary = json.load(f)
+        
+        mmap_mode = 'r' if mmap else None
+        arrays = {
+            name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+            for name in ('postings_ptr', 'postings_doc', 'postings_weight', 'text_offsets', 'text_data')
+        }
+        return cls(vocabulary=vocabulary, k1=meta['k1'], b=meta['b'], **arrays)
+    
+    def __len__(self) -> int:
+        return len(self.text_offsets) // 2
+    
+    def _text(self, index: int) -> str:
+        start, end = int(self.text_offsets[index]), int(self.text_offsets[index + 1])
+        return bytes(self.text_data[start:end]).decode('utf-8')
+    
+    def get(self, index: int) -> Dict[str, str]:
+        """Return example index as an {'input', 'output'} dict."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Example index out of range: {index}")
+        return {'input': self._text(2 * index), 'output': self._text(2 * index + 1)}
+    
+    def search_indices(self, query: str, k: int = 2) -> List[int]:
+        """
+        Return the ids of the k examples whose inputs best match query.
+        
+        Examples are ranked by BM25 score; if fewer than k examples share a term
+        with the query, the rest are filled with the first examples in the bank.
+        
+        Args:
+            query: Text to match (typically the prompt)
+            k: Number of examples to return
+        
+        Returns:
+            Example ids, best match first
+        """
+        k = max(0, min(k, len(self)))
+        if k == 0:
+            return []
+        term_ids = {self.vocabulary[t] for t in tokenize(query) if t in self.vocabulary}
+        
+        ranked: List[int] = []
+        if term_ids:
+            ptr = self.postings_ptr
+            docs = np.concatenate([self.postings_doc[ptr[t]:ptr[t + 1]] for t in term_ids])
+            weights = np.concatenate([self.postings_weight[ptr[t]:ptr[t + 1]] for t in term_ids])
+            if len(docs) * 8 < len(self):
+                # Few postings: sum weights per matched example only
+                candidates, inverse = np.unique(docs, return_inverse=True)
+                scores = np.bincount(inverse, weights=weights)
+            else:
+                scores = np.bincount(docs, weights=weights, minlength=len(self))
+                candidates = np.flatnonzero(scores)
+                scores = scores[candidates]
+            # Best score first; candidates are in id order, so the stable sort
+            # gives ties to the earlier example
+            top = np.argsort(-scores, kind="stable")[:k]
+            ranked = candidates[top].tolist()
+        
+        if len(ranked) < k:
+            chosen = set(ranked)
+            fill = (i for i in range(len(self)) if i not in chosen)
+            ranked.extend(islice(fill, k - len(ranked)))
+        return ranked
+    
+    def search(self, query: str, k: int = 2) -> List[Dict[str, str]]:
+        """
+        Return the k examples whose inputs best match query (see ``search_indices``).
+        
+        Args:
+            query: Text to match (typically the prompt)
+            k: Number of examples to return
+        
+        Returns:
+            Example dicts, best match first
+        """
+        return [self.get(i) for i in self.search_indices(query, k)]
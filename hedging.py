@@ -0,0 +1,263 @@
+"""Hedged requests: duplicate slow LLM calls to cut tail latency."""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies."""
+    
+    def __init__(self, window: int = 200):
+        """
+        Initialize the tracker.
+        
+        Args:
+            window: Number of most recent latencies kept (default: 200)
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def record(self, seconds: float) -> None:
+        """Record the latency of one completed call."""
+        with self._lock:
+            self._samples.append(seconds)
+    
+    def __len__(self) -> int:
+        return len(self._samples)
+    
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Return the p-th percentile (0-1) of recent latencies.
+        
+        Args:
+            p: Percentile as a fraction, e.g. 0.95
+        
+        Returns:
+            Latency in seconds, or None if nothing has been recorded
+        """
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(p * (len(ordered) - 1)))))
+        return ordered[index]
+
+
+class HedgePolicy:
+    """Opt-in hedging policy for LLMClient.
+    
+    If a call has not returned after the learned latency percentile, a duplicate
+    request is fired (optionally to a fallback client, e.g. another provider)
+    and whichever answers first wins. On the async path the loser is cancelled;
+    a sync request already running in its thread cannot be interrupted, so its
+    result is simply discarded.
+    
+    Sync calls run on a thread of their own rather than a shared pool, so a
+    request never waits behind stalled ones: the hedge delay counts from when
+    the primary starts, and a backup starts as soon as the hedge fires.
+    """
+    
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        max_delay: Optional[float] = None,
+        fallback: Optional[Any] = None,
+        window: int = 200,
+        max_workers: int = 32
+    ):
+        """
+        Initialize the hedge policy.
+        
+        Args:
+            percentile: Latency percentile after which a hedge fires (default: 0.95)
+            min_samples: Calls observed before hedging starts (default: 20)
+            min_delay: Lower bound on the hedge delay in seconds (default: 0.05)
+            max_delay: Optional upper bound on the hedge delay in seconds
+            fallback: Optional client (e.g. an LLMClient for the other provider)
+                      that receives the duplicate request. If None, the same
+                      client is called again.
+            window: Number of recent latencies used to learn the percentile (default: 200)
+            max_workers: Maximum sync backup requests in flight; no hedge is fired
+                         while this many are still running (default: 32)
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.fallback = fallback
+        self.max_workers = max_workers
+        self.latencies = LatencyTracker(window)
+        
+        self.calls = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self._backups_running = 0
+        self._lock = threading.Lock()
+    
+    def delay(self) -> Optional[float]:
+        """Return the current hedge delay in seconds, or None while still learning."""
+        if len(self.latencies) < self.min_samples:
+            return None
+        delay = max(self.min_delay, self.latencies.percentile(self.percentile))
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return delay
+    
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+    
+    def _start(self, call: Callable[[], str], name: str) -> Future:
+        """Run call on a new daemon thread and return a future for its result."""
+        future = Future()
+        future.set_running_or_notify_cancel()
+        
+        def run():
+            try:
+                future.set_result(call())
+            except BaseException as e:
+                future.set_exception(e)
+        
+        threading.Thread(target=run, name=name, daemon=True).start()
+        return future
+    
+    def _reserve_backup(self) -> bool:
+        """Claim a slot for a sync backup request, or return False if none is free."""
+        with self._lock:
+            if self._backups_running >= self.max_workers:
+                return False
+            self._backups_running += 1
+            return True
+    
+    def _release_backup(self, future: Future) -> None:
+        with self._lock:
+            self._backups_running -= 1
+    
+    def _backup_call(self, backup: Callable[[], str]) -> Callable[[], str]:
+        """Return the backup to run; a fallback client's latencies are not learned."""
+        return self._timed(backup) if self.fallback is None else backup
+    
+    def _timed(self, call: Callable[[], str]) -> Callable[[], str]:
+        """Wrap call so that its latency is recorded when it succeeds."""
+        def run():
+            start = time.perf_counter()
+            result = call()
+            self.latencies.record(time.perf_counter() - start)
+            return result
+        return run
+    
+    def run(self, primary: Callable[[], str], backup: Callable[[], str]) -> str:
+        """
+        Run a call with hedging.
+        
+        Args:
+            primary: Zero-argument callable performing the request
+            backup: Zero-argument callable performing the duplicate request
+        
+        Returns:
+            The first successful response
+        
+        Raises:
+            Exception: The primary's exception if every attempt fails
+        """
+        self._count('calls')
+        delay = self.delay()
+        if delay is None:
+            return self._timed(primary)()
+        
+        first = self._start(self._timed(primary), "hedge-primary")
+        done, _ = wait([first], timeout=delay)
+        if done or not self._reserve_backup():
+            return first.result()
+        
+        self._count('hedges_fired')
+        second = self._start(self._backup_call(backup), "hedge-backup")
+        second.add_done_callback(self._release_backup)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        self._count('hedges_won')
+                    return future.result()
+                if future is first or error is None:
+                    error = future.exception()
+        raise error
+    
+    async def arun(
+        self,
+        primary: Callable[[], Awaitable[str]],
+        backup: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Run an async call with hedging, cancelling the losing request.
+        
+        Args:
+            primary: Zero-argument coroutine function performing the request
+            backup: Zero-argument coroutine function performing the duplicate request
+        
+        Returns:
+            The first successful response
+        
+        Raises:
+            Exception: The primary's exception if every attempt fails
+        """
+        async def timed(call):
+            start = time.perf_counter()
+            result = await call()
+            self.latencies.record(time.perf_counter() - start)
+            return result
+        
+        self._count('calls')
+        delay = self.delay()
+        if delay is None:
+            return await timed(primary)
+        
+        first = asyncio.ensure_future(timed(primary))
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done:
+                return first.result()
+            
+            self._count('hedges_fired')
+            # As in run(), only the same client's latencies are learned
+            second = asyncio.ensure_future(timed(backup) if self.fallback is None else backup())
+            tasks.append(second)
+            pending = {first, second}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self._count('hedges_won')
+                        return task.result()
+                    if task is first or error is None:
+                        error = task.exception()
+            raise error
+        finally:
+            # Cancel the loser (or both, if the caller itself was cancelled)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Return how often hedges fired and won, and the current hedge delay."""
+        with self._lock:
+            calls, fired, won = self.calls, self.hedges_fired, self.hedges_won
+        return {
+            'calls': calls,
+            'hedges_fired': fired,
+            'hedges_won': won,
+            'fire_rate': fired / calls if calls else 0.0,
+            'win_rate': won / fired if fired else 0.0,
+            'delay_seconds': self.delay(),
+        }
@@ -1,29 +1,41 @@
-from typing import Dict, Optional
+import asyncio
+import math
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, AsyncIterator, Dict, Iterator, List, Literal, Optional, Tuple, Union
 try:
     from .llm_client import LLMClient
-    from .strategies import (
-        BaseStrategy,
-        RoleStrategy,
-        FewShotStrategy,
-        ChainOfThoughtStrategy,
-        SelfConsistencyStrategy,
-        TreeOfThoughtStrategy,
-        SkeletonOfThoughtStrategy,
-        ReActStrategy
-    )
+    from .router import RouterClient
+    from .pipeline import CompiledPipeline, compile_pipeline
+    from .strategies import BaseStrategy, StrategyMap, StrategyRegistry, get_strategy_registry
 except ImportError:
     # Fallback for when running as a script
     from llm_client import LLMClient
-    from strategies import (
-        BaseStrategy,
-        RoleStrategy,
-        FewShotStrategy,
-        ChainOfThoughtStrategy,
-        SelfConsistencyStrategy,
-        TreeOfThoughtStrategy,
-        SkeletonOfThoughtStrategy,
-        ReActStrategy
-    )
+    from router import RouterClient
+    from pipeline import CompiledPipeline, compile_pipeline
+    from strategies import BaseStrategy, StrategyMap, StrategyRegistry, get_strategy_registry
+
+
+# Strategy of a process pool worker, a copy of the caller's configured instance
+_worker_strategy = None
+
+
+def _init_worker(pickled_strategy: bytes) -> None:
+    """Install the caller's strategy in a process pool worker."""
+    global _worker_strategy
+    _worker_strategy = pickle.loads(pickled_strategy)
+
+
+def _improve_chunk(prompts: List[str], kwargs: Dict[str, Any]) -> List[Union[str, Exception]]:
+    """Improve a chunk of prompts in a process pool worker, capturing per-item exceptions."""
+    results = []
+    for prompt in prompts:
+        try:
+            results.append(_worker_strategy.improve(prompt, **kwargs))
+        except Exception as e:
+            results.append(e)
+    return results
 
 
 class PromptImprover:
@@ -32,51 +44,49 @@ class PromptImprover:
     The improved prompts are generic and framework-agnostic, suitable for use with any LLM.
     """
     
-    STRATEGY_MAP: Dict[str, type] = {
-        'role': RoleStrategy,
-        'few-shot': FewShotStrategy,
-        'cot': ChainOfThoughtStrategy,
-        'chain-of-thought': ChainOfThoughtStrategy,
-        'self-consistency': SelfConsistencyStrategy,
-        'tot': TreeOfThoughtStrategy,
-        'tree-of-thought': TreeOfThoughtStrategy,
-        'sot': SkeletonOfThoughtStrategy,
-        'skeleton-of-thought': SkeletonOfThoughtStrategy,
-        'react': ReActStrategy,
-    }
-    
     def __init__(
         self,
-        llm_client: Optional[LLMClient] = None,
+        llm_client: Optional[Union[LLMClient, RouterClient]] = None,
         provider: str = "openai",
-        model_name: Optional[str] = None
+        model_name: Optional[str] = None,
+        offline: bool = False,
+        registry: Optional[StrategyRegistry] = None
     ):
         """
-        Initialize the PromptImprover with default strategy instances.
+        Initialize the PromptImprover.
+        
+        Strategies are not built here: ``self.strategies`` resolves names and
+        aliases through the strategy registry and instantiates each strategy
+        the first time it is used.
         
         Args:
-            llm_client: Optional LLMClient instance to share across strategies.
+            llm_client: Optional LLMClient (or RouterClient spreading load across
+                       several backends) to share across strategies.
                        If None, creates a new client with the specified provider.
             provider: LLM provider to use if llm_client is None (default: "openai")
             model_name: Model name to use if llm_client is None (default: provider defaults)
+            offline: If True, run in template-only mode: no LLM client is created, so
+                     no provider SDK is imported and no API key is needed (default: False)
+            registry: Strategy registry to resolve names from (default: the
+                      process-wide registry, including entry point strategies)
+            
+        Raises:
+            ValueError: If both offline and llm_client are given
         """
+        if offline and llm_client is not None:
+            raise ValueError("An offline PromptImprover cannot be given an llm_client.")
+        self.offline = offline
+        
         # Share LLM client across all strategies for efficiency
-        if llm_client is None:
+        if offline:
+            self.llm_client = None
+        elif llm_client is None:
             self.llm_client = LLMClient(provider=provider, model_name=model_name)
         else:
             self.llm_client = llm_client
-        self.strategies: Dict[str, BaseStrategy] = {
-            'role': RoleStrategy(llm_client=self.llm_client),
-            'few-shot': FewShotStrategy(llm_client=self.llm_client),
-            'cot': ChainOfThoughtStrategy(llm_client=self.llm_client),
-            'chain-of-thought': ChainOfThoughtStrategy(llm_client=self.llm_client),
-            'self-consistency': SelfConsistencyStrategy(llm_client=self.llm_client),
-            'tot': TreeOfThoughtStrategy(llm_client=self.llm_client),
-            'tree-of-thought': TreeOfThoughtStrategy(llm_client=self.llm_client),
-            'sot': SkeletonOfThoughtStrategy(llm_client=self.llm_client),
-            'skeleton-of-thought': SkeletonOfThoughtStrategy(llm_client=self.llm_client),
-            'react': ReActStrategy(llm_client=self.llm_client),
-        }
+        self.strategies = StrategyMap(
+            registry or get_strategy_registry(), llm_client=self.llm_client, offline=offline
+        )
     
     def improve(self, prompt: str, strategy: str, **kwargs) -> str:
         """
@@ -93,17 +103,357 @@ class PromptImprover:
         Raises:
             ValueError: If strategy is not recognized
         """
-        strategy_lower = strategy.lower()
+        return self._get_strategy(strategy).improve(prompt, **kwargs)
+    
+    def _resolve_per_strategy(
+        self,
+        per_strategy: Optional[Dict[str, Dict[str, Any]]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Key per-strategy parameter dicts by canonical strategy key."""
+        resolved = {}
+        for name, params in (per_strategy or {}).items():
+            self._get_strategy(name)  # ValueError for an unknown name
+            resolved[self.strategies.registry.resolve(name)] = params
+        return resolved
+    
+    def iter_improve_all(
+        self,
+        prompt: str,
+        max_workers: Optional[int] = None,
+        per_strategy: Optional[Dict[str, Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Iterator[Tuple[str, Union[str, Exception]]]:
+        """
+        Improve one prompt with every available strategy concurrently,
+        yielding each result as soon as its strategy completes.
         
-        if strategy_lower not in self.strategies:
+        Aliases are deduplicated, so each strategy runs once under its canonical
+        key. Strategies that have not started yet are cancelled if the caller
+        stops iterating early.
+        
+        Args:
+            prompt: The original prompt to improve
+            max_workers: Maximum strategies running at once (default: all of them)
+            per_strategy: Parameters for individual strategies, keyed by strategy
+                          name or alias, e.g. ``{'role': {'role': 'a chef'}}``;
+                          they override the shared keyword arguments
+            **kwargs: Parameters passed to every strategy
+            
+        Yields:
+            (canonical strategy key, improved prompt or the exception it raised)
+            
+        Raises:
+            ValueError: If per_strategy names an unknown strategy
+        """
+        per_strategy = self._resolve_per_strategy(per_strategy)
+        keys = self.strategies.registry.keys()
+        
+        def run(key: str) -> Union[str, Exception]:
+            try:
+                return self.strategies[key].improve(prompt, **{**kwargs, **per_strategy.get(key, {})})
+            except Exception as e:
+                return e
+        
+        pool = ThreadPoolExecutor(max_workers=max_workers or len(keys))
+        try:
+            futures = {pool.submit(run, key): key for key in keys}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def improve_all(
+        self,
+        prompt: str,
+        max_workers: Optional[int] = None,
+        per_strategy: Optional[Dict[str, Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Union[str, Exception]]:
+        """
+        Improve one prompt with every available strategy concurrently.
+        
+        Args:
+            prompt: The original prompt to improve
+            max_workers: Maximum strategies running at once (default: all of them)
+            per_strategy: Parameters for individual strategies (see iter_improve_all)
+            **kwargs: Parameters passed to every strategy
+            
+        Returns:
+            Dict mapping canonical strategy key to its improved prompt (or the
+            exception it raised), in the order the strategies completed
+            
+        Raises:
+            ValueError: If per_strategy names an unknown strategy
+        """
+        return dict(self.iter_improve_all(prompt, max_workers, per_strategy, **kwargs))
+    
+    async def aiter_improve_all(
+        self,
+        prompt: str,
+        per_strategy: Optional[Dict[str, Dict[str, Any]]] = None,
+        **kwargs
+    ) -> AsyncIterator[Tuple[str, Union[str, Exception]]]:
+        """
+        Asynchronously improve one prompt with every available strategy,
+        yielding each result as soon as its strategy completes.
+        
+        Args:
+            prompt: The original prompt to improve
+            per_strategy: Parameters for individual strategies (see iter_improve_all)
+            **kwargs: Parameters passed to every strategy
+            
+        Yields:
+            (canonical strategy key, improved prompt or the exception it raised)
+            
+        Raises:
+            ValueError: If per_strategy names an unknown strategy
+        """
+        per_strategy = self._resolve_per_strategy(per_strategy)
+        
+        async def run(key: str):
+            try:
+                return key, await self.strategies[key].aimprove(prompt, **{**kwargs, **per_strategy.get(key, {})})
+            except Exception as e:
+                return key, e
+        
+        tasks = [asyncio.ensure_future(run(key)) for key in self.strategies.registry.keys()]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def aimprove_all(
+        self,
+        prompt: str,
+        per_strategy: Optional[Dict[str, Dict[str, Any]]] = None,
+        **kwargs
+    ) -> Dict[str, Union[str, Exception]]:
+        """
+        Asynchronously improve one prompt with every available strategy.
+        
+        Args:
+            prompt: The original prompt to improve
+            per_strategy: Parameters for individual strategies (see iter_improve_all)
+            **kwargs: Parameters passed to every strategy
+            
+        Returns:
+            Dict mapping canonical strategy key to its improved prompt (or the
+            exception it raised), in the order the strategies completed
+            
+        Raises:
+            ValueError: If per_strategy names an unknown strategy
+        """
+        return {key: result async for key, result in self.aiter_improve_all(prompt, per_strategy, **kwargs)}
+    
+    def compile_pipeline(self, strategies: List[str], **kwargs) -> CompiledPipeline:
+        """
+        Compile an ordered list of strategies into one fused template.
+        
+        Repeated sections such as "Task:" and "Instructions:" are merged (see
+        PromptSections.merge), and the result renders a prompt in one pass.
+        Compile once and reuse the pipeline for many prompts.
+        
+        Args:
+            strategies: Strategy names in the order they apply (e.g. ['role', 'cot', 'sot'])
+            **kwargs: Strategy-specific parameters, passed to every strategy
+            
+        Returns:
+            The compiled pipeline
+            
+        Raises:
+            ValueError: If a strategy is not recognized or none are given
+        """
+        return compile_pipeline([self._get_strategy(s) for s in strategies], **kwargs)
+    
+    def improve_pipeline(self, prompt: str, strategies: List[str], **kwargs) -> str:
+        """
+        Improve a prompt with several strategies fused into one template.
+        
+        Args:
+            prompt: The original prompt to improve
+            strategies: Strategy names in the order they apply (e.g. ['role', 'cot', 'sot'])
+            **kwargs: Strategy-specific parameters, passed to every strategy
+            
+        Returns:
+            The improved prompt
+            
+        Raises:
+            ValueError: If a strategy is not recognized or none are given
+        """
+        return self.compile_pipeline(strategies, **kwargs).render(prompt)
+    
+    def improve_many(
+        self,
+        prompts: List[str],
+        strategy: str,
+        workers: Optional[int] = None,
+        executor: Literal["thread", "process"] = "thread",
+        chunksize: Optional[int] = None,
+        **kwargs
+    ) -> List[Union[str, Exception]]:
+        """
+        Improve many prompts with one strategy in parallel.
+        
+        Use threads (the default) for strategies that call the LLM. Use processes
+        for very large batches of template-only rendering: prompts are sent to
+        the workers in chunks, and each worker renders them with a copy of this
+        improver's strategy instance (with its configuration, such as examples
+        or role, but without its LLM client), so the strategy and kwargs must be
+        picklable and the strategy must not need an LLM client.
+        
+        Args:
+            prompts: Prompts to improve
+            strategy: Strategy name (e.g., 'role', 'cot', 'react')
+            workers: Maximum number of threads or processes (default: executor default)
+            executor: "thread" or "process" (default: "thread")
+            chunksize: Prompts per process pool task (default: about four chunks per worker)
+            **kwargs: Additional strategy-specific parameters applied to every prompt
+            
+        Returns:
+            List of improved prompts in input order; an item that failed holds its exception
+            
+        Raises:
+            ValueError: If strategy or executor is not recognized, or the strategy
+                        cannot be sent to worker processes
+        """
+        strategy_instance = self._get_strategy(strategy)
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}. Use 'thread' or 'process'.")
+        if not prompts:
+            return []
+        
+        if executor == "thread":
+            def improve_one(prompt: str) -> Union[str, Exception]:
+                try:
+                    return strategy_instance.improve(prompt, **kwargs)
+                except Exception as e:
+                    return e
+            
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(improve_one, prompts))
+        
+        if chunksize is None:
+            num_workers = workers or os.cpu_count() or 1
+            chunksize = max(1, math.ceil(len(prompts) / (num_workers * 4)))
+        chunks = [prompts[i:i + chunksize] for i in range(0, len(prompts), chunksize)]
+        
+        try:
+            pickled_strategy = pickle.dumps(strategy_instance)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            raise ValueError(
+                f"Strategy '{strategy}' cannot be sent to worker processes ({e}). Use executor='thread'."
+            ) from e
+        
+        results: List[Union[str, Exception]] = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pickled_strategy,)) as pool:
+            futures = [pool.submit(_improve_chunk, chunk, kwargs) for chunk in chunks]
+            for future in futures:
+                results.extend(future.result())
+        return results
+    
+    async def aimprove(self, prompt: str, strategy: str, **kwargs) -> str:
+        """
+        Asynchronously improve a prompt using the specified strategy.
+        
+        Args:
+            prompt: The original prompt to improve
+            strategy: Strategy name (e.g., 'role', 'cot', 'react')
+            **kwargs: Additional strategy-specific parameters
+            
+        Returns:
+            The improved prompt
+            
+        Raises:
+            ValueError: If strategy is not recognized
+        """
+        return await self._get_strategy(strategy).aimprove(prompt, **kwargs)
+    
+    def improve_batch(self, prompts: List[str], strategy: str, **kwargs) -> List[Union[str, Exception]]:
+        """
+        Improve a group of prompts with one batched strategy call.
+        
+        Unlike ``improve_many``, which spreads prompts over workers, this hands the
+        whole group to the strategy at once (see BaseStrategy.improve_batch), so
+        template strategies render it in a single pass.
+        
+        Args:
+            prompts: Prompts to improve
+            strategy: Strategy name (e.g., 'role', 'cot', 'react')
+            **kwargs: Additional strategy-specific parameters, shared by every prompt
+            
+        Returns:
+            List of improved prompts in input order; an item that failed holds its exception
+            
+        Raises:
+            ValueError: If strategy is not recognized
+        """
+        return self._get_strategy(strategy).improve_batch(prompts, **kwargs)
+    
+    async def aimprove_batch(self, prompts: List[str], strategy: str, **kwargs) -> List[Union[str, Exception]]:
+        """
+        Asynchronously improve a group of prompts with one batched strategy call.
+        
+        Args:
+            prompts: Prompts to improve
+            strategy: Strategy name (e.g., 'role', 'cot', 'react')
+            **kwargs: Additional strategy-specific parameters, shared by every prompt
+            
+        Returns:
+            List of improved prompts in input order; an item that failed holds its exception
+            
+        Raises:
+            ValueError: If strategy is not recognized
+        """
+        return await self._get_strategy(strategy).aimprove_batch(prompts, **kwargs)
+    
+    def improve_stream(self, prompt: str, strategy: str, **kwargs) -> Iterator[str]:
+        """
+        Improve a prompt, yielding the improved text in chunks as it is produced.
+        
+        Args:
+            prompt: The original prompt to improve
+            strategy: Strategy name (e.g., 'role', 'cot', 'react')
+            **kwargs: Additional strategy-specific parameters
+            
+        Yields:
+            Chunks of the improved prompt
+            
+        Raises:
+            ValueError: If strategy is not recognized
+        """
+        strategy_instance = self._get_strategy(strategy)
+        return strategy_instance.improve_stream(prompt, **kwargs)
+    
+    def aimprove_stream(self, prompt: str, strategy: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Asynchronously improve a prompt, yielding the improved text in chunks.
+        
+        Args:
+            prompt: The original prompt to improve
+            strategy: Strategy name (e.g., 'role', 'cot', 'react')
+            **kwargs: Additional strategy-specific parameters
+            
+        Returns:
+            Async iterator over chunks of the improved prompt
+            
+        Raises:
+            ValueError: If strategy is not recognized
+        """
+        strategy_instance = self._get_strategy(strategy)
+        return strategy_instance.aimprove_stream(prompt, **kwargs)
+    
+    def _get_strategy(self, strategy: str) -> BaseStrategy:
+        """Look up a strategy instance by (case-insensitive) name."""
+        try:
+            return self.strategies[strategy]
+        except KeyError:
             available = ', '.join(self.strategies.keys())
             raise ValueError(
                 f"Unknown strategy: '{strategy}'. "
                 f"Available strategies: {available}"
-            )
-        
-        strategy_instance = self.strategies[strategy_lower]
-        return strategy_instance.improve(prompt, **kwargs)
+            ) from None
     
     def get_available_strategies(self) -> list:
         """Return list of available strategy names."""
@@ -127,6 +477,7 @@ class PromptImprover:
         strategy_instance = self.strategies[strategy_lower]
         return {
             'name': strategy_instance.get_strategy_name(),
-            'key': strategy_lower
+            'key': strategy_lower,
+            'canonical': self.strategies.registry.resolve(strategy_lower)
         }
 
@@ -0,0 +1,358 @@
+"""Resumable, checkpointed batch jobs sharded across worker processes."""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set
+try:
+    from .batch import FORMATS, BatchItem, parse_line, run_batch
+except ImportError:
+    from batch import FORMATS, BatchItem, parse_line, run_batch
+
+JOB_VERSION = 2
+
+
+def _shard_path(job_dir: str, shard: int, suffix: str) -> str:
+    return os.path.join(job_dir, f"shard-{shard:05d}.{suffix}")
+
+
+def _truncate_partial_line(path: str) -> None:
+    """Cut a trailing partial line left by a crash, so appends start on a fresh line."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        size = end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - 65536)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end != size:
+            f.truncate(end)
+
+
+def _read_manifest(path: str) -> Set[int]:
+    """Return the line numbers recorded as completed in a shard manifest."""
+    _truncate_partial_line(path)
+    done: Set[int] = set()
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                done.add(int(line))
+    return done
+
+
+def _line_start(f, offset: int) -> int:
+    """Return the offset of the first line of a binary file starting at or after offset."""
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    f.readline()
+    return f.tell()
+
+
+def _count_newlines(path: str, start: int, end: int) -> int:
+    """Count the newlines in a byte range of a file."""
+    count = 0
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(1 << 20, remaining))
+            if not chunk:
+                break
+            count += chunk.count(b"\n")
+            remaining -= len(chunk)
+    return count
+
+
+def _shard_items(config: Dict[str, Any], done: Set[int]) -> Iterator[BatchItem]:
+    """Yield the unfinished items in a shard's byte range, keyed by (line number, item id)."""
+    with open(config["input"], "rb") as f:
+        f.seek(config["start"])
+        offset, line_number = config["start"], config["first_line"]
+        while offset < config["end"]:
+            raw = f.readline()
+            if not raw:
+                break
+            offset += len(raw)
+            if line_number not in done:
+                item = parse_line(raw.decode("utf-8", errors="replace"), line_number, config["format"])
+                if item is not None:
+                    # The line number is the checkpoint key; the item id is restored on output
+                    item.id = (line_number, item.id)
+                    yield item
+            line_number += 1
+
+
+def _run_shard(config: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Process one shard, appending results and checkpointing completed lines.
+    
+    Results are appended to the shard output; at every checkpoint the output is
+    flushed to disk before the completed line numbers are appended to the
+    manifest, so a line in the manifest always has its result on disk. Failed
+    items are written to a per-run error file and retried on the next run.
+    """
+    try:
+        from .improver import PromptImprover
+    except ImportError:
+        from improver import PromptImprover
+    if config["offline"]:
+        improver = PromptImprover(offline=True)
+    else:
+        improver = PromptImprover(provider=config["provider"], model_name=config["model_name"])
+    
+    job_dir, shard = config["job_dir"], config["shard"]
+    output_path = _shard_path(job_dir, shard, "jsonl")
+    manifest_path = _shard_path(job_dir, shard, "manifest")
+    done = _read_manifest(manifest_path)
+    _truncate_partial_line(output_path)
+    
+    counts = {"skipped": len(done), "succeeded": 0, "failed": 0}
+    pending: List[int] = []
+    
+    with open(output_path, "a", encoding="utf-8") as out, \
+            open(manifest_path, "a", encoding="utf-8") as manifest, \
+            open(_shard_path(job_dir, shard, "errors.jsonl"), "w", encoding="utf-8") as errors:
+        
+        def checkpoint():
+            out.flush()
+            os.fsync(out.fileno())
+            manifest.write("".join(f"{line_number}\n" for line_number in pending))
+            manifest.flush()
+            os.fsync(manifest.fileno())
+            pending.clear()
+        
+        results = run_batch(
+            improver,
+            _shard_items(config, done),
+            strategy=config["strategy"],
+            concurrency=config["concurrency"],
+            **config["kwargs"]
+        )
+        try:
+            for result in results:
+                line_number, result["id"] = result["id"]
+                record = json.dumps({"line": line_number, **result}, ensure_ascii=False) + "\n"
+                if "error" in result:
+                    errors.write(record)
+                    counts["failed"] += 1
+                    continue
+                out.write(record)
+                pending.append(line_number)
+                counts["succeeded"] += 1
+                if len(pending) >= config["checkpoint_every"]:
+                    checkpoint()
+        finally:
+            results.close()
+            checkpoint()
+    return counts
+
+
+class BatchJob:
+    """A batch of prompts from a file, processed in shards with on-disk checkpoints.
+    
+    The input is split into ``shards`` contiguous byte ranges at line starts, so
+    each shard reads only its own part of the file. Each shard runs in its own
+    worker process (with ``concurrency`` threads for LLM-backed strategies) and
+    appends its results and an append-only manifest of completed line numbers
+    to the job directory. Running an interrupted job again skips the lines in
+    the manifests, and the shard outputs are merged into one deduplicated
+    output file once every shard has finished.
+    """
+    
+    def __init__(
+        self,
+        input_path: str,
+        job_dir: str,
+        strategy: Optional[str] = None,
+        shards: Optional[int] = None,
+        processes: Optional[int] = None,
+        concurrency: int = 1,
+        format: str = "auto",
+        checkpoint_every: int = 1000,
+        offline: bool = False,
+        provider: str = "openai",
+        model_name: Optional[str] = None,
+        **kwargs
+    ):
+        """
+        Initialize the job.
+        
+        Args:
+            input_path: Input file (JSONL or plain lines, see batch.parse_line)
+            job_dir: Directory holding the job's shard outputs and manifests
+            strategy: Strategy for lines that do not name one
+            shards: Number of shards (default: number of CPUs); fixed for the job's lifetime
+            processes: Worker processes (default: shards); 1 runs shards in this process
+            concurrency: Threads per worker, for LLM-backed strategies (default: 1)
+            format: Input format, "auto", "jsonl" or "lines" (default: "auto")
+            checkpoint_every: Completed items between manifest checkpoints (default: 1000)
+            offline: Build workers in offline (template-only) mode
+            provider: LLM provider of the workers' clients (default: "openai")
+            model_name: Model of the workers' clients (default: provider default)
+            **kwargs: Strategy parameters for every line; per-line kwargs take precedence
+        
+        Raises:
+            ValueError: If an argument is out of range or job_dir belongs to a different job
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format: {format}. Use one of: {', '.join(FORMATS)}")
+        if shards is None:
+            shards = os.cpu_count() or 1
+        if shards < 1 or concurrency < 1 or checkpoint_every < 1 or (processes is not None and processes < 1):
+            raise ValueError("shards, processes, concurrency and checkpoint_every must be at least 1")
+        
+        self.input_path = os.path.abspath(input_path)
+        self.job_dir = job_dir
+        self.strategy = strategy
+        self.shards = shards
+        self.processes = processes or shards
+        self.concurrency = concurrency
+        self.format = format
+        self.checkpoint_every = checkpoint_every
+        self.offline = offline
+        self.provider = provider
+        self.model_name = model_name
+        self.kwargs = kwargs
+        
+        os.makedirs(job_dir, exist_ok=True)
+        self._check_job_file()
+    
+    def _check_job_file(self) -> None:
+        """Record the job definition, or verify job_dir was created for this same job."""
+        definition = {
+            "version": JOB_VERSION,
+            "input": self.input_path,
+            "input_size": os.path.getsize(self.input_path),
+            "shards": self.shards,
+            "format": self.format,
+            "strategy": self.strategy,
+            "kwargs": self.kwargs,
+        }
+        path = os.path.join(self.job_dir, "job.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                existing = json.load(f)
+            if existing != definition:
+                changed = sorted(k for k in definition if existing.get(k) != definition[k])
+                raise ValueError(
+                    f"Job directory {self.job_dir} belongs to a different job (changed: {', '.join(changed)}). "
+                    "Use a new job directory."
+                )
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(definition, f, indent=2)
+    
+    def _shard_ranges(self, map_func=map) -> List[Dict[str, int]]:
+        """
+        Return each shard's byte range and first line number.
+        
+        Range boundaries are found by seeking, and the lines in each range are
+        counted (with map_func, e.g. a process pool's map) to number the lines
+        of later shards. The plan is stored in the job directory on the first
+        run and reused when resuming.
+        """
+        path = os.path.join(self.job_dir, "shards.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        
+        size = os.path.getsize(self.input_path)
+        with open(self.input_path, "rb") as f:
+            bounds = [_line_start(f, size * shard // self.shards) for shard in range(self.shards)] + [size]
+        starts, ends = bounds[:-1], bounds[1:]
+        counts = list(map_func(_count_newlines, [self.input_path] * self.shards, starts, ends))
+        
+        ranges = []
+        first_line = 1
+        for start, end, count in zip(starts, ends, counts):
+            ranges.append({"start": start, "end": end, "first_line": first_line})
+            first_line += count
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(ranges, f)
+        os.replace(path + ".tmp", path)
+        return ranges
+    
+    def _shard_config(self, shard: int, shard_range: Dict[str, int]) -> Dict[str, Any]:
+        return {
+            "job_dir": self.job_dir,
+            "input": self.input_path,
+            "shard": shard,
+            **shard_range,
+            "format": self.format,
+            "strategy": self.strategy,
+            "concurrency": self.concurrency,
+            "checkpoint_every": self.checkpoint_every,
+            "offline": self.offline,
+            "provider": self.provider,
+            "model_name": self.model_name,
+            "kwargs": self.kwargs,
+        }
+    
+    def run(self, output_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process every unfinished line, then merge the shard outputs.
+        
+        Args:
+            output_path: Merged output file (default: output.jsonl in job_dir)
+        
+        Returns:
+            Counts of 'skipped' (done in earlier runs), 'succeeded' and 'failed' lines,
+            plus 'merged' (results in the output) and 'output' (its path)
+        """
+        if self.processes == 1:
+            configs = [self._shard_config(shard, r) for shard, r in enumerate(self._shard_ranges())]
+            shard_counts = [_run_shard(config) for config in configs]
+        else:
+            with ProcessPoolExecutor(max_workers=self.processes) as pool:
+                ranges = self._shard_ranges(pool.map)
+                configs = [self._shard_config(shard, r) for shard, r in enumerate(ranges)]
+                shard_counts = list(pool.map(_run_shard, configs))
+        
+        totals = {key: sum(counts[key] for counts in shard_counts) for key in ("skipped", "succeeded", "failed")}
+        output_path = output_path or os.path.join(self.job_dir, "output.jsonl")
+        totals["merged"] = self.merge(output_path)
+        totals["output"] = output_path
+        return totals
+    
+    def merge(self, output_path: str) -> int:
+        """
+        Merge the shard outputs into one JSONL file, dropping duplicate lines.
+        
+        A line can appear twice in a shard output if a run stopped between
+        writing its result and checkpointing it. Errors of the latest run are
+        appended after the results.
+        
+        Args:
+            output_path: Merged output file (overwritten)
+        
+        Returns:
+            Number of results written
+        """
+        written = 0
+        tmp_path = output_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            for suffix in ("jsonl", "errors.jsonl"):
+                for shard in range(self.shards):
+                    path = _shard_path(self.job_dir, shard, suffix)
+                    if not os.path.exists(path):
+                        continue
+                    seen: Set[int] = set()
+                    with open(path, encoding="utf-8") as f:
+                        for line in f:
+                            try:
+                                record = json.loads(line)
+                            except ValueError:
+                                continue
+                            line_number = record.pop("line")
+                            if line_number in seen:
+                                continue
+                            seen.add(line_number)
+                            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                            written += 1
+        os.replace(tmp_path, output_path)
+        return written
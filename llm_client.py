@@ -1,21 +1,96 @@
 """LangChain LLM client setup for prompt improvement."""
+import asyncio
+import importlib.util
 import os
-from typing import Optional, Literal
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-
-# Load environment variables
-load_dotenv()
-
-# Try to import Google Gemini support (optional dependency)
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Literal, Tuple, Union
 try:
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    GEMINI_AVAILABLE = True
+    from .response_cache import ResponseCache
+    from .client_pool import DEFAULT_OPENAI_BASE_URL, get_registry
+    from .rate_limiter import RateLimiter, estimate_tokens
+    from .hedging import HedgePolicy
+    from .singleflight import SingleFlight
 except ImportError:
-    GEMINI_AVAILABLE = False
-    ChatGoogleGenerativeAI = None
+    from response_cache import ResponseCache
+    from client_pool import DEFAULT_OPENAI_BASE_URL, get_registry
+    from rate_limiter import RateLimiter, estimate_tokens
+    from hedging import HedgePolicy
+    from singleflight import SingleFlight
+
+# Provider SDKs are slow to import, so they are only loaded when a provider
+# model is actually built (see _import_chat_openai / _import_chat_gemini).
+ChatOpenAI = None
+ChatGoogleGenerativeAI = None
+
+# langchain_core is only needed once a client builds a chain, so template-only
+# (offline) runs never import it (see _import_langchain_core).
+ChatPromptTemplate = None
+StrOutputParser = None
+RunnableLambda = None
+
+# Google Gemini support is an optional dependency; check for it without importing it
+GEMINI_AVAILABLE = importlib.util.find_spec("langchain_google_genai") is not None
+
+_ENV_LOADED = False
+
+
+def _load_env() -> None:
+    """Load environment variables from .env the first time they are needed."""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _ENV_LOADED = True
+
+
+def _import_chat_openai():
+    """Import and return the ChatOpenAI class on first use."""
+    global ChatOpenAI
+    if ChatOpenAI is None:
+        from langchain_openai import ChatOpenAI as chat_openai
+        ChatOpenAI = chat_openai
+    return ChatOpenAI
+
+
+def _import_chat_gemini():
+    """Import and return the ChatGoogleGenerativeAI class on first use."""
+    global ChatGoogleGenerativeAI
+    if ChatGoogleGenerativeAI is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI as chat_gemini
+        ChatGoogleGenerativeAI = chat_gemini
+    return ChatGoogleGenerativeAI
+
+
+def _import_langchain_core() -> None:
+    """Import the langchain_core classes used to build chains on first use."""
+    global ChatPromptTemplate, StrOutputParser, RunnableLambda
+    if ChatPromptTemplate is None:
+        from langchain_core.prompts import ChatPromptTemplate as chat_prompt_template
+        ChatPromptTemplate = chat_prompt_template
+    if StrOutputParser is None:
+        from langchain_core.output_parsers import StrOutputParser as str_output_parser
+        StrOutputParser = str_output_parser
+    if RunnableLambda is None:
+        from langchain_core.runnables import RunnableLambda as runnable_lambda
+        RunnableLambda = runnable_lambda
+
+
+def build_prompt(kind: str, text: str):
+    """
+    Return the prompt template LLMClient sends for a request.
+    
+    Args:
+        kind: "template" for ``from_template`` or "direct" for a single human message
+        text: Template or message text
+        
+    Returns:
+        ChatPromptTemplate for the request
+    """
+    _import_langchain_core()
+    if kind == "template":
+        return ChatPromptTemplate.from_template(text)
+    return ChatPromptTemplate.from_messages([("human", text)])
 
 
 class LLMClient:
@@ -26,7 +101,13 @@ class LLMClient:
         provider: Literal["openai", "gemini"] = "gemini",
         model_name: Optional[str] = None,
         temperature: float = 0.7,
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        chain_cache_size: int = 128,
+        cache: Optional[ResponseCache] = None,
+        shared_pool: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        hedge: Optional[HedgePolicy] = None,
+        coalescer: Optional[SingleFlight] = None
     ):
         """
         Initialize the LLM client.
@@ -38,6 +119,24 @@ class LLMClient:
                        - Gemini: "gemini-2.0-flash-exp"
             temperature: Temperature for generation (default: 0.7)
             api_key: API key (default: from environment variables)
+            chain_cache_size: Maximum number of compiled chains kept in the LRU
+                              cache, keyed by template text (default: 128, 0 disables)
+            cache: Optional persistent ResponseCache. Responses are keyed on provider,
+                   model name, temperature, template text and variables.
+            shared_pool: If True (default), reuse the process-wide provider model and
+                         keep-alive HTTP connection pool for this configuration
+                         (see client_pool). If False, build a private model.
+            rate_limiter: Optional RateLimiter enforcing requests/tokens per minute on
+                          every call, sync or async (see rate_limiter.get_rate_limiter
+                          for a limiter shared per provider/model)
+            hedge: Optional HedgePolicy. When set, invoke/ainvoke calls that run past
+                   the learned latency percentile are duplicated (optionally to a
+                   fallback client) and the first response wins.
+            coalescer: Optional SingleFlight. When set, identical invoke/ainvoke
+                       requests already in flight (same provider, model,
+                       temperature and fully rendered prompt) share one provider
+                       call. Share one instance across clients to coalesce
+                       between them.
             
         Raises:
             ValueError: If provider is not supported or API key is missing
@@ -56,8 +155,12 @@ class LLMClient:
         
         self.model_name = model_name
         self.temperature = temperature
+        self.shared_pool = shared_pool
         
-        # Initialize provider-specific LLM
+        # Resolve provider credentials now; the provider model itself (and its
+        # SDK import) is deferred until the first call via the `llm` property
+        if api_key is None:
+            _load_env()
         if self.provider == "openai":
             self.api_key = api_key or os.getenv("OPENAI_API_KEY")
             if not self.api_key:
@@ -65,12 +168,6 @@ class LLMClient:
                     "OPENAI_API_KEY not found. Please set it in your .env file or pass it as a parameter."
                 )
             
-            self.llm = ChatOpenAI(
-                model=model_name,
-                temperature=temperature,
-                api_key=self.api_key
-            )
-            
         elif self.provider == "gemini":
             if not GEMINI_AVAILABLE:
                 raise ImportError(
@@ -83,16 +180,269 @@ class LLMClient:
                 raise ValueError(
                     "GOOGLE_API_KEY not found. Please set it in your .env file or pass it as a parameter."
                 )
-            
-            self.llm = ChatGoogleGenerativeAI(
-                model=model_name,
-                temperature=temperature,
-                google_api_key=self.api_key
-            )
         else:
             raise ValueError(f"Unknown provider: {provider}. Use 'openai' or 'gemini'.")
         
+        self._llm = None
+        # Registry generation of a shared model; None for a private or assigned model
+        self._llm_generation: Optional[int] = None
+        self._llm_lock = threading.Lock()
+        _import_langchain_core()
         self.output_parser = StrOutputParser()
+        
+        # LRU of compiled `prompt | llm | parser` chains, keyed by template text
+        self.chain_cache_size = chain_cache_size
+        self.chain_cache_hits = 0
+        self.chain_cache_misses = 0
+        self._chain_cache: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+        self._chain_cache_lock = threading.Lock()
+        
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.hedge = hedge
+        self.coalescer = coalescer
+    
+    @property
+    def llm(self):
+        """
+        Provider chat model, built (importing its SDK) on first access.
+        
+        A shared model is looked up again once the registry has been cleared
+        (e.g. by configure_pool), so it never keeps using a dropped pool.
+        """
+        llm = self._llm
+        if llm is None or self._is_stale():
+            with self._llm_lock:
+                if self._llm is None or self._is_stale():
+                    generation = get_registry().generation
+                    self._llm = self._build_llm()
+                    self._llm_generation = generation if self.shared_pool else None
+                llm = self._llm
+        return llm
+    
+    @llm.setter
+    def llm(self, value) -> None:
+        self._llm = value
+        self._llm_generation = None
+    
+    @llm.deleter
+    def llm(self) -> None:
+        # Drop the built model; the next access builds a fresh one
+        self._llm = None
+    
+    def _is_stale(self) -> bool:
+        """Whether the shared model came from a registry that has since been cleared."""
+        return self._llm_generation is not None and self._llm_generation != get_registry().generation
+    
+    def _build_llm(self):
+        """Build the provider-specific LangChain chat model, or reuse the shared one."""
+        if self.provider == "openai":
+            chat_openai = _import_chat_openai()
+            if not self.shared_pool:
+                return chat_openai(
+                    model=self.model_name,
+                    temperature=self.temperature,
+                    api_key=self.api_key
+                )
+            registry = get_registry()
+            return registry.get_or_create(
+                ("openai", self.model_name, self.temperature, self.api_key, chat_openai),
+                lambda: chat_openai(
+                    model=self.model_name,
+                    temperature=self.temperature,
+                    api_key=self.api_key,
+                    http_client=registry.http_client,
+                    http_async_client=registry.async_http_client
+                )
+            )
+        
+        chat_gemini = _import_chat_gemini()
+        
+        def build_gemini():
+            return chat_gemini(
+                model=self.model_name,
+                temperature=self.temperature,
+                google_api_key=self.api_key
+            )
+        
+        if not self.shared_pool:
+            return build_gemini()
+        return get_registry().get_or_create(
+            ("gemini", self.model_name, self.temperature, self.api_key, chat_gemini),
+            build_gemini
+        )
+    
+    def prewarm(self, timeout: float = 5.0) -> bool:
+        """
+        Build the provider model and open a keep-alive connection ahead of use.
+        
+        Call this at startup so the first real request does not pay for the
+        SDK import, DNS lookup and TLS handshake.
+        
+        Args:
+            timeout: Connection timeout in seconds (default: 5.0)
+            
+        Returns:
+            True if the model is ready and (for pooled OpenAI clients) a
+            connection to the API was established
+        """
+        self.llm
+        if self.provider == "openai" and self.shared_pool:
+            base_url = os.getenv("OPENAI_BASE_URL") or DEFAULT_OPENAI_BASE_URL
+            return get_registry().prewarm([base_url], timeout=timeout)[base_url]
+        return True
+    
+    def _get_chain(self, kind: str, text: str):
+        """
+        Return the compiled chain for a template, building it on a cache miss.
+        
+        Chains are bound to the llm, parser and rate limiter they were built
+        with, so those are part of the key; swapping one simply misses the cache.
+        
+        Args:
+            kind: "template" for ``from_template`` or "direct" for a single human message
+            text: Template or message text
+            
+        Returns:
+            Runnable chain of prompt, llm and output parser
+        """
+        key = (kind, text, id(self.llm), id(self.output_parser), id(self.rate_limiter))
+        with self._chain_cache_lock:
+            chain = self._chain_cache.get(key)
+            if chain is not None:
+                self._chain_cache.move_to_end(key)
+                self.chain_cache_hits += 1
+                return chain
+            self.chain_cache_misses += 1
+        
+        prompt = build_prompt(kind, text)
+        if self.rate_limiter is not None:
+            prompt = prompt | RunnableLambda(self._acquire_rate_limit, afunc=self._aacquire_rate_limit)
+        chain = prompt | self.llm | self.output_parser
+        
+        if self.chain_cache_size > 0:
+            with self._chain_cache_lock:
+                self._chain_cache[key] = chain
+                self._chain_cache.move_to_end(key)
+                while len(self._chain_cache) > self.chain_cache_size:
+                    self._chain_cache.popitem(last=False)
+        return chain
+    
+    def _response_cache_key(self, kind: str, text: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Return the response cache key for a request, or None if it must not be cached."""
+        if self.cache is None or not self.cache.should_cache(self.temperature):
+            return None
+        return ResponseCache.make_key(
+            self.provider, self.model_name, self.temperature, text, kwargs, kind=kind
+        )
+    
+    def _acquire_rate_limit(self, prompt_value):
+        """Chain step that waits for rate limit budget before the model call."""
+        self.rate_limiter.acquire(estimate_tokens(prompt_value.to_string()))
+        return prompt_value
+    
+    async def _aacquire_rate_limit(self, prompt_value):
+        """Async chain step that waits for rate limit budget before the model call."""
+        await self.rate_limiter.aacquire(estimate_tokens(prompt_value.to_string()))
+        return prompt_value
+    
+    def get_chain_cache_stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size of the compiled chain cache."""
+        with self._chain_cache_lock:
+            return {
+                'hits': self.chain_cache_hits,
+                'misses': self.chain_cache_misses,
+                'size': len(self._chain_cache),
+                'maxsize': self.chain_cache_size,
+            }
+    
+    def clear_chain_cache(self) -> None:
+        """Drop all compiled chains and reset the hit/miss counters."""
+        with self._chain_cache_lock:
+            self._chain_cache.clear()
+            self.chain_cache_hits = 0
+            self.chain_cache_misses = 0
+    
+    def _flight_key(self, chain, kwargs: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Key identifying a request by its model settings and fully rendered prompt."""
+        rendered = chain.first.format_prompt(**kwargs).to_string()
+        return (self.provider, self.model_name, self.temperature, rendered)
+    
+    def _call(self, kind: str, text: str, kwargs: Dict[str, Any]) -> str:
+        """Run one request through the response cache, coalescing, hedging and the compiled chain."""
+        cache_key = self._response_cache_key(kind, text, kwargs)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        chain = self._get_chain(kind, text)
+        
+        def run() -> str:
+            if self.hedge is None:
+                return chain.invoke(kwargs)
+            return self.hedge.run(
+                lambda: chain.invoke(kwargs),
+                lambda: self._hedge_backup(chain, kind, text, kwargs)
+            )
+        
+        if self.coalescer is None:
+            result = run()
+        else:
+            result = self.coalescer.do(self._flight_key(chain, kwargs), run)
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        return result
+    
+    async def _acall(self, kind: str, text: str, kwargs: Dict[str, Any]) -> str:
+        """Async counterpart of ``_call``."""
+        cache_key = self._response_cache_key(kind, text, kwargs)
+        if cache_key is not None:
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                return cached
+        
+        chain = self._get_chain(kind, text)
+        
+        async def run() -> str:
+            if self.hedge is None:
+                return await chain.ainvoke(kwargs)
+            return await self.hedge.arun(
+                lambda: chain.ainvoke(kwargs),
+                lambda: self._ahedge_backup(chain, kind, text, kwargs)
+            )
+        
+        if self.coalescer is None:
+            result = await run()
+        else:
+            result = await self.coalescer.ado(self._flight_key(chain, kwargs), run)
+        if cache_key is not None:
+            await self.cache.aset(cache_key, result)
+        return result
+    
+    def get_coalescing_stats(self) -> Optional[Dict[str, int]]:
+        """Return the coalescer's counters (``coalesced`` = provider calls saved), or None if disabled."""
+        if self.coalescer is None:
+            return None
+        return self.coalescer.get_stats()
+    
+    def _hedge_backup(self, chain, kind: str, text: str, kwargs: Dict[str, Any]) -> str:
+        """Duplicate request for a hedge: the fallback client if set, else this chain again."""
+        fallback = self.hedge.fallback
+        if fallback is None:
+            return chain.invoke(kwargs)
+        if kind == "direct":
+            return fallback.invoke_direct(text)
+        return fallback.invoke(text, **kwargs)
+    
+    async def _ahedge_backup(self, chain, kind: str, text: str, kwargs: Dict[str, Any]) -> str:
+        """Async duplicate request for a hedge."""
+        fallback = self.hedge.fallback
+        if fallback is None:
+            return await chain.ainvoke(kwargs)
+        if kind == "direct":
+            return await fallback.ainvoke_direct(text)
+        return await fallback.ainvoke(text, **kwargs)
     
     def invoke(self, prompt_template: str, **kwargs) -> str:
         """
@@ -105,9 +455,7 @@ class LLMClient:
         Returns:
             LLM response as string
         """
-        prompt = ChatPromptTemplate.from_template(prompt_template)
-        chain = prompt | self.llm | self.output_parser
-        return chain.invoke(kwargs)
+        return self._call("template", prompt_template, kwargs)
     
     def invoke_direct(self, message: str) -> str:
         """
@@ -119,7 +467,187 @@ class LLMClient:
         Returns:
             LLM response as string
         """
-        prompt = ChatPromptTemplate.from_messages([("human", message)])
-        chain = prompt | self.llm | self.output_parser
-        return chain.invoke({})
-
+        return self._call("direct", message, {})
+    
+    def invoke_batch(
+        self,
+        prompt_template: str,
+        inputs: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = 8
+    ) -> List[Union[str, Exception]]:
+        """
+        Invoke the LLM once per set of template variables, with bounded concurrency.
+        
+        Uses the runnable batch machinery, so requests run in parallel up to
+        ``max_concurrency``. A failing item does not fail the batch: its
+        exception is returned in its slot instead of a response.
+        
+        Args:
+            prompt_template: Prompt template string shared by all items
+            inputs: List of variable dicts, one per request
+            max_concurrency: Maximum requests in flight at once (None for no limit)
+            
+        Returns:
+            List of responses (or exceptions for failed items) in input order
+        """
+        if not inputs:
+            return []
+        results, pending = self._lookup_batch(prompt_template, inputs)
+        if pending:
+            chain = self._get_chain("template", prompt_template)
+            responses = chain.batch(
+                [inputs[i] for i, _ in pending],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True
+            )
+            self._store_batch(results, pending, responses)
+        return results
+    
+    def stream(self, prompt_template: str, **kwargs) -> Iterator[str]:
+        """
+        Stream the LLM response for a prompt template chunk by chunk.
+        
+        With a response cache, a hit is yielded as a single chunk and a fully
+        consumed miss is stored once the stream completes.
+        
+        Args:
+            prompt_template: Prompt template string
+            **kwargs: Variables to fill in the template
+            
+        Yields:
+            Response text chunks as they arrive
+        """
+        cache_key = self._response_cache_key("template", prompt_template, kwargs)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        
+        chain = self._get_chain("template", prompt_template)
+        chunks = []
+        for chunk in chain.stream(kwargs):
+            chunks.append(chunk)
+            yield chunk
+        if cache_key is not None:
+            self.cache.set(cache_key, "".join(chunks))
+    
+    def _lookup_batch(self, prompt_template: str, inputs: List[Dict[str, Any]]):
+        """
+        Resolve batch items from the response cache.
+        
+        Returns:
+            Tuple of (results, pending) where results has cached responses filled
+            in and pending lists (index, cache_key) pairs that still need a call
+        """
+        results: List[Union[str, Exception, None]] = [None] * len(inputs)
+        pending: List[Tuple[int, Optional[str]]] = []
+        for i, item in enumerate(inputs):
+            cache_key = self._response_cache_key("template", prompt_template, item)
+            cached = self.cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, cache_key))
+        return results, pending
+    
+    def _store_batch(self, results, pending, responses) -> None:
+        """Fill batch results from fresh responses and cache the successful ones."""
+        for (i, cache_key), response in zip(pending, responses):
+            results[i] = response
+            if cache_key is not None and not isinstance(response, Exception):
+                self.cache.set(cache_key, response)
+    
+    async def ainvoke(self, prompt_template: str, **kwargs) -> str:
+        """
+        Asynchronously invoke the LLM with a prompt template.
+        
+        Uses the runnables' native async path, so many calls can be in flight
+        on one event loop without tying up worker threads.
+        
+        Args:
+            prompt_template: Prompt template string
+            **kwargs: Variables to fill in the template
+            
+        Returns:
+            LLM response as string
+        """
+        return await self._acall("template", prompt_template, kwargs)
+    
+    async def ainvoke_direct(self, message: str) -> str:
+        """
+        Asynchronously invoke the LLM with a direct message (no template).
+        
+        Args:
+            message: Direct message to send to LLM
+            
+        Returns:
+            LLM response as string
+        """
+        return await self._acall("direct", message, {})
+    
+    async def ainvoke_batch(
+        self,
+        prompt_template: str,
+        inputs: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = 8
+    ) -> List[Union[str, Exception]]:
+        """
+        Asynchronously invoke the LLM once per set of template variables.
+        
+        Async counterpart of ``invoke_batch``: results come back in input order
+        and failed items hold their exception instead of a response.
+        
+        Args:
+            prompt_template: Prompt template string shared by all items
+            inputs: List of variable dicts, one per request
+            max_concurrency: Maximum requests in flight at once (None for no limit)
+            
+        Returns:
+            List of responses (or exceptions for failed items) in input order
+        """
+        if not inputs:
+            return []
+        # Response cache lookups and writes are blocking SQLite calls; keep them off the loop
+        if self.cache is None:
+            results, pending = self._lookup_batch(prompt_template, inputs)
+        else:
+            results, pending = await asyncio.to_thread(self._lookup_batch, prompt_template, inputs)
+        if pending:
+            chain = self._get_chain("template", prompt_template)
+            responses = await chain.abatch(
+                [inputs[i] for i, _ in pending],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True
+            )
+            if self.cache is None:
+                self._store_batch(results, pending, responses)
+            else:
+                await asyncio.to_thread(self._store_batch, results, pending, responses)
+        return results
+    
+    async def astream(self, prompt_template: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Asynchronously stream the LLM response for a prompt template.
+        
+        Args:
+            prompt_template: Prompt template string
+            **kwargs: Variables to fill in the template
+            
+        Yields:
+            Response text chunks as they arrive
+        """
+        cache_key = self._response_cache_key("template", prompt_template, kwargs)
+        if cache_key is not None:
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        
+        chain = self._get_chain("template", prompt_template)
+        chunks = []
+        async for chunk in chain.astream(kwargs):
+            chunks.append(chunk)
+            yield chunk
+        if cache_key is not None:
+            await self.cache.aset(cache_key, "".join(chunks))
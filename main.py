@@ -1,16 +1,19 @@
 #!/usr/bin/env python3
 """
 Command-line interface for the Prompt Improver tool.
+
+Heavy modules (the improver, LangChain, rich) are imported only when the
+request runs in this process. If a background daemon is running (see
+``python main.py daemon start``), requests are forwarded to it over a Unix
+socket instead and only its rendered output is printed.
 """
 
 import argparse
 import sys
-from improver import PromptImprover
-from utils import print_improved_prompt, print_error, print_info
 
 
-def main():
-    """Main CLI entry point."""
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser of the main command."""
     parser = argparse.ArgumentParser(
         description='Improve prompts using various prompt engineering strategies',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -23,25 +26,33 @@ Available strategies:
   tot               - Tree of Thought (explore multiple branches)
   sot               - Skeleton of Thought (skeleton then expand)
   react             - ReAct (alternate Thought and Action)
+  all               - Every strategy above, side by side
 
 Examples:
   python main.py "Explain recursion" --strategy role
   python main.py "Classify this log" --strategy cot
   python main.py "Debug this API" --strategy react
+  python main.py "Explain recursion" --strategy role --stream
+  python main.py "Explain recursion" --strategy role --offline
+  python main.py "Explain recursion" --strategy all
+  python main.py batch prompts.jsonl --strategy cot -o improved.jsonl
+  python main.py batch --help
+  python main.py serve --offline --port 8000
+  python main.py daemon start
         """
     )
     
     parser.add_argument(
         'prompt',
         type=str,
+        nargs='?',
         help='The original prompt to improve'
     )
     
     parser.add_argument(
         '--strategy', '-s',
         type=str,
-        required=True,
-        help='Strategy to apply (role, few-shot, cot, self-consistency, tot, sot, react)'
+        help='Strategy to apply (role, few-shot, cot, self-consistency, tot, sot, react, or all)'
     )
     
     parser.add_argument(
@@ -98,29 +109,105 @@ Examples:
         help='Model name to use (default: gpt-4o-mini for OpenAI, gemini-2.0-flash-exp for Gemini)'
     )
     
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Template-only mode: no LLM client, provider SDK or API key is needed'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Render the improved prompt as it is generated instead of all at once'
+    )
+    
     parser.add_argument(
         '--list-strategies',
         action='store_true',
         help='List all available strategies and exit'
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Run in this process even if a background daemon is running'
+    )
+    
+    return parser
+
+
+def validate_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Exit with a usage error if the parsed arguments cannot be combined."""
+    if not args.list_strategies:
+        if args.prompt is None:
+            parser.error('the following arguments are required: prompt')
+        if args.strategy is None:
+            parser.error('the following arguments are required: --strategy/-s')
+        if args.strategy.lower() == 'all' and args.stream:
+            parser.error('--stream cannot be combined with --strategy all')
+
+
+def make_improver(args: argparse.Namespace):
+    """Build the PromptImprover for the provider options in args."""
+    from improver import PromptImprover
     
-    # Initialize improver with provider
+    # Listing strategies never needs a client
+    if args.offline or args.list_strategies:
+        return PromptImprover(offline=True)
     from llm_client import LLMClient
     llm_client = LLMClient(
         provider=args.provider,
         model_name=args.model
     )
-    improver = PromptImprover(llm_client=llm_client)
+    return PromptImprover(llm_client=llm_client)
+
+
+def execute(args: argparse.Namespace, improver, console=None) -> int:
+    """
+    Run a parsed request and print its output.
+    
+    Args:
+        args: Parsed and validated arguments
+        improver: PromptImprover to use
+        console: rich Console to print to (default: stdout)
+    
+    Returns:
+        Exit status
+    """
+    from utils import print_improved_prompt, print_improved_prompt_stream, print_improved_prompts, print_error, print_info
     
     # List strategies if requested
     if args.list_strategies:
-        print_info("Available strategies:")
+        print_info("Available strategies:", console)
         for strategy_key in improver.get_available_strategies():
             info = improver.get_strategy_info(strategy_key)
-            print(f"  - {strategy_key:20} : {info['name']}")
-        sys.exit(0)
+            line = f"  - {strategy_key:20} : {info['name']}"
+            if console is None:
+                print(line)
+            else:
+                console.print(line, markup=False, highlight=False)
+        return 0
+    
+    # Improve with every strategy; each one ignores the parameters of the others
+    if args.strategy.lower() == 'all':
+        kwargs = dict(
+            num_examples=args.num_examples,
+            num_paths=args.num_paths,
+            num_branches=args.num_branches,
+            num_points=args.num_points
+        )
+        if args.role:
+            kwargs['role'] = args.role
+        if args.domain:
+            kwargs['domain'] = args.domain
+        try:
+            results = improver.improve_all(args.prompt, **kwargs)
+            names = {key: improver.get_strategy_info(key)['name'] for key in results}
+            print_improved_prompts(args.prompt, results, names, console)
+        except Exception as e:
+            print_error(f"Unexpected error: {str(e)}", console)
+            return 1
+        return 0
     
     # Prepare kwargs based on strategy
     kwargs = {}
@@ -139,17 +226,50 @@ Examples:
     
     # Improve the prompt
     try:
-        improved = improver.improve(args.prompt, args.strategy, **kwargs)
-        strategy_info = improver.get_strategy_info(args.strategy)
-        print_improved_prompt(args.prompt, improved, strategy_info['name'])
+        if args.stream:
+            chunks = improver.improve_stream(args.prompt, args.strategy, **kwargs)
+            strategy_info = improver.get_strategy_info(args.strategy)
+            print_improved_prompt_stream(args.prompt, chunks, strategy_info['name'], console)
+        else:
+            improved = improver.improve(args.prompt, args.strategy, **kwargs)
+            strategy_info = improver.get_strategy_info(args.strategy)
+            print_improved_prompt(args.prompt, improved, strategy_info['name'], console)
     except ValueError as e:
-        print_error(str(e))
-        sys.exit(1)
+        print_error(str(e), console)
+        return 1
     except Exception as e:
-        print_error(f"Unexpected error: {str(e)}")
-        sys.exit(1)
+        print_error(f"Unexpected error: {str(e)}", console)
+        return 1
+    return 0
+
+
+def main():
+    """Main CLI entry point."""
+    if sys.argv[1:2] == ['batch']:
+        from batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+    if sys.argv[1:2] == ['serve']:
+        from server import main as serve_main
+        sys.exit(serve_main(sys.argv[2:]))
+    if sys.argv[1:2] == ['daemon']:
+        from daemon import main as daemon_main
+        sys.exit(daemon_main(sys.argv[2:]))
+    
+    parser = build_parser()
+    args = parser.parse_args()
+    validate_args(parser, args)
+    
+    # Streaming renders live, so it always runs in this process
+    if not args.stream and not args.no_daemon:
+        from daemon import forward
+        response = forward(sys.argv[1:])
+        if response is not None:
+            sys.stdout.write(response['output'])
+            sys.stdout.flush()
+            sys.exit(response['exit_code'])
+    
+    sys.exit(execute(args, make_improver(args)))
 
 
 if __name__ == '__main__':
     main()
-
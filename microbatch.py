@@ -0,0 +1,131 @@
+"""Dynamic micro-batching of concurrent async requests."""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+
+
+class _Group:
+    """Items collected for one key, and the futures of their callers."""
+    
+    def __init__(self):
+        self.items: List[Any] = []
+        self.futures: List[asyncio.Future] = []
+        self.handle: Optional[asyncio.Handle] = None
+
+
+class MicroBatcher:
+    """Group concurrent requests with the same key into one batched call.
+    
+    The first request for a key opens a group; requests with the same key that
+    arrive within ``window`` seconds join it, and the group is dispatched when the
+    window closes or it reaches ``max_batch_size`` items. ``dispatch(key, items)``
+    handles the whole group and returns one result per item (an exception
+    instance fails only its own caller), so each request waits at most ``window``
+    seconds plus the batched call.
+    """
+    
+    def __init__(
+        self,
+        dispatch: Callable[[Hashable, List[Any]], Awaitable[Sequence[Any]]],
+        window: float = 0.005,
+        max_batch_size: int = 64
+    ):
+        """
+        Initialize the batcher.
+        
+        Args:
+            dispatch: Coroutine function handling a group, returning results in item order
+            window: Seconds a group stays open for more requests (default: 0.005);
+                    0 groups only the requests that arrive in the same event loop pass
+            max_batch_size: Largest group; a full group is dispatched at once (default: 64)
+        
+        Raises:
+            ValueError: If window is negative or max_batch_size is less than 1
+        """
+        if window < 0:
+            raise ValueError("window must not be negative")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.dispatch = dispatch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self._groups: Dict[Hashable, _Group] = {}
+        self._tasks = set()
+    
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        """
+        Add an item to the open group for key and wait for its result.
+        
+        Args:
+            key: Requests with equal keys are batched together
+            item: The request payload passed to dispatch
+        
+        Returns:
+            The item's result
+        
+        Raises:
+            Exception: The item's exception, or the dispatch error of its group
+        """
+        loop = asyncio.get_running_loop()
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = _Group()
+            if self.window > 0:
+                group.handle = loop.call_later(self.window, self._flush, key, group)
+            else:
+                group.handle = loop.call_soon(self._flush, key, group)
+        future = loop.create_future()
+        group.items.append(item)
+        group.futures.append(future)
+        if len(group.items) >= self.max_batch_size:
+            group.handle.cancel()
+            self._flush(key, group)
+        return await future
+    
+    def _flush(self, key: Hashable, group: _Group) -> None:
+        """Close a group and dispatch it as a task."""
+        if self._groups.get(key) is group:
+            del self._groups[key]
+        task = asyncio.ensure_future(self._run(key, group))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, key: Hashable, group: _Group) -> None:
+        """Dispatch a group and hand each caller its own result."""
+        self.batches += 1
+        self.items += len(group.items)
+        self.largest_batch = max(self.largest_batch, len(group.items))
+        try:
+            results = list(await self.dispatch(key, group.items))
+            if len(results) != len(group.items):
+                raise RuntimeError(f"dispatch returned {len(results)} results for {len(group.items)} items")
+        except Exception as e:
+            results = [e] * len(group.items)
+        for future, result in zip(group.futures, results):
+            # A caller may have been cancelled while waiting
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    async def drain(self) -> None:
+        """Dispatch every open group now and wait for all dispatches to finish."""
+        for key, group in list(self._groups.items()):
+            group.handle.cancel()
+            self._flush(key, group)
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Return batch counters; ``mean_batch_size`` is items per dispatched batch."""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "open_groups": len(self._groups),
+        }
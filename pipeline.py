@@ -0,0 +1,61 @@
+"""Compiled multi-strategy pipelines rendered in a single pass."""
+from typing import List, Tuple
+try:
+    from .strategies.base import BaseStrategy, PromptSections
+except ImportError:
+    from strategies.base import BaseStrategy, PromptSections
+
+
+class CompiledPipeline:
+    """Several strategies fused into one template.
+    
+    The sections of every strategy are merged once at compile time (see
+    PromptSections.merge), leaving a fixed prefix and suffix, so rendering a
+    prompt is a single concatenation with no template parsing.
+    """
+    
+    def __init__(self, strategy_names: Tuple[str, ...], sections: PromptSections):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            strategy_names: Names of the fused strategies, in order
+            sections: Merged sections of those strategies
+        """
+        self.strategy_names = strategy_names
+        self.sections = sections
+        self.prefix, self.suffix = sections.split()
+    
+    @property
+    def template(self) -> str:
+        """The fused template, with ``{prompt}`` marking where the prompt goes."""
+        return f"{self.prefix}{{prompt}}{self.suffix}"
+    
+    def render(self, prompt: str) -> str:
+        """Render the fused template around a prompt."""
+        return self.prefix + prompt + self.suffix
+    
+    __call__ = render
+    
+    def __repr__(self) -> str:
+        return f"CompiledPipeline({' + '.join(self.strategy_names)})"
+
+
+def compile_pipeline(strategies: List[BaseStrategy], **kwargs) -> CompiledPipeline:
+    """
+    Fuse an ordered list of strategies into one compiled template.
+    
+    Args:
+        strategies: Strategy instances, applied in order
+        **kwargs: Strategy-specific parameters, passed to every strategy
+    
+    Returns:
+        The compiled pipeline
+    
+    Raises:
+        ValueError: If no strategies are given
+    """
+    if not strategies:
+        raise ValueError("A pipeline needs at least one strategy.")
+    sections = PromptSections.merge([s.get_sections(**kwargs) for s in strategies])
+    return CompiledPipeline(tuple(s.get_strategy_name() for s in strategies), sections)
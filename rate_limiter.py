@@ -0,0 +1,192 @@
+"""Client-side request and token rate limiting per provider/model."""
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of text (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of rejecting requests.
+    
+    A reservation always succeeds: the bucket level may go negative, and the
+    caller is told how long to wait until its share has refilled. Because each
+    reservation is queued behind the previous ones, waiting callers are
+    released one after another at the refill rate rather than all at once.
+    """
+    
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+        
+        Args:
+            rate_per_minute: Units added per minute
+            capacity: Maximum burst size (default: one minute's worth)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+    
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take amount from the bucket and return the seconds to wait before using it.
+        
+        Args:
+            amount: Units to reserve (clamped to the bucket capacity)
+            now: Current ``time.monotonic()`` value
+        
+        Returns:
+            Seconds the caller must wait (0 if capacity was available)
+        """
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.level -= min(amount, self.capacity)
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute scheduler for one provider/model.
+    
+    ``acquire`` blocks and ``aacquire`` awaits until the request fits in both
+    budgets, so bursts are queued and released smoothly instead of triggering
+    429 responses. Queue depth and wait times are tracked for monitoring.
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        output_tokens: int = 256
+    ):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            requests_per_minute: Request budget (None for no request limit)
+            tokens_per_minute: Token budget (None for no token limit)
+            output_tokens: Completion tokens assumed per request when charging
+                           the token budget (default: 256)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.output_tokens = output_tokens
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = threading.Lock()
+        
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    def _reserve(self, tokens: int) -> float:
+        """Reserve one request and tokens in both buckets and return the wait time."""
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self._requests is not None:
+                wait = max(wait, self._requests.reserve(1, now))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.reserve(tokens + self.output_tokens, now))
+            self.acquired += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if wait > 0:
+                self.queue_depth += 1
+                self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            return wait
+    
+    def _release_waiter(self) -> None:
+        with self._lock:
+            self.queue_depth -= 1
+    
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Block until a request with the given prompt tokens fits the budgets.
+        
+        Args:
+            tokens: Estimated prompt tokens of the request
+        
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            finally:
+                self._release_waiter()
+        return wait
+    
+    async def aacquire(self, tokens: int = 0) -> float:
+        """
+        Wait without blocking the event loop until the request fits the budgets.
+        
+        Args:
+            tokens: Estimated prompt tokens of the request
+        
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._release_waiter()
+        return wait
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Return queue depth and wait time statistics."""
+        with self._lock:
+            return {
+                'queue_depth': self.queue_depth,
+                'max_queue_depth': self.max_queue_depth,
+                'acquired': self.acquired,
+                'total_wait_seconds': self.total_wait,
+                'max_wait_seconds': self.max_wait,
+                'mean_wait_seconds': self.total_wait / self.acquired if self.acquired else 0.0,
+            }
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    provider: str,
+    model_name: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    output_tokens: int = 256
+) -> RateLimiter:
+    """
+    Return the process-wide RateLimiter for a provider/model, creating it on first use.
+    
+    Every LLMClient for the same provider and model should share one limiter so
+    that the budgets apply to their combined traffic. Budgets are only used when
+    the limiter is first created.
+    
+    Args:
+        provider: LLM provider name
+        model_name: Model name
+        requests_per_minute: Request budget (None for no request limit)
+        tokens_per_minute: Token budget (None for no token limit)
+        output_tokens: Completion tokens assumed per request (default: 256)
+    
+    Returns:
+        The shared RateLimiter
+    """
+    key = (provider.lower(), model_name)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(requests_per_minute, tokens_per_minute, output_tokens)
+            _limiters[key] = limiter
+        return limiter
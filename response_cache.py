@@ -0,0 +1,231 @@
+"""Persistent SQLite-backed response cache for LLMClient."""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "prompt-improver", "responses.sqlite3"
+)
+
+
+class ResponseCache:
+    """On-disk cache of LLM responses with TTL and LRU eviction.
+    
+    Entries survive process restarts, and the database uses SQLite's WAL mode
+    with a busy timeout so several processes (e.g. concurrent CLI invocations)
+    can share one cache file safely.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = 10000,
+        max_bytes: Optional[int] = None,
+        only_deterministic: bool = False
+    ):
+        """
+        Initialize the response cache.
+        
+        Args:
+            path: SQLite database file (default: ~/.cache/prompt-improver/responses.sqlite3).
+                  Use ":memory:" for a process-local cache.
+            ttl: Seconds an entry stays valid (default: None, never expires)
+            max_entries: Maximum number of entries before the least recently used
+                         are evicted (default: 10000, None for no limit)
+            max_bytes: Maximum total size of cached responses in bytes before the
+                       least recently used are evicted (default: None, no limit)
+            only_deterministic: If True, only cache clients running at temperature 0
+                                (default: False)
+        """
+        self.path = path or DEFAULT_CACHE_PATH
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.only_deterministic = only_deterministic
+        self.hits = 0
+        self.misses = 0
+        
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=30.0,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+    
+    @staticmethod
+    def make_key(
+        provider: str,
+        model_name: str,
+        temperature: float,
+        template: str,
+        kwargs: Optional[Dict[str, Any]] = None,
+        kind: str = "template"
+    ) -> str:
+        """
+        Build a stable cache key for a request.
+        
+        Args:
+            provider: LLM provider name
+            model_name: Model name
+            temperature: Sampling temperature
+            template: Template (or direct message) text
+            kwargs: Template variables
+            kind: Request kind, "template" or "direct"
+        
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            [provider, model_name, float(temperature), kind, template, kwargs or {}],
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def should_cache(self, temperature: float) -> bool:
+        """Return True if responses generated at this temperature may be cached."""
+        return not self.only_deterministic or temperature == 0
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from ``make_key``
+        
+        Returns:
+            The cached response, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return value
+    
+    async def aget(self, key: str) -> Optional[str]:
+        """Async ``get``; the SQLite lookup runs in a worker thread, off the event loop."""
+        return await asyncio.to_thread(self.get, key)
+    
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response and evict least recently used entries over the limits.
+        
+        Args:
+            key: Cache key from ``make_key``
+            value: Response text to store
+        """
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, value, size, now, now)
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    async def aset(self, key: str, value: str) -> None:
+        """Async ``set``; the write (which may wait on other processes' locks) runs in a worker thread."""
+        await asyncio.to_thread(self.set, key, value)
+    
+    def _evict(self) -> None:
+        """Delete least recently used entries beyond max_entries / max_bytes."""
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC, key LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        if self.max_bytes is not None:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM (SELECT key, SUM(size) OVER "
+                "(ORDER BY accessed_at DESC, key) AS running FROM responses) "
+                "WHERE running > ?)",
+                (self.max_bytes,)
+            )
+    
+    def purge_expired(self) -> int:
+        """Delete all expired entries and return how many were removed."""
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+            return cursor.rowcount
+    
+    def clear(self) -> None:
+        """Delete every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Return hit/miss counters, entry count and total cached bytes."""
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'bytes': total_bytes,
+        }
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,339 @@
+"""Latency-, error- and cost-aware router across several LLM backends."""
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Literal, Optional, Union
+try:
+    from .llm_client import LLMClient, build_prompt
+except ImportError:
+    from llm_client import LLMClient, build_prompt
+
+
+class BackendStats:
+    """Rolling health and performance figures for one backend."""
+    
+    def __init__(self, cost_per_1k_tokens: float = 0.0, alpha: float = 0.2):
+        """
+        Initialize backend statistics.
+        
+        Args:
+            cost_per_1k_tokens: Relative cost of the backend per 1k tokens
+            alpha: Smoothing factor of the exponentially weighted averages (default: 0.2)
+        """
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.alpha = alpha
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.degraded_until = 0.0
+    
+    def record_success(self, seconds: float) -> None:
+        """Record a successful call and its latency."""
+        self.requests += 1
+        self.consecutive_failures = 0
+        self.latency = seconds if self.latency is None else (
+            self.alpha * seconds + (1 - self.alpha) * self.latency
+        )
+        self.error_rate = (1 - self.alpha) * self.error_rate
+    
+    def record_failure(self, cooldown: float, threshold: int) -> None:
+        """Record a failed call, marking the backend degraded after repeated failures."""
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.error_rate = self.alpha + (1 - self.alpha) * self.error_rate
+        if self.consecutive_failures >= threshold:
+            self.degraded_until = time.monotonic() + cooldown
+    
+    def is_degraded(self) -> bool:
+        """Return True while the backend is cooling down after repeated failures."""
+        return time.monotonic() < self.degraded_until
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'latency_seconds': self.latency,
+            'error_rate': self.error_rate,
+            'cost_per_1k_tokens': self.cost_per_1k_tokens,
+            'requests': self.requests,
+            'failures': self.failures,
+            'degraded': self.is_degraded(),
+        }
+
+
+class RouterClient:
+    """Client that spreads requests across several LLM backends.
+    
+    Each request goes to the backend with the best recent score for the chosen
+    policy ("latency", "errors" or "cost"). If it fails, the next best backend
+    is tried, and backends that fail repeatedly are skipped for a cooldown
+    period. The prompt is rendered once before routing, so errors in the
+    request itself (e.g. a missing template variable) are raised straight away
+    without trying any backend. RouterClient exposes the same call methods as
+    LLMClient, so it can be passed to PromptImprover and the strategies
+    wherever an LLMClient is accepted.
+    """
+    
+    def __init__(
+        self,
+        backends: List[LLMClient],
+        policy: Literal["latency", "errors", "cost"] = "latency",
+        costs: Optional[List[float]] = None,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0
+    ):
+        """
+        Initialize the router.
+        
+        Args:
+            backends: LLMClient instances (or compatible clients) to route across
+            policy: What to optimize - "latency", "errors" or "cost" (default: "latency")
+            costs: Optional relative cost per 1k tokens for each backend, in order
+            failure_threshold: Consecutive failures before a backend is degraded (default: 3)
+            cooldown: Seconds a degraded backend is skipped (default: 30.0)
+        
+        Raises:
+            ValueError: If no backends are given, the policy is unknown or costs
+                        do not match the backends
+        """
+        if not backends:
+            raise ValueError("RouterClient needs at least one backend.")
+        if policy not in ("latency", "errors", "cost"):
+            raise ValueError(f"Unknown routing policy: {policy}. Use 'latency', 'errors' or 'cost'.")
+        if costs is not None and len(costs) != len(backends):
+            raise ValueError("costs must have one entry per backend.")
+        
+        self.backends = list(backends)
+        self.policy = policy
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.stats = [
+            BackendStats(costs[i] if costs is not None else 0.0) for i in range(len(backends))
+        ]
+        self._lock = threading.Lock()
+        
+        # Mirror LLMClient's descriptive attributes
+        self.provider = "router"
+        self.model_name = ",".join(
+            f"{getattr(b, 'provider', '?')}:{getattr(b, 'model_name', '?')}" for b in self.backends
+        )
+    
+    def _score(self, index: int) -> tuple:
+        """Sort key for a backend under the current policy (lower is better)."""
+        stats = self.stats[index]
+        # Backends without samples sort first so that every backend gets measured
+        latency = stats.latency if stats.latency is not None else 0.0
+        if self.policy == "errors":
+            return (stats.error_rate, latency)
+        if self.policy == "cost":
+            return (stats.cost_per_1k_tokens * (1 + stats.error_rate), latency)
+        return (latency * (1 + 10 * stats.error_rate), stats.error_rate)
+    
+    def ranked_backends(self) -> List[int]:
+        """
+        Return backend indices in the order they should be tried.
+        
+        Healthy backends are ranked by the policy score; degraded ones are only
+        used as a last resort.
+        """
+        with self._lock:
+            order = sorted(range(len(self.backends)), key=self._score)
+            healthy = [i for i in order if not self.stats[i].is_degraded()]
+            degraded = [i for i in order if self.stats[i].is_degraded()]
+        return healthy + degraded
+    
+    def _record(self, index: int, start: float, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if error is None:
+                self.stats[index].record_success(time.perf_counter() - start)
+            else:
+                self.stats[index].record_failure(self.cooldown, self.failure_threshold)
+    
+    @staticmethod
+    def _check_request(kind: str, text: str, kwargs: Dict[str, Any]) -> None:
+        """Render the request's prompt, raising if the request itself is invalid."""
+        build_prompt(kind, text).format_prompt(**kwargs)
+    
+    def _check_batch(self, prompt_template: str, inputs: List[Dict[str, Any]]):
+        """
+        Render every batch item up front.
+        
+        Returns:
+            Tuple of the results list, holding the exception of each invalid
+            item, and the indices of the valid items still to be sent
+        """
+        results: List[Union[str, Exception, None]] = [None] * len(inputs)
+        pending = []
+        for i, item in enumerate(inputs):
+            try:
+                self._check_request("template", prompt_template, item)
+            except Exception as e:
+                results[i] = e
+            else:
+                pending.append(i)
+        return results, pending
+    
+    def _route(self, method: str, *args, **kwargs):
+        """Call method on the best backend, failing over to the next on errors."""
+        error = None
+        for index in self.ranked_backends():
+            start = time.perf_counter()
+            try:
+                result = getattr(self.backends[index], method)(*args, **kwargs)
+            except Exception as e:
+                self._record(index, start, e)
+                error = e
+                continue
+            self._record(index, start)
+            return result
+        raise error
+    
+    async def _aroute(self, method: str, *args, **kwargs):
+        """Async counterpart of ``_route``."""
+        error = None
+        for index in self.ranked_backends():
+            start = time.perf_counter()
+            try:
+                result = await getattr(self.backends[index], method)(*args, **kwargs)
+            except Exception as e:
+                self._record(index, start, e)
+                error = e
+                continue
+            self._record(index, start)
+            return result
+        raise error
+    
+    def invoke(self, prompt_template: str, **kwargs) -> str:
+        """Invoke the best backend with a prompt template (see LLMClient.invoke)."""
+        self._check_request("template", prompt_template, kwargs)
+        return self._route("invoke", prompt_template, **kwargs)
+    
+    def invoke_direct(self, message: str) -> str:
+        """Invoke the best backend with a direct message (see LLMClient.invoke_direct)."""
+        self._check_request("direct", message, {})
+        return self._route("invoke_direct", message)
+    
+    async def ainvoke(self, prompt_template: str, **kwargs) -> str:
+        """Asynchronously invoke the best backend (see LLMClient.ainvoke)."""
+        self._check_request("template", prompt_template, kwargs)
+        return await self._aroute("ainvoke", prompt_template, **kwargs)
+    
+    async def ainvoke_direct(self, message: str) -> str:
+        """Asynchronously invoke the best backend with a direct message."""
+        self._check_request("direct", message, {})
+        return await self._aroute("ainvoke_direct", message)
+    
+    def invoke_batch(
+        self,
+        prompt_template: str,
+        inputs: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = 8
+    ) -> List[Union[str, Exception]]:
+        """
+        Invoke a batch on the best backend, re-sending failed items to the next one.
+        
+        Items whose prompt cannot be rendered are not sent to any backend.
+        
+        Args:
+            prompt_template: Prompt template string shared by all items
+            inputs: List of variable dicts, one per request
+            max_concurrency: Maximum requests in flight at once
+        
+        Returns:
+            List of responses (or exceptions for items every backend failed) in input order
+        """
+        results, pending = self._check_batch(prompt_template, inputs)
+        for index in self.ranked_backends():
+            if not pending:
+                break
+            start = time.perf_counter()
+            responses = self.backends[index].invoke_batch(
+                prompt_template, [inputs[i] for i in pending], max_concurrency=max_concurrency
+            )
+            failed = [i for i, r in zip(pending, responses) if isinstance(r, Exception)]
+            self._record(index, start, responses[0] if len(failed) == len(pending) else None)
+            for i, response in zip(pending, responses):
+                results[i] = response
+            pending = failed
+        return results
+    
+    async def ainvoke_batch(
+        self,
+        prompt_template: str,
+        inputs: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = 8
+    ) -> List[Union[str, Exception]]:
+        """Async counterpart of ``invoke_batch``."""
+        results, pending = self._check_batch(prompt_template, inputs)
+        for index in self.ranked_backends():
+            if not pending:
+                break
+            start = time.perf_counter()
+            responses = await self.backends[index].ainvoke_batch(
+                prompt_template, [inputs[i] for i in pending], max_concurrency=max_concurrency
+            )
+            failed = [i for i, r in zip(pending, responses) if isinstance(r, Exception)]
+            self._record(index, start, responses[0] if len(failed) == len(pending) else None)
+            for i, response in zip(pending, responses):
+                results[i] = response
+            pending = failed
+        return results
+    
+    def stream(self, prompt_template: str, **kwargs) -> Iterator[str]:
+        """
+        Stream from the best backend, failing over only before the first chunk.
+        
+        Args:
+            prompt_template: Prompt template string
+            **kwargs: Variables to fill in the template
+        
+        Yields:
+            Response text chunks as they arrive
+        """
+        self._check_request("template", prompt_template, kwargs)
+        error = None
+        for index in self.ranked_backends():
+            start = time.perf_counter()
+            started = False
+            try:
+                for chunk in self.backends[index].stream(prompt_template, **kwargs):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                self._record(index, start, e)
+                if started:
+                    raise
+                error = e
+                continue
+            self._record(index, start)
+            return
+        raise error
+    
+    async def astream(self, prompt_template: str, **kwargs) -> AsyncIterator[str]:
+        """Async counterpart of ``stream``."""
+        self._check_request("template", prompt_template, kwargs)
+        error = None
+        for index in self.ranked_backends():
+            start = time.perf_counter()
+            started = False
+            try:
+                async for chunk in self.backends[index].astream(prompt_template, **kwargs):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                self._record(index, start, e)
+                if started:
+                    raise
+                error = e
+                continue
+            self._record(index, start)
+            return
+        raise error
+    
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Return per-backend latency, error rate, cost and health."""
+        with self._lock:
+            return [
+                dict(provider=getattr(b, 'provider', None), model_name=getattr(b, 'model_name', None), **s.to_dict())
+                for b, s in zip(self.backends, self.stats)
+            ]
@@ -23,6 +23,23 @@ from tests.test_tree_of_thought_strategy import TestTreeOfThoughtStrategy
 from tests.test_skeleton_of_thought_strategy import TestSkeletonOfThoughtStrategy
 from tests.test_react_strategy import TestReActStrategy
 from tests.test_improver import TestPromptImprover
+from tests.test_response_cache import TestResponseCache
+from tests.test_startup import TestStartup
+from tests.test_client_pool import TestClientRegistry
+from tests.test_rate_limiter import TestRateLimiter
+from tests.test_hedging import TestHedging
+from tests.test_router import TestRouterClient
+from tests.test_singleflight import TestSingleFlight
+from tests.test_strategy_registry import TestStrategyRegistry
+from tests.test_pipeline import TestPipeline
+from tests.test_templates import TestCompiledTemplate
+from tests.test_example_bank import TestExampleBank
+from tests.test_batch import TestBatch
+from tests.test_jobs import TestBatchJob
+from tests.test_server import TestImproverServer
+from tests.test_microbatch import TestMicroBatcher
+from tests.test_daemon import TestImproverDaemon
+from tests.test_benchmarks import TestBenchmarkSuite
 
 
 def main():
@@ -44,6 +61,23 @@ def main():
         TestSkeletonOfThoughtStrategy,
         TestReActStrategy,
         TestPromptImprover,
+        TestResponseCache,
+        TestStartup,
+        TestClientRegistry,
+        TestRateLimiter,
+        TestHedging,
+        TestRouterClient,
+        TestSingleFlight,
+        TestStrategyRegistry,
+        TestPipeline,
+        TestCompiledTemplate,
+        TestExampleBank,
+        TestBatch,
+        TestBatchJob,
+        TestImproverServer,
+        TestMicroBatcher,
+        TestImproverDaemon,
+        TestBenchmarkSuite,
     ]
     
     for test_class in test_classes:
@@ -0,0 +1,469 @@
+"""Long-running asyncio HTTP service exposing a warm PromptImprover."""
+import argparse
+import asyncio
+import json
+import signal
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+try:
+    from .batch import BatchItem
+    from .microbatch import MicroBatcher
+except ImportError:
+    from batch import BatchItem
+    from microbatch import MicroBatcher
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+MAX_HEADER_LINE = 8192
+MAX_HEADERS = 100
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    411: "Length Required",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    501: "Not Implemented",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    """An error answered with the given HTTP status and a JSON error body."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ImproverServer:
+    """Minimal HTTP/1.1 JSON server around one long-lived PromptImprover.
+    
+    The improver (and its LLM client and strategies) is built once and shared by
+    every request, so a template improvement costs a request parse and a render
+    instead of an interpreter start. Connections are kept alive between requests.
+    
+    Endpoints:
+        GET  /health      - {"status": "ok"}
+        GET  /strategies  - {"strategies": [{"name", "key", "canonical"}, ...]}
+        POST /improve     - {"prompt", "strategy", "kwargs"?} -> {"strategy", "improved_prompt"}
+        POST /batch       - {"items": [...], "strategy"?, "kwargs"?} -> {"results": [...]}
+    
+    Batch items are prompt strings or objects with "prompt" and optional "id",
+    "strategy" and "kwargs"; results use the format of ``main.py batch``.
+    
+    Concurrent /improve requests for the same strategy and kwargs are
+    micro-batched (see MicroBatcher) into one ``aimprove_batch`` call, and the
+    items of a /batch request are grouped the same way.
+    """
+    
+    def __init__(
+        self,
+        improver=None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_body_size: int = 16 * 1024 * 1024,
+        max_concurrency: int = 64,
+        keep_alive_timeout: float = 30.0,
+        batch_window: Optional[float] = 0.0,
+        max_batch_size: int = 64
+    ):
+        """
+        Initialize the server.
+        
+        Args:
+            improver: PromptImprover serving the requests (default: an offline improver)
+            host: Interface to bind (default: 127.0.0.1)
+            port: Port to bind; 0 picks a free port (default: 8000)
+            max_body_size: Largest accepted request body in bytes (default: 16 MiB)
+            max_concurrency: Strategy groups run at once per batch request (default: 64)
+            keep_alive_timeout: Seconds an idle connection is kept open (default: 30)
+            batch_window: Seconds /improve requests wait to be batched with others; 0
+                          batches only requests that arrive together, None disables
+                          micro-batching (default: 0)
+            max_batch_size: Largest micro-batch (default: 64)
+        """
+        if improver is None:
+            try:
+                from .improver import PromptImprover
+            except ImportError:
+                from improver import PromptImprover
+            improver = PromptImprover(offline=True)
+        self.improver = improver
+        self.host = host
+        self.port = port
+        self.max_body_size = max_body_size
+        self.max_concurrency = max_concurrency
+        self.keep_alive_timeout = keep_alive_timeout
+        self.batcher = None
+        if batch_window is not None:
+            self.batcher = MicroBatcher(self._dispatch, window=batch_window, max_batch_size=max_batch_size)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, bool] = {}
+        self._closing = False
+        self._routes = {
+            ("GET", "/health"): self._health,
+            ("GET", "/strategies"): self._strategies,
+            ("POST", "/improve"): self._improve,
+            ("POST", "/batch"): self._batch,
+        }
+    
+    async def start(self) -> None:
+        """Bind the listening socket and start accepting connections."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self) -> None:
+        """Start the server if needed and serve until it is shut down."""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+    
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """
+        Stop gracefully: refuse new connections, let in-flight requests finish
+        (up to timeout seconds) and close idle keep-alive connections.
+        """
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+        for task, busy in list(self._connections.items()):
+            if not busy:
+                task.cancel()
+        if self._connections:
+            _, pending = await asyncio.wait(list(self._connections), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        if self.batcher is not None:
+            await self.batcher.drain()
+        if self._server is not None:
+            await self._server.wait_closed()
+    
+    def get_batching_stats(self) -> Optional[Dict[str, float]]:
+        """Return the micro-batching counters, or None if micro-batching is disabled."""
+        return self.batcher.get_stats() if self.batcher is not None else None
+    
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """
+        Dispatch one request to its endpoint.
+        
+        Args:
+            method: HTTP method
+            path: Request path (a query string is ignored)
+            body: Request body
+        
+        Returns:
+            (status, JSON payload)
+        """
+        path = path.split("?", 1)[0]
+        handler = self._routes.get((method, path))
+        try:
+            if handler is None:
+                if any(route_path == path for _, route_path in self._routes):
+                    raise HTTPError(405, f"Method {method} not allowed for {path}")
+                raise HTTPError(404, f"Not found: {path}")
+            return 200, await handler(self._decode(body) if method == "POST" else None)
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"Unexpected error: {e}"}
+    
+    @staticmethod
+    def _decode(body: bytes) -> Dict[str, Any]:
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Expected a JSON object")
+        return payload
+    
+    @staticmethod
+    def _kwargs(payload: Dict[str, Any]) -> Dict[str, Any]:
+        kwargs = payload.get("kwargs", {})
+        if not isinstance(kwargs, dict):
+            raise HTTPError(400, "'kwargs' must be a JSON object")
+        return kwargs
+    
+    async def _health(self, payload) -> Dict[str, Any]:
+        if self._closing:
+            raise HTTPError(503, "shutting down")
+        return {"status": "ok"}
+    
+    async def _strategies(self, payload) -> Dict[str, Any]:
+        return {
+            "strategies": [
+                self.improver.get_strategy_info(name) for name in self.improver.get_available_strategies()
+            ]
+        }
+    
+    async def _improve(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        prompt, strategy = payload.get("prompt"), payload.get("strategy")
+        if not isinstance(prompt, str) or not isinstance(strategy, str):
+            raise HTTPError(400, "'prompt' and 'strategy' must be strings")
+        kwargs = self._kwargs(payload)
+        if self.batcher is None:
+            improved = await self.improver.aimprove(prompt, strategy, **kwargs)
+        else:
+            improved = await self.batcher.submit(self._group_key(strategy, kwargs), prompt)
+        return {"strategy": strategy, "improved_prompt": improved}
+    
+    @staticmethod
+    def _group_key(strategy: str, kwargs: Dict[str, Any]) -> Tuple[str, str]:
+        """Key of the requests that can share one batched call."""
+        return strategy.lower(), json.dumps(kwargs, sort_keys=True)
+    
+    async def _dispatch(self, key: Tuple[str, str], prompts: List[str]) -> List[Any]:
+        """Improve one micro-batch of /improve prompts."""
+        strategy, kwargs = key
+        return await self.improver.aimprove_batch(prompts, strategy, **json.loads(kwargs))
+    
+    async def _batch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        records = payload.get("items")
+        if not isinstance(records, list):
+            raise HTTPError(400, "'items' must be a JSON array")
+        strategy, kwargs = payload.get("strategy"), self._kwargs(payload)
+        items = [self._batch_item(record, index) for index, record in enumerate(records)]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        
+        # Group valid items by strategy and kwargs, each group becoming one batched call
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, item in enumerate(items):
+            name = item.strategy or strategy
+            if item.error is not None:
+                results[index] = {"id": item.id, "strategy": name, "error": item.error}
+            elif name is None:
+                results[index] = {"id": item.id, "strategy": None, "error": "No strategy given for this item"}
+            else:
+                item.strategy = name
+                groups.setdefault(self._group_key(name, {**kwargs, **item.kwargs}), []).append(index)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def process(key: Tuple[str, str], indices: List[int]) -> None:
+            try:
+                async with semaphore:
+                    outputs = await self._dispatch(key, [items[i].prompt for i in indices])
+            except Exception as e:
+                outputs = [e] * len(indices)
+            for index, output in zip(indices, outputs):
+                item = items[index]
+                if isinstance(output, Exception):
+                    results[index] = {"id": item.id, "strategy": item.strategy, "error": str(output)}
+                else:
+                    results[index] = {"id": item.id, "strategy": item.strategy, "improved_prompt": output}
+        
+        await asyncio.gather(*(process(key, indices) for key, indices in groups.items()))
+        return {"results": results}
+    
+    @staticmethod
+    def _batch_item(record: Any, index: int) -> BatchItem:
+        """Build a BatchItem from a /batch item; the default id is the item's index."""
+        if isinstance(record, str):
+            return BatchItem(index, prompt=record)
+        if not isinstance(record, dict):
+            return BatchItem(index, error="Expected a JSON object or string")
+        item_id = record.get("id", index)
+        if not isinstance(record.get("prompt"), str):
+            return BatchItem(item_id, error="Missing or non-string 'prompt'")
+        if not isinstance(record.get("kwargs", {}), dict):
+            return BatchItem(item_id, error="'kwargs' must be a JSON object")
+        return BatchItem(item_id, prompt=record["prompt"], strategy=record.get("strategy"), kwargs=record.get("kwargs"))
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection until it closes, times out or the server stops."""
+        task = asyncio.current_task()
+        self._connections[task] = False
+        try:
+            while not self._closing:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keep_alive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as e:
+                    await self._write_response(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                self._connections[task] = True
+                status, payload = await self.handle(method, path, body)
+                keep_alive = keep_alive and not self._closing
+                await self._write_response(writer, status, payload, keep_alive)
+                self._connections[task] = False
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+    
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader, error: str) -> bytes:
+        """Read one request or header line, raising HTTPError(400, error) if it overruns the stream limit."""
+        try:
+            return await reader.readline()
+        except ValueError:
+            # StreamReader.readline() reports a LimitOverrunError as ValueError
+            raise HTTPError(400, error)
+    
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, bytes, bool]]:
+        """
+        Read one request.
+        
+        Returns:
+            (method, path, body, keep_alive), or None if the client closed the connection
+        
+        Raises:
+            HTTPError: If the request is malformed or unsupported
+        """
+        line = await self._read_line(reader, "Request line too long")
+        if not line:
+            return None
+        if len(line) > MAX_HEADER_LINE:
+            raise HTTPError(400, "Request line too long")
+        try:
+            method, path, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        
+        headers = {}
+        while True:
+            line = await self._read_line(reader, "Request headers too large")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(line) > MAX_HEADER_LINE or len(headers) >= MAX_HEADERS:
+                raise HTTPError(400, "Request headers too large")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(501, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if method == "POST" and "content-length" not in headers:
+            raise HTTPError(411, "Content-Length required")
+        if length > self.max_body_size:
+            raise HTTPError(413, f"Request body exceeds {self.max_body_size} bytes")
+        body = await reader.readexactly(length) if length > 0 else b""
+        
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), path, body, keep_alive
+    
+    @staticmethod
+    async def _write_response(
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Dict[str, Any],
+        keep_alive: bool
+    ) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser of the serve subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Serve prompt improvement over HTTP with a warm, shared PromptImprover",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python main.py serve --offline --port 8000
+  curl -s localhost:8000/improve -d '{"prompt": "Explain recursion", "strategy": "cot"}'
+        """
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to bind (default: {DEFAULT_PORT})")
+    parser.add_argument("--provider", choices=["openai", "gemini"], default="openai",
+                        help="LLM provider to use: openai or gemini (default: openai)")
+    parser.add_argument("--model", help="Model name to use")
+    parser.add_argument("--offline", action="store_true",
+                        help="Template-only mode: no LLM client, provider SDK or API key is needed")
+    parser.add_argument("--batch-window-ms", type=float, default=0.0,
+                        help="Milliseconds /improve requests wait to be batched with others (default: 0, "
+                             "batching only requests that arrive together)")
+    parser.add_argument("--max-batch-size", type=int, default=64,
+                        help="Largest micro-batch of /improve requests (default: 64)")
+    parser.add_argument("--no-batching", action="store_true", help="Disable micro-batching")
+    parser.add_argument("--shutdown-timeout", type=float, default=10.0,
+                        help="Seconds to let in-flight requests finish on shutdown (default: 10)")
+    return parser
+
+
+async def _serve(server: ImproverServer, shutdown_timeout: float) -> None:
+    """Serve until SIGINT or SIGTERM, then shut down gracefully."""
+    await server.start()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Signal handlers are unavailable (e.g. on Windows); Ctrl+C still interrupts
+            pass
+    print(f"Serving on http://{server.host}:{server.port}", file=sys.stderr, flush=True)
+    serving = asyncio.ensure_future(server.serve_forever())
+    await stop.wait()
+    print("Shutting down...", file=sys.stderr, flush=True)
+    await server.shutdown(shutdown_timeout)
+    serving.cancel()
+
+
+def main(argv=None) -> int:
+    """Run the serve subcommand."""
+    args = build_parser().parse_args(argv)
+    try:
+        from .improver import PromptImprover
+    except ImportError:
+        from improver import PromptImprover
+    if args.offline:
+        improver = PromptImprover(offline=True)
+    else:
+        try:
+            from .llm_client import LLMClient
+        except ImportError:
+            from llm_client import LLMClient
+        improver = PromptImprover(llm_client=LLMClient(provider=args.provider, model_name=args.model))
+    
+    server = ImproverServer(
+        improver,
+        host=args.host,
+        port=args.port,
+        batch_window=None if args.no_batching else args.batch_window_ms / 1000,
+        max_batch_size=args.max_batch_size
+    )
+    try:
+        asyncio.run(_serve(server, args.shutdown_timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
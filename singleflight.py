@@ -0,0 +1,113 @@
+"""Single-flight coalescing of identical in-flight requests."""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Flight:
+    """One in-flight sync call and the callers waiting for it."""
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Share one execution among concurrent callers with the same key.
+    
+    The first caller for a key (the leader) runs the work; callers arriving
+    while it is still in flight wait for and receive the leader's result (or
+    exception) instead of starting their own. Once the call completes the key
+    is forgotten, so later callers trigger a fresh call. Sync and async callers
+    are tracked separately.
+    """
+    
+    def __init__(self):
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key.
+        
+        Args:
+            key: Identity of the request
+            fn: Zero-argument callable performing the work
+        
+        Returns:
+            The shared result
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+        return flight.result
+    
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn once for all concurrent callers with the same key.
+        
+        The shared call runs as its own task, so a caller being cancelled does
+        not cancel the call for the others.
+        
+        Args:
+            key: Identity of the request
+            fn: Zero-argument coroutine function performing the work
+        
+        Returns:
+            The shared result
+        """
+        # Tasks are bound to their event loop, so the loop is part of the key
+        task_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            self.calls += 1
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = asyncio.ensure_future(fn())
+                self._tasks[task_key] = task
+                self.executed += 1
+                task.add_done_callback(lambda _: self._forget(task_key))
+            else:
+                self.coalesced += 1
+        return await asyncio.shield(task)
+    
+    def _forget(self, task_key: Hashable) -> None:
+        with self._lock:
+            self._tasks.pop(task_key, None)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Return call counters; ``coalesced`` is the number of provider calls saved."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._flights) + len(self._tasks),
+            }
@@ -7,6 +7,7 @@ try:
     from .tree_of_thought import TreeOfThoughtStrategy
     from .skeleton_of_thought import SkeletonOfThoughtStrategy
     from .react import ReActStrategy
+    from .registry import StrategyRegistry, StrategyMap, get_strategy_registry, register_strategy
 except ImportError:
     # Fallback for when running as a script
     from strategies.base import BaseStrategy
@@ -17,6 +18,7 @@ except ImportError:
     from strategies.tree_of_thought import TreeOfThoughtStrategy
     from strategies.skeleton_of_thought import SkeletonOfThoughtStrategy
     from strategies.react import ReActStrategy
+    from strategies.registry import StrategyRegistry, StrategyMap, get_strategy_registry, register_strategy
 
 __all__ = [
     'BaseStrategy',
@@ -27,5 +29,9 @@ __all__ = [
     'TreeOfThoughtStrategy',
     'SkeletonOfThoughtStrategy',
     'ReActStrategy',
+    'StrategyRegistry',
+    'StrategyMap',
+    'get_strategy_registry',
+    'register_strategy',
 ]
 
@@ -1,22 +1,160 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-try:
-    from ..llm_client import LLMClient
-except ImportError:
-    from llm_client import LLMClient
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Any, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    # Imported on first use of llm_client, so template-only runs never load the LLM stack
+    try:
+        from ..llm_client import LLMClient
+        from ..router import RouterClient
+    except ImportError:
+        from llm_client import LLMClient
+        from router import RouterClient
+
+
+class PromptSections:
+    """Structured parts of an improved prompt, so several strategies can be fused.
+    
+    An improved prompt is laid out as paragraphs separated by blank lines:
+    the preamble paragraphs, the prompt itself (after ``prompt_prefix``, e.g.
+    "Task: "), an "Instructions:" block of guidance lines followed by numbered
+    instructions, free-form notes and finally a cue line that invites the answer.
+    """
+    
+    def __init__(
+        self,
+        preamble: Optional[List[str]] = None,
+        prompt_prefix: str = "",
+        guidance: Optional[List[str]] = None,
+        instructions: Optional[List[str]] = None,
+        notes: Optional[List[str]] = None,
+        cue: Optional[str] = None
+    ):
+        """
+        Initialize the sections.
+        
+        Args:
+            preamble: Paragraphs placed before the prompt
+            prompt_prefix: Text directly in front of the prompt (e.g. "Task: ")
+            guidance: Unnumbered lines at the top of the "Instructions:" block
+            instructions: Numbered instruction items (numbers are added when rendering)
+            notes: Paragraphs placed after the instructions
+            cue: Final line inviting the answer (e.g. "Step-by-step reasoning:")
+        """
+        self.preamble = preamble or []
+        self.prompt_prefix = prompt_prefix
+        self.guidance = guidance or []
+        self.instructions = instructions or []
+        self.notes = notes or []
+        self.cue = cue
+    
+    @classmethod
+    def merge(cls, sections: List["PromptSections"]) -> "PromptSections":
+        """
+        Fuse sections of several strategies, in order, into one.
+        
+        Paragraphs and instructions are concatenated with exact repeats removed,
+        so shared sections such as "Task:" and "Instructions:" appear once and
+        instructions are renumbered. The first non-empty prompt prefix and the
+        last cue win.
+        
+        Args:
+            sections: Sections of each strategy, in pipeline order
+            
+        Returns:
+            The fused sections
+        """
+        def unique(parts):
+            return list(dict.fromkeys(p for s in sections for p in parts(s)))
+        
+        cues = [s.cue for s in sections if s.cue]
+        return cls(
+            preamble=unique(lambda s: s.preamble),
+            prompt_prefix=next((s.prompt_prefix for s in sections if s.prompt_prefix), ""),
+            guidance=unique(lambda s: s.guidance),
+            instructions=unique(lambda s: s.instructions),
+            notes=unique(lambda s: s.notes),
+            cue=cues[-1] if cues else None
+        )
+    
+    def split(self) -> Tuple[str, str]:
+        """Return the (prefix, suffix) text that surrounds the prompt."""
+        prefix = "".join(p + "\n\n" for p in self.preamble) + self.prompt_prefix
+        after = []
+        if self.guidance or self.instructions:
+            lines = self.guidance + [f"{i}. {item}" for i, item in enumerate(self.instructions, 1)]
+            after.append("Instructions:\n" + "\n".join(lines))
+        after.extend(self.notes)
+        if self.cue:
+            after.append(self.cue)
+        return prefix, "".join("\n\n" + part for part in after)
+    
+    def render(self, prompt: str) -> str:
+        """Render the sections around a prompt."""
+        prefix, suffix = self.split()
+        return prefix + prompt + suffix
 
 
 class BaseStrategy(ABC):
     """Base class for all prompt improvement strategies."""
     
-    def __init__(self, llm_client: Optional[LLMClient] = None):
+    # True if get_sections(**kwargs).render(prompt) always equals improve(prompt, **kwargs),
+    # which lets improve_batch render a whole batch from one set of sections
+    exact_sections = False
+    
+    def __init__(
+        self,
+        llm_client: Optional[Union["LLMClient", "RouterClient"]] = None,
+        offline: bool = False
+    ):
         """
         Initialize the strategy with an optional LLM client.
         
         Args:
-            llm_client: Optional LLMClient instance. If None, creates a new one.
+            llm_client: Optional LLMClient or RouterClient instance. If None, a default
+                        LLMClient is created the first time ``llm_client`` is accessed.
+            offline: If True, the strategy only renders its template and never has an
+                     LLM client, so no provider SDK or API key is needed (default: False)
+            
+        Raises:
+            ValueError: If both offline and llm_client are given
+        """
+        if offline and llm_client is not None:
+            raise ValueError("An offline strategy cannot be given an llm_client.")
+        self.offline = offline
+        self._llm_client = llm_client
+    
+    @property
+    def llm_client(self) -> Union["LLMClient", "RouterClient"]:
+        """
+        LLM client used by the strategy, created on first access if none was given.
+        
+        Raises:
+            RuntimeError: If the strategy is offline
         """
-        self.llm_client = llm_client or LLMClient()
+        if self._llm_client is None:
+            if self.offline:
+                raise RuntimeError(
+                    f"{type(self).__name__} is offline and has no LLM client."
+                )
+            try:
+                from ..llm_client import LLMClient
+            except ImportError:
+                from llm_client import LLMClient
+            self._llm_client = LLMClient()
+        return self._llm_client
+    
+    @llm_client.setter
+    def llm_client(self, value: Union["LLMClient", "RouterClient"]) -> None:
+        self._llm_client = value
+        self.offline = False
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the configuration only; the copy is offline, without the LLM client."""
+        state = self.__dict__.copy()
+        state['_llm_client'] = None
+        state['offline'] = True
+        return state
     
     @abstractmethod
     def improve(self, prompt: str, **kwargs) -> str:
@@ -32,6 +170,137 @@ class BaseStrategy(ABC):
         """
         pass
     
+    async def aimprove(self, prompt: str, **kwargs) -> str:
+        """
+        Asynchronously improve a prompt by applying the strategy.
+        
+        The default implementation renders synchronously, which is right for
+        template-only strategies. Strategies that call the LLM should override
+        this and await the client's async methods (e.g. ``ainvoke``).
+        
+        Args:
+            prompt: The original prompt to improve
+            **kwargs: Additional strategy-specific parameters
+            
+        Returns:
+            The improved prompt
+        """
+        return self.improve(prompt, **kwargs)
+    
+    def improve_batch(self, prompts: List[str], **kwargs) -> List[Union[str, Exception]]:
+        """
+        Improve several prompts with the same parameters.
+        
+        Strategies with ``exact_sections`` build their sections once and render
+        every prompt by concatenation; others call ``improve`` per prompt.
+        
+        Args:
+            prompts: Prompts to improve
+            **kwargs: Additional strategy-specific parameters, shared by every prompt
+            
+        Returns:
+            Improved prompts in input order; an item that failed holds its exception
+        """
+        if self.exact_sections and len(prompts) > 1:
+            try:
+                prefix, suffix = self.get_sections(**kwargs).split()
+            except Exception:
+                # Let improve() report the error for each prompt
+                pass
+            else:
+                return [prefix + prompt + suffix for prompt in prompts]
+        
+        results: List[Union[str, Exception]] = []
+        for prompt in prompts:
+            try:
+                results.append(self.improve(prompt, **kwargs))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    async def aimprove_batch(self, prompts: List[str], **kwargs) -> List[Union[str, Exception]]:
+        """
+        Asynchronously improve several prompts with the same parameters.
+        
+        If ``aimprove`` is not overridden (template-only strategies), the batch is
+        rendered synchronously with ``improve_batch``. Otherwise the prompts are
+        improved concurrently; strategies that call the LLM can override this to
+        send one batched request (e.g. ``ainvoke_batch``).
+        
+        Args:
+            prompts: Prompts to improve
+            **kwargs: Additional strategy-specific parameters, shared by every prompt
+            
+        Returns:
+            Improved prompts in input order; an item that failed holds its exception
+        """
+        if type(self).aimprove is BaseStrategy.aimprove:
+            return self.improve_batch(prompts, **kwargs)
+        results = await asyncio.gather(
+            *(self.aimprove(prompt, **kwargs) for prompt in prompts),
+            return_exceptions=True
+        )
+        return list(results)
+    
+    def improve_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Improve a prompt, yielding the result in chunks as it is produced.
+        
+        The default implementation yields the whole result of ``improve`` as a
+        single chunk. Strategies that generate text with the LLM should
+        override this to stream from ``llm_client.stream``.
+        
+        Args:
+            prompt: The original prompt to improve
+            **kwargs: Additional strategy-specific parameters
+            
+        Yields:
+            Chunks of the improved prompt
+        """
+        yield self.improve(prompt, **kwargs)
+    
+    async def aimprove_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Asynchronously improve a prompt, yielding the result in chunks.
+        
+        Args:
+            prompt: The original prompt to improve
+            **kwargs: Additional strategy-specific parameters
+            
+        Yields:
+            Chunks of the improved prompt
+        """
+        yield await self.aimprove(prompt, **kwargs)
+    
+    def get_sections(self, **kwargs) -> PromptSections:
+        """
+        Return the structured sections this strategy wraps around a prompt.
+        
+        Used to fuse several strategies into one pipeline. The default
+        implementation renders ``improve`` around a placeholder and keeps the
+        text before and after it as a preamble paragraph and a note; strategies
+        with structured output should override this so that their sections can
+        be merged with those of other strategies.
+        
+        Args:
+            **kwargs: Strategy-specific parameters, as accepted by ``improve``
+            
+        Returns:
+            The strategy's PromptSections
+            
+        Raises:
+            ValueError: If the strategy's output does not contain the prompt
+        """
+        placeholder = "\x00prompt\x00"
+        text = self.improve(placeholder, **kwargs)
+        if placeholder not in text:
+            raise ValueError(f"{self.get_strategy_name()} does not embed the prompt and cannot be fused.")
+        before, after = text.split(placeholder, 1)
+        return PromptSections(
+            preamble=[before.strip()] if before.strip() else [],
+            notes=[after.strip()] if after.strip() else []
+        )
+    
     @abstractmethod
     def get_strategy_name(self) -> str:
         """Return the name of the strategy."""
@@ -1,13 +1,31 @@
 try:
-    from .base import BaseStrategy
+    from .base import BaseStrategy, PromptSections
+    from .templates import CompiledTemplate
 except ImportError:
-    from strategies.base import BaseStrategy
-from langchain_core.prompts import PromptTemplate
+    from strategies.base import BaseStrategy, PromptSections
+    from strategies.templates import CompiledTemplate
 
 
 class ChainOfThoughtStrategy(BaseStrategy):
     """Apply Chain of Thought reasoning by structuring prompts with step-by-step instructions."""
     
+    exact_sections = True
+    
+    TEMPLATE = CompiledTemplate(
+        """Let's think step by step.
+
+Task: {prompt}
+
+Instructions:
+1. Break down the problem into smaller, manageable parts
+2. Think through each step carefully
+3. Show your reasoning for each step
+4. Provide a clear final answer after showing your reasoning
+
+Step-by-step reasoning:""",
+        ["prompt"]
+    )
+    
     def improve(self, prompt: str, **kwargs) -> str:
         """
         Improve prompt by adding Chain of Thought structure.
@@ -19,21 +37,21 @@ class ChainOfThoughtStrategy(BaseStrategy):
         Returns:
             Improved prompt with CoT structure
         """
-        cot_template = PromptTemplate(
-            input_variables=["prompt"],
-            template="""Let's think step by step.
-
-Task: {prompt}
-
-Instructions:
-1. Break down the problem into smaller, manageable parts
-2. Think through each step carefully
-3. Show your reasoning for each step
-4. Provide a clear final answer after showing your reasoning
-
-Step-by-step reasoning:"""
+        return self.TEMPLATE.render(prompt=prompt)
+    
+    def get_sections(self, **kwargs) -> PromptSections:
+        """Return the Chain of Thought structure as PromptSections (see BaseStrategy.get_sections)."""
+        return PromptSections(
+            preamble=["Let's think step by step."],
+            prompt_prefix="Task: ",
+            instructions=[
+                "Break down the problem into smaller, manageable parts",
+                "Think through each step carefully",
+                "Show your reasoning for each step",
+                "Provide a clear final answer after showing your reasoning",
+            ],
+            cue="Step-by-step reasoning:"
         )
-        return cot_template.format(prompt=prompt)
     
     def get_strategy_name(self) -> str:
         return "Chain of Thought"
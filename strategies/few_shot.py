@@ -1,15 +1,35 @@
+import threading
+from collections import OrderedDict
 try:
-    from .base import BaseStrategy
+    from .base import BaseStrategy, PromptSections
 except ImportError:
-    from strategies.base import BaseStrategy
-from typing import List, Dict, Optional
-from langchain_core.prompts import FewShotPromptTemplate, PromptTemplate
+    from strategies.base import BaseStrategy, PromptSections
+from typing import Any, List, Dict, Optional, Tuple
+
+# Layout of the rendered prompt, identical to the FewShotPromptTemplate it replaces
+EXAMPLE_TEMPLATE = "Input: {input}\nOutput: {output}"
+EXAMPLE_SEPARATOR = "\n\n"
+PREFIX = "Here are some examples:\n"
+SUFFIX_LEAD = "\nNow, following the pattern above:\n"
+SUFFIX = SUFFIX_LEAD + "{prompt}"
+
+# Stands in for the prompt when pre-rendering; contains no braces
+_PLACEHOLDER = "\x00prompt\x00"
+
+# Pre-rendered example sets kept per strategy instance
+RENDER_CACHE_SIZE = 128
 
 
 class FewShotStrategy(BaseStrategy):
     """Apply few-shot learning by structuring prompts with examples."""
     
-    def __init__(self, examples: Optional[List[Dict[str, str]]] = None, llm_client=None):
+    def __init__(
+        self,
+        examples: Optional[List[Dict[str, str]]] = None,
+        llm_client=None,
+        offline: bool = False,
+        example_bank=None
+    ):
         """
         Initialize Few-Shot Strategy.
         
@@ -17,40 +37,104 @@ class FewShotStrategy(BaseStrategy):
             examples: List of example dicts with 'input' and 'output' keys.
                       If None, examples will be generated using LLM.
             llm_client: Optional LLMClient instance
+            offline: If True, never create an LLM client (template-only)
+            example_bank: Optional ExampleBank; when set, the examples most similar
+                          to each prompt are retrieved from it instead of using
+                          the fixed examples
         """
-        super().__init__(llm_client)
+        super().__init__(llm_client, offline=offline)
         self.examples = examples or []
+        self.example_bank = example_bank
+        self.clear_cache()
+    
+    def clear_cache(self) -> None:
+        """Drop the pre-rendered example blocks."""
+        self._rendered: "OrderedDict[Tuple[Any, ...], Tuple[str, ...]]" = OrderedDict()
+        self._rendered_lock = threading.Lock()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        del state['_rendered'], state['_rendered_lock']
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.clear_cache()
+    
+    @staticmethod
+    def _render_parts(examples: List[Dict[str, str]], num_examples: int) -> Tuple[str, ...]:
+        """
+        Pre-render the examples into the text surrounding the prompt.
+        
+        Follows FewShotPromptTemplate exactly: each example is formatted, the
+        prefix, examples and suffix are joined, and the result is formatted once
+        more (so "{{" in examples becomes "{"). The text is split where the
+        prompt goes, so rendering is ``prompt.join(parts)``.
+        
+        Raises:
+            KeyError: If an example lacks 'input' or 'output', or the examples contain
+                      placeholders other than {prompt}
+        """
+        pieces = [EXAMPLE_TEMPLATE.format(**example) for example in examples[:num_examples]]
+        template = EXAMPLE_SEPARATOR.join([PREFIX, *pieces, SUFFIX])
+        return tuple(template.format(prompt=_PLACEHOLDER).split(_PLACEHOLDER))
     
-    def improve(self, prompt: str, examples: Optional[List[Dict[str, str]]] = None, num_examples: int = 2, **kwargs) -> str:
+    def _get_parts(self, examples: Optional[List[Dict[str, str]]], num_examples: int) -> Tuple[str, ...]:
+        """
+        Return the pre-rendered parts of the examples (default: the instance examples).
+        
+        Parts are cached in a small LRU keyed by the content of the examples
+        that are used, so in-place edits of the examples are picked up and
+        examples passed per call are cached too.
+        """
+        examples = examples or self.examples
+        try:
+            key = tuple(tuple(example.items()) for example in examples[:num_examples])
+            hash(key)
+        except (AttributeError, TypeError):
+            # Not dicts of hashable values; render without caching (and raise as before)
+            return self._render_parts(examples, num_examples)
+        
+        with self._rendered_lock:
+            parts = self._rendered.get(key)
+            if parts is not None:
+                self._rendered.move_to_end(key)
+                return parts
+        parts = self._render_parts(examples, num_examples)
+        with self._rendered_lock:
+            self._rendered[key] = parts
+            if len(self._rendered) > RENDER_CACHE_SIZE:
+                self._rendered.popitem(last=False)
+        return parts
+    
+    def improve(
+        self,
+        prompt: str,
+        examples: Optional[List[Dict[str, str]]] = None,
+        num_examples: int = 2,
+        example_bank=None,
+        **kwargs
+    ) -> str:
         """
         Improve prompt by adding few-shot examples.
         
         Args:
             prompt: Original prompt
-            examples: Optional list of examples (overrides self.examples)
+            examples: Optional list of examples (overrides self.examples and the bank)
             num_examples: Number of examples to include (if examples not provided)
+            example_bank: Optional ExampleBank to retrieve examples similar to the
+                          prompt from (overrides self.example_bank)
             **kwargs: Additional parameters (ignored)
             
         Returns:
             Improved prompt with examples
         """
-        effective_examples = examples or self.examples
-        
-        if effective_examples:
-            example_prompt = PromptTemplate(
-                input_variables=["input", "output"],
-                template="Input: {input}\nOutput: {output}"
-            )
-            
-            few_shot_prompt = FewShotPromptTemplate(
-                examples=effective_examples[:num_examples],
-                example_prompt=example_prompt,
-                prefix="Here are some examples:\n",
-                suffix="\nNow, following the pattern above:\n{prompt}",
-                input_variables=["prompt"]
-            )
-            
-            return few_shot_prompt.format(prompt=prompt)
+        example_bank = example_bank if example_bank is not None else self.example_bank
+        if not examples and example_bank is not None and len(example_bank):
+            selected = example_bank.search(prompt, num_examples)
+            return prompt.join(self._render_parts(selected, num_examples))
+        if examples or self.examples:
+            return prompt.join(self._get_parts(examples, num_examples))
         else:
             improved_prompt = f"""Here are some examples to guide the response:
 
@@ -59,6 +143,36 @@ class FewShotStrategy(BaseStrategy):
 Follow the pattern shown in the examples above."""
             return improved_prompt
     
+    def get_sections(
+        self,
+        examples: Optional[List[Dict[str, str]]] = None,
+        num_examples: int = 2,
+        **kwargs
+    ) -> PromptSections:
+        """
+        Return the few-shot examples as PromptSections (see BaseStrategy.get_sections).
+        
+        Raises:
+            ValueError: If examples come from an example bank, since they are then
+                        selected per prompt and cannot be fixed ahead of time
+        """
+        example_bank = kwargs.get('example_bank', self.example_bank)
+        if not examples and example_bank is not None and len(example_bank):
+            raise ValueError("Few-shot examples retrieved from an example bank depend on the prompt "
+                             "and cannot be compiled into fixed sections.")
+        if examples or self.examples:
+            parts = self._get_parts(examples, num_examples)
+            if len(parts) != 2 or not parts[0].endswith(EXAMPLE_SEPARATOR + SUFFIX_LEAD):
+                # The examples themselves embed {prompt}; fall back to the generic split
+                return super().get_sections(examples=examples, num_examples=num_examples, **kwargs)
+            return PromptSections(
+                preamble=[parts[0][:-len(EXAMPLE_SEPARATOR + SUFFIX_LEAD)]],
+                prompt_prefix=SUFFIX_LEAD
+            )
+        return PromptSections(
+            preamble=["Here are some examples to guide the response:"],
+            notes=["Follow the pattern shown in the examples above."]
+        )
+    
     def get_strategy_name(self) -> str:
         return "Few-Shot Learning"
-
@@ -1,23 +1,46 @@
 try:
-    from .base import BaseStrategy
+    from .base import BaseStrategy, PromptSections
+    from .templates import CompiledTemplate
 except ImportError:
-    from strategies.base import BaseStrategy
+    from strategies.base import BaseStrategy, PromptSections
+    from strategies.templates import CompiledTemplate
 from typing import Optional
-from langchain_core.prompts import PromptTemplate
 
 
 class ReActStrategy(BaseStrategy):
     """Apply ReAct framework by structuring prompts with Thought/Action/Observation format."""
     
-    def __init__(self, domain: Optional[str] = None, llm_client=None):
+    exact_sections = True
+    
+    TEMPLATE = CompiledTemplate(
+        """Task{domain_context}: {prompt}
+
+Instructions:
+Use the ReAct framework to solve this task. Alternate between reasoning (Thought) and actions (Action).
+
+Format your response as follows:
+- Thought: [Your reasoning about the current situation]
+- Action: [A concrete action or step to take]
+- Observation: [The result or observation from the action]
+- (Repeat Thought-Action-Observation cycle as needed)
+- Final Answer: [Your final answer after reasoning through the steps]
+
+Important: Do not fabricate information not provided in the context. Base your reasoning on available information.
+
+Begin:""",
+        ["prompt", "domain_context"]
+    )
+    
+    def __init__(self, domain: Optional[str] = None, llm_client=None, offline: bool = False):
         """
         Initialize ReAct Strategy.
         
         Args:
             domain: The domain/context (e.g., "software engineering", "debugging")
             llm_client: Optional LLMClient instance
+            offline: If True, never create an LLM client (template-only)
         """
-        super().__init__(llm_client)
+        super().__init__(llm_client, offline=offline)
         self.domain = domain
     
     def improve(self, prompt: str, domain: Optional[str] = None, **kwargs) -> str:
@@ -34,29 +57,32 @@ class ReActStrategy(BaseStrategy):
         """
         effective_domain = domain or self.domain
         domain_context = f" in the domain of {effective_domain}" if effective_domain else ""
-        react_template = PromptTemplate(
-            input_variables=["prompt", "domain_context"],
-            template="""Task{domain_context}: {prompt}
-
-Instructions:
-Use the ReAct framework to solve this task. Alternate between reasoning (Thought) and actions (Action).
-
-Format your response as follows:
-- Thought: [Your reasoning about the current situation]
-- Action: [A concrete action or step to take]
-- Observation: [The result or observation from the action]
-- (Repeat Thought-Action-Observation cycle as needed)
-- Final Answer: [Your final answer after reasoning through the steps]
-
-Important: Do not fabricate information not provided in the context. Base your reasoning on available information.
-
-Begin:"""
-        )
-        return react_template.format(
+        return self.TEMPLATE.render(
             prompt=prompt,
             domain_context=domain_context
         )
     
+    def get_sections(self, domain: Optional[str] = None, **kwargs) -> PromptSections:
+        """Return the ReAct structure as PromptSections (see BaseStrategy.get_sections)."""
+        effective_domain = domain or self.domain
+        domain_context = f" in the domain of {effective_domain}" if effective_domain else ""
+        return PromptSections(
+            prompt_prefix=f"Task{domain_context}: ",
+            guidance=[
+                "Use the ReAct framework to solve this task. Alternate between reasoning (Thought) and actions (Action).",
+            ],
+            notes=[
+                "Format your response as follows:\n"
+                "- Thought: [Your reasoning about the current situation]\n"
+                "- Action: [A concrete action or step to take]\n"
+                "- Observation: [The result or observation from the action]\n"
+                "- (Repeat Thought-Action-Observation cycle as needed)\n"
+                "- Final Answer: [Your final answer after reasoning through the steps]",
+                "Important: Do not fabricate information not provided in the context. Base your reasoning on available information.",
+            ],
+            cue="Begin:"
+        )
+    
     def get_strategy_name(self) -> str:
         return "ReAct"
 
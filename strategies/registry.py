@@ -0,0 +1,247 @@
+"""Lazy registry of prompt improvement strategies and their aliases."""
+import importlib
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Entry point group third-party packages use to register strategies, e.g. in pyproject.toml:
+#   [project.entry-points."prompt_improver.strategies"]
+#   my-strategy = "my_package.strategies:MyStrategy"
+ENTRY_POINT_GROUP = "prompt_improver.strategies"
+
+# Built-in strategies as (canonical key, "module:Class" import path, aliases)
+BUILTIN_STRATEGIES: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ('role', '.role:RoleStrategy', ()),
+    ('few-shot', '.few_shot:FewShotStrategy', ()),
+    ('cot', '.chain_of_thought:ChainOfThoughtStrategy', ('chain-of-thought',)),
+    ('self-consistency', '.self_consistency:SelfConsistencyStrategy', ()),
+    ('tot', '.tree_of_thought:TreeOfThoughtStrategy', ('tree-of-thought',)),
+    ('sot', '.skeleton_of_thought:SkeletonOfThoughtStrategy', ('skeleton-of-thought',)),
+    ('react', '.react:ReActStrategy', ()),
+)
+
+
+class StrategyRegistry:
+    """Maps strategy names and aliases to strategy classes, importing them on demand.
+    
+    Each strategy has one canonical key; aliases resolve to it. Classes are
+    registered as import paths (or entry points) and only imported the first
+    time they are requested.
+    """
+    
+    def __init__(self, entry_point_group: Optional[str] = ENTRY_POINT_GROUP):
+        """
+        Initialize the registry with the built-in strategies.
+        
+        Args:
+            entry_point_group: Entry point group scanned for third-party strategies
+                               on first need (None disables discovery)
+        """
+        self.entry_point_group = entry_point_group
+        self._targets: Dict[str, Any] = {}
+        self._classes: Dict[str, type] = {}
+        self._aliases: Dict[str, List[str]] = {}
+        self._canonical: Dict[str, str] = {}
+        self._entry_points_loaded = entry_point_group is None
+        self._lock = threading.RLock()
+        
+        for key, target, aliases in BUILTIN_STRATEGIES:
+            self.register(key, target, aliases)
+    
+    def register(self, key: str, target: Union[str, type, Any], aliases: Tuple[str, ...] = ()) -> None:
+        """
+        Register a strategy under a canonical key.
+        
+        Args:
+            key: Canonical strategy key (case-insensitive)
+            target: Strategy class, "module:Class" import path, or entry point
+            aliases: Other names that resolve to key
+        
+        Raises:
+            ValueError: If key or an alias is already taken by another strategy
+        """
+        key = key.lower()
+        with self._lock:
+            names = (key,) + tuple(a.lower() for a in aliases)
+            for name in names:
+                owner = self._canonical.get(name)
+                if owner is not None and owner != key:
+                    raise ValueError(f"Strategy name '{name}' is already registered for '{owner}'.")
+            self._targets[key] = target
+            self._classes.pop(key, None)
+            self._aliases.setdefault(key, [])
+            for name in names:
+                self._canonical[name] = key
+                if name != key and name not in self._aliases[key]:
+                    self._aliases[key].append(name)
+    
+    def _load_entry_points(self) -> None:
+        """Register strategies advertised through entry points, without loading them."""
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+            from importlib.metadata import entry_points
+            
+            # Entry points naming an already registered target become aliases of it
+            by_value = {}
+            for ep in entry_points(group=self.entry_point_group):
+                name = ep.name.lower()
+                if name in self._canonical:
+                    continue
+                if ep.value in by_value:
+                    self.register(by_value[ep.value], self._targets[by_value[ep.value]], (name,))
+                else:
+                    by_value[ep.value] = name
+                    self.register(name, ep)
+    
+    def resolve(self, name: str) -> str:
+        """
+        Return the canonical key for a strategy name or alias.
+        
+        Args:
+            name: Strategy name or alias (case-insensitive)
+        
+        Returns:
+            Canonical strategy key
+        
+        Raises:
+            KeyError: If no strategy is registered under name
+        """
+        name = name.lower()
+        key = self._canonical.get(name)
+        if key is None and not self._entry_points_loaded:
+            self._load_entry_points()
+            key = self._canonical.get(name)
+        if key is None:
+            raise KeyError(name)
+        return key
+    
+    def get_class(self, name: str) -> type:
+        """
+        Return the strategy class for a name or alias, importing it on first use.
+        
+        Raises:
+            KeyError: If no strategy is registered under name
+        """
+        key = self.resolve(name)
+        cls = self._classes.get(key)
+        if cls is not None:
+            return cls
+        with self._lock:
+            target = self._targets[key]
+            if isinstance(target, type):
+                cls = target
+            elif isinstance(target, str):
+                module_name, _, attr = target.partition(':')
+                # Leading-dot paths are relative to this package (the built-ins)
+                module = importlib.import_module(module_name, __package__)
+                cls = getattr(module, attr)
+            else:
+                cls = target.load()
+            self._classes[key] = cls
+        return cls
+    
+    def names(self) -> List[str]:
+        """Return all strategy names, each canonical key followed by its aliases."""
+        self._load_entry_points()
+        with self._lock:
+            return [name for key in self._targets for name in [key] + self._aliases[key]]
+    
+    def keys(self) -> List[str]:
+        """Return the canonical strategy keys."""
+        self._load_entry_points()
+        with self._lock:
+            return list(self._targets)
+    
+    def aliases(self, name: str) -> List[str]:
+        """Return the aliases of a strategy (excluding its canonical key)."""
+        return list(self._aliases[self.resolve(name)])
+
+
+class StrategyMap(Mapping):
+    """Read-only mapping of strategy name to instance, built on first access.
+    
+    Aliases map to the same instance as their canonical key, and iteration
+    yields every name (canonical keys and aliases) without instantiating
+    anything.
+    """
+    
+    def __init__(self, registry: StrategyRegistry, llm_client: Any = None, offline: bool = False):
+        """
+        Initialize the mapping.
+        
+        Args:
+            registry: Registry resolving names to strategy classes
+            llm_client: LLM client shared by every strategy built
+            offline: Build strategies in offline (template-only) mode
+        """
+        self.registry = registry
+        self.llm_client = llm_client
+        self.offline = offline
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, name: str):
+        key = self.registry.resolve(name)
+        instance = self._instances.get(key)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(key)
+                if instance is None:
+                    cls = self.registry.get_class(key)
+                    if self.offline:
+                        instance = self._build_offline(cls)
+                    else:
+                        instance = cls(llm_client=self.llm_client)
+                    self._instances[key] = instance
+        return instance
+    
+    def _build_offline(self, cls: type):
+        """
+        Build an offline instance of cls.
+        
+        Plugin strategies whose ``__init__`` takes no ``offline`` argument are
+        built with ``llm_client`` only and switched to offline afterwards.
+        """
+        import inspect
+        
+        parameters = inspect.signature(cls).parameters.values()
+        if any(p.name == "offline" or p.kind is p.VAR_KEYWORD for p in parameters):
+            return cls(llm_client=self.llm_client, offline=True)
+        instance = cls(llm_client=self.llm_client)
+        instance.offline = True
+        return instance
+    
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        try:
+            self.registry.resolve(name)
+        except KeyError:
+            return False
+        return True
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.registry.names())
+    
+    def __len__(self) -> int:
+        return len(self.registry.names())
+    
+    def built(self) -> List[str]:
+        """Return the canonical keys of strategies instantiated so far."""
+        with self._lock:
+            return list(self._instances)
+
+
+_default_registry = StrategyRegistry()
+
+
+def get_strategy_registry() -> StrategyRegistry:
+    """Return the process-wide default StrategyRegistry."""
+    return _default_registry
+
+
+def register_strategy(key: str, target: Union[str, type], aliases: Tuple[str, ...] = ()) -> None:
+    """Register a strategy with the default registry (see StrategyRegistry.register)."""
+    _default_registry.register(key, target, aliases)
@@ -1,14 +1,16 @@
 try:
-    from .base import BaseStrategy
+    from .base import BaseStrategy, PromptSections
 except ImportError:
-    from strategies.base import BaseStrategy
+    from strategies.base import BaseStrategy, PromptSections
 from typing import Optional
 
 
 class RoleStrategy(BaseStrategy):
     """Apply role prompting by structuring prompts with role context."""
     
-    def __init__(self, role: Optional[str] = None, llm_client=None):
+    exact_sections = True
+    
+    def __init__(self, role: Optional[str] = None, llm_client=None, offline: bool = False):
         """
         Initialize Role Strategy.
         
@@ -16,8 +18,9 @@ class RoleStrategy(BaseStrategy):
             role: The role to assign (e.g., "senior software engineer", "university professor").
                   If None, a generic expert role will be used.
             llm_client: Optional LLMClient instance
+            offline: If True, never create an LLM client (template-only)
         """
-        super().__init__(llm_client)
+        super().__init__(llm_client, offline=offline)
         self.role = role
     
     def improve(self, prompt: str, role: Optional[str] = None, **kwargs) -> str:
@@ -35,6 +38,13 @@ class RoleStrategy(BaseStrategy):
         effective_role = role or self.role or "an expert in the relevant field"
         return f"You are {effective_role}. Provide clear, professional, and contextually appropriate responses.\n\n{prompt}"
     
+    def get_sections(self, role: Optional[str] = None, **kwargs) -> PromptSections:
+        """Return the role preamble as PromptSections (see BaseStrategy.get_sections)."""
+        effective_role = role or self.role or "an expert in the relevant field"
+        return PromptSections(preamble=[
+            f"You are {effective_role}. Provide clear, professional, and contextually appropriate responses."
+        ])
+    
     def get_strategy_name(self) -> str:
         return "Role Prompting"
 
@@ -1,23 +1,40 @@
 try:
-    from .base import BaseStrategy
+    from .base import BaseStrategy, PromptSections
+    from .templates import CompiledTemplate
 except ImportError:
-    from strategies.base import BaseStrategy
+    from strategies.base import BaseStrategy, PromptSections
+    from strategies.templates import CompiledTemplate
 from typing import Optional
-from langchain_core.prompts import PromptTemplate
 
 
 class SelfConsistencyStrategy(BaseStrategy):
     """Apply Self-Consistency by structuring prompts to generate multiple reasoning paths."""
     
-    def __init__(self, num_paths: int = 3, llm_client=None):
+    exact_sections = True
+    
+    TEMPLATE = CompiledTemplate(
+        """Task: {prompt}
+
+Instructions:
+1. Generate {num_paths} different independent reasoning paths to solve this task
+2. Each path should be thorough and complete
+3. After generating all paths, compare them and identify the most consistent answer
+4. Explain why the chosen answer is the most consistent across all paths
+
+Reasoning Paths:""",
+        ["prompt", "num_paths"]
+    )
+    
+    def __init__(self, num_paths: int = 3, llm_client=None, offline: bool = False):
         """
         Initialize Self-Consistency Strategy.
         
         Args:
             num_paths: Number of reasoning paths to generate (default: 3)
             llm_client: Optional LLMClient instance
+            offline: If True, never create an LLM client (template-only)
         """
-        super().__init__(llm_client)
+        super().__init__(llm_client, offline=offline)
         self.num_paths = num_paths
     
     def improve(self, prompt: str, num_paths: Optional[int] = None, **kwargs) -> str:
@@ -33,23 +50,25 @@ class SelfConsistencyStrategy(BaseStrategy):
             Improved prompt with Self-Consistency structure
         """
         effective_num_paths = num_paths or self.num_paths
-        self_consistency_template = PromptTemplate(
-            input_variables=["prompt", "num_paths"],
-            template="""Task: {prompt}
-
-Instructions:
-1. Generate {num_paths} different independent reasoning paths to solve this task
-2. Each path should be thorough and complete
-3. After generating all paths, compare them and identify the most consistent answer
-4. Explain why the chosen answer is the most consistent across all paths
-
-Reasoning Paths:"""
-        )
-        return self_consistency_template.format(
+        return self.TEMPLATE.render(
             prompt=prompt,
             num_paths=effective_num_paths
         )
     
+    def get_sections(self, num_paths: Optional[int] = None, **kwargs) -> PromptSections:
+        """Return the Self-Consistency structure as PromptSections (see BaseStrategy.get_sections)."""
+        effective_num_paths = num_paths or self.num_paths
+        return PromptSections(
+            prompt_prefix="Task: ",
+            instructions=[
+                f"Generate {effective_num_paths} different independent reasoning paths to solve this task",
+                "Each path should be thorough and complete",
+                "After generating all paths, compare them and identify the most consistent answer",
+                "Explain why the chosen answer is the most consistent across all paths",
+            ],
+            cue="Reasoning Paths:"
+        )
+    
     def get_strategy_name(self) -> str:
         return "Self-Consistency"
 
@@ -1,23 +1,40 @@
 try:
-    from .base import BaseStrategy
+    from .base import BaseStrategy, PromptSections
+    from .templates import CompiledTemplate
 except ImportError:
-    from strategies.base import BaseStrategy
+    from strategies.base import BaseStrategy, PromptSections
+    from strategies.templates import CompiledTemplate
 from typing import Optional
-from langchain_core.prompts import PromptTemplate
 
 
 class SkeletonOfThoughtStrategy(BaseStrategy):
     """Apply Skeleton of Thought by structuring prompts with two-phase approach."""
     
-    def __init__(self, num_points: int = 5, llm_client=None):
+    exact_sections = True
+    
+    TEMPLATE = CompiledTemplate(
+        """Task: {prompt}
+
+Step 1 - Generate Skeleton:
+Create {num_points} concise bullet points or section headers that outline the main points. Do not expand yet.
+
+Step 2 - Expand Skeleton:
+For each bullet point or section header from Step 1, expand it into a clear and detailed explanation with examples and technical details.
+
+Skeleton Generation:""",
+        ["prompt", "num_points"]
+    )
+    
+    def __init__(self, num_points: int = 5, llm_client=None, offline: bool = False):
         """
         Initialize Skeleton of Thought Strategy.
         
         Args:
             num_points: Number of skeleton points to generate (default: 5)
             llm_client: Optional LLMClient instance
+            offline: If True, never create an LLM client (template-only)
         """
-        super().__init__(llm_client)
+        super().__init__(llm_client, offline=offline)
         self.num_points = num_points
     
     def improve(self, prompt: str, num_points: Optional[int] = None, **kwargs) -> str:
@@ -33,23 +50,25 @@ class SkeletonOfThoughtStrategy(BaseStrategy):
             Improved prompt with SoT structure
         """
         effective_num_points = num_points or self.num_points
-        sot_template = PromptTemplate(
-            input_variables=["prompt", "num_points"],
-            template="""Task: {prompt}
-
-Step 1 - Generate Skeleton:
-Create {num_points} concise bullet points or section headers that outline the main points. Do not expand yet.
-
-Step 2 - Expand Skeleton:
-For each bullet point or section header from Step 1, expand it into a clear and detailed explanation with examples and technical details.
-
-Skeleton Generation:"""
-        )
-        return sot_template.format(
+        return self.TEMPLATE.render(
             prompt=prompt,
             num_points=effective_num_points
         )
     
+    def get_sections(self, num_points: Optional[int] = None, **kwargs) -> PromptSections:
+        """Return the Skeleton of Thought structure as PromptSections (see BaseStrategy.get_sections)."""
+        effective_num_points = num_points or self.num_points
+        return PromptSections(
+            prompt_prefix="Task: ",
+            notes=[
+                "Step 1 - Generate Skeleton:\n"
+                f"Create {effective_num_points} concise bullet points or section headers that outline the main points. Do not expand yet.",
+                "Step 2 - Expand Skeleton:\n"
+                "For each bullet point or section header from Step 1, expand it into a clear and detailed explanation with examples and technical details.",
+            ],
+            cue="Skeleton Generation:"
+        )
+    
     def get_strategy_name(self) -> str:
         return "Skeleton of Thought"
 
@@ -0,0 +1,42 @@
+"""Precompiled strategy templates rendered without per-call PromptTemplate overhead."""
+from string import Formatter
+from typing import List
+
+
+class CompiledTemplate:
+    """An f-string prompt template validated once and rendered with ``str.format``.
+    
+    Strategies define their templates as class attributes, so parsing and
+    validation happen once at import time instead of on every ``improve`` call.
+    Rendering produces exactly the same text as ``PromptTemplate.format`` for the
+    same template and variables.
+    """
+    
+    def __init__(self, template: str, input_variables: List[str]):
+        """
+        Parse and validate the template.
+        
+        Args:
+            template: Template text with ``{variable}`` placeholders
+            input_variables: Names of the variables the template uses
+        
+        Raises:
+            ValueError: If the placeholders do not match input_variables
+        """
+        fields = {name for _, name, _, _ in Formatter().parse(template) if name is not None}
+        if fields != set(input_variables):
+            raise ValueError(
+                f"Template variables {sorted(fields)} do not match input_variables {sorted(input_variables)}."
+            )
+        self.template = template
+        self.input_variables = list(input_variables)
+        self._format = template.format
+    
+    def render(self, **kwargs) -> str:
+        """Render the template with the given variables."""
+        return self._format(**kwargs)
+    
+    def to_prompt_template(self):
+        """Return an equivalent langchain ``PromptTemplate``."""
+        from langchain_core.prompts import PromptTemplate
+        return PromptTemplate(input_variables=self.input_variables, template=self.template)
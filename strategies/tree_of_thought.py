@@ -1,23 +1,43 @@
 try:
-    from .base import BaseStrategy
+    from .base import BaseStrategy, PromptSections
+    from .templates import CompiledTemplate
 except ImportError:
-    from strategies.base import BaseStrategy
+    from strategies.base import BaseStrategy, PromptSections
+    from strategies.templates import CompiledTemplate
 from typing import Optional
-from langchain_core.prompts import PromptTemplate
 
 
 class TreeOfThoughtStrategy(BaseStrategy):
     """Apply Tree of Thought by structuring prompts to explore multiple solution branches."""
     
-    def __init__(self, num_branches: int = 3, llm_client=None):
+    exact_sections = True
+    
+    TEMPLATE = CompiledTemplate(
+        """Task: {prompt}
+
+Instructions:
+1. Generate at least {num_branches} different possible approaches or solutions
+2. For each approach, evaluate:
+   - Feasibility
+   - Advantages
+   - Disadvantages
+3. Compare all approaches and evaluate trade-offs
+4. Choose the best approach with clear reasoning
+
+Approach Exploration:""",
+        ["prompt", "num_branches"]
+    )
+    
+    def __init__(self, num_branches: int = 3, llm_client=None, offline: bool = False):
         """
         Initialize Tree of Thought Strategy.
         
         Args:
             num_branches: Number of branches to explore (default: 3)
             llm_client: Optional LLMClient instance
+            offline: If True, never create an LLM client (template-only)
         """
-        super().__init__(llm_client)
+        super().__init__(llm_client, offline=offline)
         self.num_branches = num_branches
     
     def improve(self, prompt: str, num_branches: Optional[int] = None, **kwargs) -> str:
@@ -33,26 +53,25 @@ class TreeOfThoughtStrategy(BaseStrategy):
             Improved prompt with ToT structure
         """
         effective_num_branches = num_branches or self.num_branches
-        tot_template = PromptTemplate(
-            input_variables=["prompt", "num_branches"],
-            template="""Task: {prompt}
-
-Instructions:
-1. Generate at least {num_branches} different possible approaches or solutions
-2. For each approach, evaluate:
-   - Feasibility
-   - Advantages
-   - Disadvantages
-3. Compare all approaches and evaluate trade-offs
-4. Choose the best approach with clear reasoning
-
-Approach Exploration:"""
-        )
-        return tot_template.format(
+        return self.TEMPLATE.render(
             prompt=prompt,
             num_branches=effective_num_branches
         )
     
+    def get_sections(self, num_branches: Optional[int] = None, **kwargs) -> PromptSections:
+        """Return the Tree of Thought structure as PromptSections (see BaseStrategy.get_sections)."""
+        effective_num_branches = num_branches or self.num_branches
+        return PromptSections(
+            prompt_prefix="Task: ",
+            instructions=[
+                f"Generate at least {effective_num_branches} different possible approaches or solutions",
+                "For each approach, evaluate:\n   - Feasibility\n   - Advantages\n   - Disadvantages",
+                "Compare all approaches and evaluate trade-offs",
+                "Choose the best approach with clear reasoning",
+            ],
+            cue="Approach Exploration:"
+        )
+    
     def get_strategy_name(self) -> str:
         return "Tree of Thought"
 
@@ -2,9 +2,10 @@
 Unit tests for BaseStrategy abstract class.
 """
 
+import asyncio
 import sys
 from pathlib import Path
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
 import pytest
 
 # Add parent directory to path for imports
@@ -47,6 +48,31 @@ class TestBaseStrategy:
         
         assert strategy.llm_client == mock_client
     
+    def test_llm_client_is_created_lazily(self):
+        """Test no LLMClient is built until llm_client is first accessed."""
+        with patch('llm_client.LLMClient') as mock_llm_client_class:
+            strategy = ConcreteStrategy()
+            mock_llm_client_class.assert_not_called()
+            
+            assert strategy.llm_client is mock_llm_client_class.return_value
+            assert strategy.llm_client is mock_llm_client_class.return_value
+            mock_llm_client_class.assert_called_once_with()
+    
+    def test_offline_strategy_never_creates_client(self):
+        """Test an offline strategy improves prompts without an LLM client."""
+        with patch('llm_client.LLMClient') as mock_llm_client_class:
+            strategy = ConcreteStrategy(offline=True)
+            
+            assert strategy.improve("test prompt") == "Improved: test prompt"
+            with pytest.raises(RuntimeError, match="offline"):
+                strategy.llm_client
+            mock_llm_client_class.assert_not_called()
+    
+    def test_offline_strategy_rejects_llm_client(self):
+        """Test offline and an explicit llm_client are mutually exclusive."""
+        with pytest.raises(ValueError, match="offline"):
+            ConcreteStrategy(llm_client=Mock(), offline=True)
+    
     def test_concrete_strategy_improve(self):
         """Test concrete strategy improve method."""
         strategy = ConcreteStrategy()
@@ -67,4 +93,47 @@ class TestBaseStrategy:
         result = strategy.improve("test prompt", extra_param="value")
         
         assert result == "Improved: test prompt"
-
+    
+    def test_concrete_strategy_aimprove(self):
+        """Test that the default aimprove delegates to improve."""
+        strategy = ConcreteStrategy(llm_client=Mock())
+        result = asyncio.run(strategy.aimprove("test prompt", extra_param="value"))
+        
+        assert result == "Improved: test prompt"
+    
+    def test_improve_batch_captures_errors(self):
+        """Test the default improve_batch improves each prompt and keeps failures per item."""
+        class FailingStrategy(ConcreteStrategy):
+            def improve(self, prompt: str, **kwargs) -> str:
+                if prompt == "bad":
+                    raise ValueError("bad prompt")
+                return super().improve(prompt, **kwargs)
+        
+        results = FailingStrategy(offline=True).improve_batch(["a", "bad", "b"])
+        
+        assert results[0] == "Improved: a"
+        assert isinstance(results[1], ValueError)
+        assert results[2] == "Improved: b"
+    
+    def test_aimprove_batch_renders_template_strategies_synchronously(self):
+        """Test aimprove_batch uses improve_batch when aimprove is not overridden."""
+        strategy = ConcreteStrategy(offline=True)
+        with patch.object(strategy, 'improve_batch', wraps=strategy.improve_batch) as improve_batch:
+            results = asyncio.run(strategy.aimprove_batch(["a", "b"]))
+        
+        assert results == ["Improved: a", "Improved: b"]
+        improve_batch.assert_called_once_with(["a", "b"])
+    
+    def test_aimprove_batch_awaits_overridden_aimprove(self):
+        """Test aimprove_batch awaits a custom aimprove concurrently and keeps failures per item."""
+        class AsyncStrategy(ConcreteStrategy):
+            async def aimprove(self, prompt: str, **kwargs) -> str:
+                await asyncio.sleep(0)
+                if prompt == "bad":
+                    raise RuntimeError("failed")
+                return f"Async: {prompt}"
+        
+        results = asyncio.run(AsyncStrategy(offline=True).aimprove_batch(["a", "bad"]))
+        
+        assert results[0] == "Async: a"
+        assert isinstance(results[1], RuntimeError)
@@ -0,0 +1,184 @@
+"""
+Unit tests for the streaming batch mode.
+"""
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from batch import main as batch_main, parse_line, read_items, run_batch
+from improver import PromptImprover
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class TestBatch:
+    """Tests for batch parsing, execution and the batch subcommand."""
+    
+    @pytest.fixture
+    def improver(self):
+        """An offline PromptImprover."""
+        return PromptImprover(offline=True)
+    
+    def test_parse_plain_and_json_lines(self):
+        """Test plain-text and JSON lines parse into items, and blank lines are skipped."""
+        item = parse_line("Explain recursion\n", 3)
+        assert (item.id, item.prompt, item.strategy, item.kwargs) == (3, "Explain recursion", None, {})
+        
+        item = parse_line('{"id": "q1", "prompt": "Hi", "strategy": "role", "kwargs": {"role": "a chef"}}', 1)
+        assert (item.id, item.prompt, item.strategy, item.kwargs) == ("q1", "Hi", "role", {"role": "a chef"})
+        
+        assert parse_line('"a JSON string"', 2, "jsonl").prompt == "a JSON string"
+        assert parse_line("   \n", 4) is None
+    
+    def test_parse_auto_falls_back_to_plain(self):
+        """Test auto format treats invalid JSON as plain text, and lines format never parses JSON."""
+        assert parse_line("{not json}", 1).prompt == "{not json}"
+        assert parse_line('{"prompt": "x"}', 1, "lines").prompt == '{"prompt": "x"}'
+    
+    def test_parse_errors(self):
+        """Test malformed JSONL records become items carrying an error."""
+        assert parse_line("{not json}", 1, "jsonl").error.startswith("Invalid JSON")
+        assert parse_line("[1, 2]", 1, "jsonl").error == "Expected a JSON object or string"
+        assert "prompt" in parse_line('{"id": 9}', 1).error
+        assert parse_line('{"id": 9}', 1).id == 9
+        assert "kwargs" in parse_line('{"prompt": "x", "kwargs": [1]}', 1).error
+    
+    def test_read_items_is_lazy(self):
+        """Test read_items consumes the input only as items are requested."""
+        consumed = []
+        
+        def lines():
+            for i in range(1000):
+                consumed.append(i)
+                yield f"prompt {i}\n"
+        
+        items = read_items(lines())
+        assert next(items).prompt == "prompt 0"
+        assert len(consumed) == 1
+    
+    def test_read_items_rejects_unknown_format(self):
+        """Test an unknown input format raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown format"):
+            list(read_items([], "csv"))
+    
+    def test_run_batch_results(self, improver):
+        """Test run_batch improves each item with its own or the default strategy and reports errors per item."""
+        items = read_items([
+            "Explain recursion\n",
+            '{"id": "r", "prompt": "Cook", "strategy": "role", "kwargs": {"role": "a chef"}}\n',
+            '{"prompt": "x", "strategy": "nope"}\n',
+        ])
+        results = list(run_batch(improver, items, strategy="cot", ordered=True))
+        
+        assert results[0] == {"id": 1, "strategy": "cot",
+                              "improved_prompt": improver.improve("Explain recursion", "cot")}
+        assert results[1]["improved_prompt"] == improver.improve("Cook", "role", role="a chef")
+        assert results[2]["id"] == 3 and "Unknown strategy" in results[2]["error"]
+    
+    def test_run_batch_requires_strategy(self, improver):
+        """Test an item without a strategy and no default yields an error record."""
+        results = list(run_batch(improver, read_items(["x\n"])))
+        assert results == [{"id": 1, "strategy": None, "error": "No strategy given for this item"}]
+    
+    def test_run_batch_item_kwargs_override_defaults(self, improver):
+        """Test per-item kwargs override the batch-wide defaults."""
+        items = read_items(['{"prompt": "p", "kwargs": {"role": "a pilot"}}', "q"])
+        results = list(run_batch(improver, items, strategy="role", ordered=True, role="a chef"))
+        assert "a pilot" in results[0]["improved_prompt"]
+        assert "a chef" in results[1]["improved_prompt"]
+    
+    def test_run_batch_ordered(self, improver):
+        """Test ordered mode yields results in input order."""
+        items = read_items(f"prompt {i}\n" for i in range(200))
+        results = run_batch(improver, items, strategy="cot", concurrency=4, ordered=True)
+        assert [r["id"] for r in results] == list(range(1, 201))
+    
+    def test_run_batch_unordered_covers_every_item(self, improver):
+        """Test unordered mode yields every item exactly once."""
+        items = read_items(f"prompt {i}\n" for i in range(200))
+        results = list(run_batch(improver, items, strategy="cot", concurrency=4))
+        assert sorted(r["id"] for r in results) == list(range(1, 201))
+    
+    def test_run_batch_bounds_read_ahead(self):
+        """Test run_batch reads only a bounded number of items ahead of the results."""
+        class SlowImprover:
+            def improve(self, prompt, strategy, **kwargs):
+                time.sleep(0.001)
+                return prompt
+        
+        consumed = []
+        
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield parse_line(f"p{i}", i + 1)
+        
+        results = run_batch(SlowImprover(), items(), strategy="cot", concurrency=2)
+        next(results)
+        assert len(consumed) <= 2 * 2 + 1
+        assert len(list(results)) == 99
+    
+    def test_run_batch_is_concurrent(self):
+        """Test items run concurrently, never beyond the concurrency limit."""
+        active, peak = [0], [0]
+        lock = threading.Lock()
+        
+        class SlowImprover:
+            def improve(self, prompt, strategy, **kwargs):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.01)
+                with lock:
+                    active[0] -= 1
+                return prompt
+        
+        list(run_batch(SlowImprover(), read_items(f"p{i}" for i in range(20)), strategy="cot", concurrency=4))
+        assert 1 < peak[0] <= 4
+    
+    def test_run_batch_rejects_bad_concurrency(self, improver):
+        """Test a concurrency below 1 raises ValueError."""
+        with pytest.raises(ValueError):
+            list(run_batch(improver, [], strategy="cot", concurrency=0))
+    
+    def test_batch_main_files(self, tmp_path, capsys):
+        """Test the batch entry point reads a file, writes JSONL output and reports a summary."""
+        source = tmp_path / "in.jsonl"
+        source.write_text('Explain recursion\n{"id": "b", "prompt": "Ünïcödé"}\n', encoding="utf-8")
+        output = tmp_path / "out.jsonl"
+        
+        status = batch_main([str(source), "-o", str(output), "-s", "sot", "--offline", "--num-points", "2", "--ordered"])
+        
+        assert status == 0
+        results = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert [r["id"] for r in results] == [1, "b"]
+        assert results[1]["improved_prompt"] == PromptImprover(offline=True).improve("Ünïcödé", "sot", num_points=2)
+        assert "Improved 2 prompts (0 failed)" in capsys.readouterr().err
+    
+    def test_batch_main_reports_failures(self, tmp_path):
+        """Test the batch entry point exits with 1 when an item fails."""
+        source = tmp_path / "in.txt"
+        source.write_text("x\n", encoding="utf-8")
+        assert batch_main([str(source), "-o", str(tmp_path / "out.jsonl"), "--offline"]) == 1
+    
+    def test_cli_batch_subcommand_streams_stdin(self):
+        """Test `main.py batch` improves prompts streamed on stdin."""
+        result = subprocess.run(
+            [sys.executable, "main.py", "batch", "--strategy", "cot", "--offline", "--ordered"],
+            cwd=PROJECT_ROOT,
+            input="first\nsecond\n",
+            capture_output=True,
+            text=True,
+            timeout=120
+        )
+        
+        assert result.returncode == 0, result.stderr
+        assert [json.loads(line)["id"] for line in result.stdout.splitlines()] == [1, 2]
@@ -0,0 +1,91 @@
+"""
+Unit tests for the benchmark suite's measurement, JSON output and baseline comparison.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent and benchmarks directories to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from suite import FORMAT_VERSION, compare, main, measure, run_benchmarks
+
+
+def results(**seconds):
+    """Build a results document with the given seconds per benchmark."""
+    return {"format": FORMAT_VERSION, "metadata": {}, "results": {name: {"seconds": s} for name, s in seconds.items()}}
+
+
+class TestBenchmarkSuite:
+    """Tests for the benchmark suite."""
+    
+    def test_measure_calibrates_loops(self):
+        """Test measure picks a loop count that fills min_time and reports per-call times."""
+        calls = []
+        result = measure(lambda: calls.append(1), min_time=0.01, repeats=3)
+        
+        assert result["loops"] > 1
+        assert result["repeats"] == 3
+        assert 0 < result["best"] <= result["seconds"]
+    
+    def test_measure_fixed_loops(self):
+        """Test measure runs exactly the given loops after one warm-up call."""
+        calls = []
+        result = measure(lambda: calls.append(1), min_time=10, repeats=2, loops=1)
+        
+        # One warm-up call plus one call per repeat
+        assert len(calls) == 3
+        assert result["loops"] == 1
+    
+    def test_run_benchmarks_filters_by_name(self):
+        """Test run_benchmarks runs only the benchmarks matching the pattern."""
+        output = run_benchmarks("^construct/offline$", min_time=0.001, repeats=1)
+        
+        assert output["format"] == FORMAT_VERSION
+        assert list(output["results"]) == ["construct/offline"]
+        assert output["metadata"]["repeats"] == 1
+    
+    def test_improve_results_record_prompt_size(self):
+        """Test the improve benchmarks cover each prompt size and record its bytes."""
+        output = run_benchmarks("^improve/cot/", min_time=0.001, repeats=1)
+        
+        assert list(output["results"]) == ["improve/cot/small", "improve/cot/medium", "improve/cot/large"]
+        assert output["results"]["improve/cot/large"]["bytes"] > 1_000_000
+    
+    def test_compare_statuses(self):
+        """Test compare labels regressions, improvements, new and missing benchmarks."""
+        rows = compare(
+            results(same=1.0, slower=1.5, faster=0.5, gone=1.0),
+            results(same=1.1, slower=2.0, faster=0.2, added=1.0),
+            threshold=0.25
+        )
+        
+        statuses = {row["name"]: row["status"] for row in rows}
+        assert statuses == {
+            "same": "ok", "slower": "regression", "faster": "improvement", "added": "new", "gone": "missing"
+        }
+        assert next(row for row in rows if row["name"] == "slower")["ratio"] == pytest.approx(4 / 3)
+    
+    def test_compare_rejects_unknown_format(self):
+        """Test compare raises ValueError for a results document in another format."""
+        with pytest.raises(ValueError, match="format"):
+            compare({"format": FORMAT_VERSION + 1, "results": {}}, results())
+    
+    def test_main_saves_and_flags_regressions(self, tmp_path, capsys):
+        """Test the CLI saves results and exits with 1 on a regression against a baseline."""
+        output = tmp_path / "current.json"
+        args = ["-k", "^construct/offline$", "--min-time", "0.001", "--repeats", "1", "-o", str(output)]
+        assert main(args) == 0
+        saved = json.loads(output.read_text())
+        
+        # A baseline 100x faster makes the current run a regression
+        fast = dict(saved, results={"construct/offline": {"seconds": saved["results"]["construct/offline"]["seconds"] / 100}})
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps(fast))
+        
+        assert main(args + ["--compare", str(baseline)]) == 1
+        assert "regression" in capsys.readouterr().out
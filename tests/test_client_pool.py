@@ -0,0 +1,185 @@
+"""
+Unit tests for the shared client registry.
+"""
+
+import asyncio
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from client_pool import ClientRegistry, get_registry
+from llm_client import LLMClient
+
+
+class TestClientRegistry:
+    """Tests for ClientRegistry and its use by LLMClient."""
+    
+    def test_get_or_create_reuses_model(self):
+        """Test that the same key returns the same model instance."""
+        registry = ClientRegistry()
+        factory = MagicMock(side_effect=lambda: object())
+        
+        first = registry.get_or_create(("openai", "m", 0.0, "k"), factory)
+        second = registry.get_or_create(("openai", "m", 0.0, "k"), factory)
+        other = registry.get_or_create(("openai", "m", 0.5, "k"), factory)
+        
+        assert first is second
+        assert first is not other
+        assert factory.call_count == 2
+        assert registry.get_stats()['hits'] == 1
+        assert registry.get_stats()['misses'] == 2
+    
+    def test_http_client_uses_pool_limits(self):
+        """Test the shared httpx client is created once with the configured limits."""
+        registry = ClientRegistry(max_connections=7, max_keepalive_connections=3)
+        
+        with patch('httpx.Client') as mock_client_class:
+            assert registry.http_client is registry.http_client
+            mock_client_class.assert_called_once()
+            limits = mock_client_class.call_args[1]['limits']
+            assert limits.max_connections == 7
+            assert limits.max_keepalive_connections == 3
+    
+    def test_configure_drops_existing_clients(self):
+        """Test new limits take effect by dropping models and HTTP clients."""
+        registry = ClientRegistry()
+        registry.get_or_create("key", object)
+        client = registry.http_client
+        
+        registry.configure(max_connections=5)
+        
+        assert registry.max_connections == 5
+        assert registry.get_stats()['models'] == 0
+        assert registry.http_client is not client
+    
+    def test_prewarm(self):
+        """Test prewarm issues a HEAD request per URL and reports failures."""
+        registry = ClientRegistry()
+        registry._http_client = MagicMock()
+        registry._http_client.head.side_effect = [MagicMock(), ConnectionError("down")]
+        
+        warmed = registry.prewarm(["https://a.example", "https://b.example"], timeout=1.0)
+        
+        assert warmed == {"https://a.example": True, "https://b.example": False}
+        assert registry._http_client.head.call_count == 2
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_clients_share_model_and_http_pool(self, mock_chat_openai):
+        """Test LLMClients with identical configuration share one model."""
+        first = LLMClient(provider="openai", model_name="gpt-4o-mini", temperature=0.1)
+        second = LLMClient(provider="openai", model_name="gpt-4o-mini", temperature=0.1)
+        
+        assert first.llm is second.llm
+        mock_chat_openai.assert_called_once()
+        call_kwargs = mock_chat_openai.call_args[1]
+        assert call_kwargs['http_client'] is get_registry().http_client
+        assert call_kwargs['http_async_client'] is get_registry().async_http_client
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_clients_with_different_keys_do_not_share(self, mock_chat_openai):
+        """Test that the API key is part of the registry key."""
+        first = LLMClient(provider="openai", api_key="key-a")
+        second = LLMClient(provider="openai", api_key="key-b")
+        
+        first.llm
+        second.llm
+        
+        assert mock_chat_openai.call_count == 2
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_client_without_shared_pool(self, mock_chat_openai):
+        """Test shared_pool=False builds a private model without the shared HTTP client."""
+        first = LLMClient(provider="openai", shared_pool=False)
+        second = LLMClient(provider="openai", shared_pool=False)
+        
+        assert first.llm is not None
+        second.llm
+        assert mock_chat_openai.call_count == 2
+        assert 'http_client' not in mock_chat_openai.call_args[1]
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_client_prewarm(self, mock_chat_openai):
+        """Test LLMClient.prewarm builds the model and warms the API connection."""
+        client = LLMClient(provider="openai")
+        
+        with patch.object(get_registry(), 'prewarm', return_value={"https://api.openai.com/v1": True}) as mock_prewarm:
+            with patch.dict(os.environ, {'OPENAI_BASE_URL': ''}):
+                assert client.prewarm(timeout=2.0) is True
+        
+        mock_chat_openai.assert_called_once()
+        mock_prewarm.assert_called_once_with(["https://api.openai.com/v1"], timeout=2.0)
+    
+    def test_async_http_client_survives_successive_event_loops(self):
+        """Test the shared async client works in a second asyncio.run() after its first loop closed."""
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+            
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        registry = ClientRegistry()
+        
+        async def get():
+            response = await registry.async_http_client.get(url)
+            return response.text, registry.async_http_client.for_running_loop()
+        
+        try:
+            first_text, first_client = asyncio.run(get())
+            second_text, second_client = asyncio.run(get())
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        assert first_text == second_text == "ok"
+        assert first_client is not second_client
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_configure_rebinds_existing_llm_clients(self, mock_chat_openai):
+        """Test existing LLMClients switch to a new model after configure, without closing the old pool."""
+        mock_chat_openai.side_effect = lambda **kwargs: MagicMock()
+        client = LLMClient(provider="openai", model_name="rebind-test")
+        old_model = client.llm
+        old_http_client = get_registry().http_client
+        
+        get_registry().configure(max_connections=5)
+        try:
+            new_model = client.llm
+            
+            assert new_model is not old_model
+            assert client.llm is new_model
+            assert mock_chat_openai.call_args[1]['http_client'] is get_registry().http_client
+            assert not old_http_client.is_closed
+        finally:
+            get_registry().configure(max_connections=100)
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    def test_configure_keeps_assigned_llm(self):
+        """Test a model assigned to LLMClient.llm is not replaced when the registry is cleared."""
+        client = LLMClient(provider="openai")
+        model = MagicMock()
+        client.llm = model
+        
+        get_registry().clear()
+        
+        assert client.llm is model
@@ -0,0 +1,188 @@
+"""
+Unit tests for the CLI daemon and its thin client.
+"""
+
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import main
+from daemon import PROTOCOL_VERSION, ImproverDaemon, forward, ping
+from tests.test_startup import imported_modules
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+PLAIN_TERMINAL = {"isatty": False, "width": 100, "env": {}}
+
+
+def render_in_process(*argv, width=100):
+    """Run CLI arguments in this process and return the plain-text output."""
+    output = io.StringIO()
+    console = Console(file=output, force_terminal=False, color_system=None, width=width)
+    args = main.build_parser().parse_args(list(argv))
+    exit_code = main.execute(args, main.make_improver(args), console)
+    return exit_code, output.getvalue()
+
+
+@pytest.fixture
+def daemon():
+    """A daemon serving on a short temporary socket path in a background thread."""
+    # Unix socket paths are limited to about 100 bytes, so avoid pytest's tmp_path
+    directory = tempfile.mkdtemp(prefix="pi-", dir="/tmp")
+    daemon = ImproverDaemon(os.path.join(directory, "d.sock"))
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while ping(daemon.socket_path) is None:
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    yield daemon
+    daemon.shutdown()
+    thread.join(timeout=5)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+class TestImproverDaemon:
+    """Tests for ImproverDaemon requests, the forwarding client and the CLI fallback."""
+    
+    def test_run_matches_in_process_output(self):
+        """Test a run request renders exactly what the CLI prints in-process."""
+        argv = ["Explain recursion", "--strategy", "role", "--role", "teacher", "--offline"]
+        response = ImproverDaemon("unused.sock").handle_request(
+            {"version": PROTOCOL_VERSION, "command": "run", "argv": argv, "terminal": PLAIN_TERMINAL}
+        )
+        
+        assert (response["exit_code"], response["output"]) == render_in_process(*argv)
+        assert "You are teacher." in response["output"]
+    
+    def test_run_list_strategies(self):
+        """Test a run request can list the strategies."""
+        response = ImproverDaemon("unused.sock").handle_request(
+            {"version": PROTOCOL_VERSION, "command": "run", "argv": ["--list-strategies"], "terminal": PLAIN_TERMINAL}
+        )
+        
+        assert response["exit_code"] == 0
+        assert "  - cot                  : Chain of Thought\n" in response["output"]
+    
+    def test_run_reports_errors_as_output(self):
+        """Test CLI errors come back as output with exit code 1."""
+        argv = ["Explain recursion", "--strategy", "nope", "--offline"]
+        response = ImproverDaemon("unused.sock").handle_request(
+            {"version": PROTOCOL_VERSION, "command": "run", "argv": argv, "terminal": PLAIN_TERMINAL}
+        )
+        
+        assert response["exit_code"] == 1
+        assert "Error:" in response["output"]
+    
+    def test_improvers_are_cached_per_provider_options(self):
+        """Test requests with the same provider options share one improver."""
+        daemon = ImproverDaemon("unused.sock")
+        parser = main.build_parser()
+        
+        offline = daemon._get_improver(parser.parse_args(["p", "-s", "cot", "--offline"]))
+        listing = daemon._get_improver(parser.parse_args(["--list-strategies"]))
+        
+        assert offline is listing
+        assert offline.offline
+    
+    def test_colors_follow_client_terminal(self):
+        """Test output is colored for a client terminal and plain when NO_COLOR is set."""
+        argv = ["Explain recursion", "--strategy", "cot", "--offline"]
+        daemon = ImproverDaemon("unused.sock")
+        tty = {"isatty": True, "width": 80, "env": {"TERM": "xterm-256color"}}
+        
+        colored = daemon.handle_request({"version": PROTOCOL_VERSION, "argv": argv, "terminal": tty})
+        no_color = daemon.handle_request(
+            {"version": PROTOCOL_VERSION, "argv": argv, "terminal": {**tty, "env": {"NO_COLOR": "1"}}}
+        )
+        
+        assert "\x1b[" in colored["output"]
+        assert "\x1b[38" not in no_color["output"]
+    
+    def test_version_mismatch_is_not_executed(self):
+        """Test a request with another protocol version gets an error and is not run."""
+        response = ImproverDaemon("unused.sock").handle_request(
+            {"version": PROTOCOL_VERSION + 1, "command": "run", "argv": ["--list-strategies"]}
+        )
+        
+        assert "error" in response
+        assert "exit_code" not in response
+    
+    def test_forward_without_daemon_returns_none(self):
+        """Test forward returns None when no daemon is listening."""
+        assert forward(["--list-strategies"], socket_path="/tmp/no-such-daemon.sock") is None
+    
+    def test_forward_and_ping(self, daemon):
+        """Test forward and ping reach a running daemon."""
+        argv = ["Explain recursion", "--strategy", "cot", "--offline"]
+        
+        status = ping(daemon.socket_path)
+        response = forward(argv, socket_path=daemon.socket_path)
+        
+        assert status["pid"] == os.getpid()
+        assert response["exit_code"] == 0
+        assert "step by step" in response["output"].lower()
+        assert ping(daemon.socket_path)["requests"] == 1
+    
+    def test_socket_is_private(self, daemon):
+        """Test the daemon socket is accessible to its owner only."""
+        assert os.stat(daemon.socket_path).st_mode & 0o077 == 0
+    
+    def test_cli_forwards_without_heavy_imports(self, daemon):
+        """Test the CLI prints the daemon's output without importing the improver stack."""
+        argv = ["main.py", "Explain recursion", "--strategy", "cot", "--offline"]
+        env = dict(os.environ, PROMPT_IMPROVER_SOCKET=daemon.socket_path, COLUMNS="100")
+        
+        forwarded = subprocess.run([sys.executable, *argv], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+        local = subprocess.run(
+            [sys.executable, *argv, "--no-daemon"], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True
+        )
+        
+        assert forwarded.returncode == local.returncode == 0
+        assert forwarded.stdout == local.stdout
+        assert ping(daemon.socket_path)["requests"] == 1
+        
+        modules = imported_modules(*argv, daemon_socket=daemon.socket_path)
+        assert not modules.intersection({"improver", "rich", "langchain_core"})
+    
+    def test_shutdown_command_stops_daemon(self, daemon):
+        """Test the shutdown command stops the daemon and removes its socket."""
+        from daemon import _send
+        
+        _send({"version": PROTOCOL_VERSION, "command": "shutdown"}, daemon.socket_path, 0.5)
+        
+        deadline = time.monotonic() + 5
+        while os.path.exists(daemon.socket_path):
+            assert time.monotonic() < deadline, "daemon did not stop"
+            time.sleep(0.01)
+        assert forward(["--list-strategies"], socket_path=daemon.socket_path) is None
+    
+    def test_socket_of_another_user_is_ignored(self, daemon, monkeypatch, capsys):
+        """Test prompts are never sent to a socket owned by, or a daemon running as, another user."""
+        real_uid = os.getuid()
+        monkeypatch.setattr(os, "getuid", lambda: real_uid + 1)
+        
+        assert forward(["Explain recursion", "-s", "cot", "--offline"], socket_path=daemon.socket_path) is None
+        assert "not owned by you" in capsys.readouterr().err
+        
+        monkeypatch.setattr(os, "getuid", lambda: real_uid)
+        assert ping(daemon.socket_path)["requests"] == 0
+    
+    def test_non_socket_path_is_ignored(self, tmp_path):
+        """Test a regular file at the socket path is never used."""
+        path = tmp_path / "fake.sock"
+        path.write_text("not a socket")
+        
+        assert forward(["--list-strategies"], socket_path=str(path)) is None
@@ -0,0 +1,140 @@
+"""
+Unit tests for the indexed few-shot example bank.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+np = pytest.importorskip("numpy")
+
+from example_bank import ExampleBank, tokenize
+from strategies import FewShotStrategy
+
+EXAMPLES = [
+    {"input": "Sort a list of numbers in Python", "output": "Use sorted(numbers)."},
+    {"input": "Reverse a string in Python", "output": "Use text[::-1]."},
+    {"input": "Translate hello to French", "output": "Bonjour."},
+    {"input": "Translate goodbye to Spanish", "output": "Adiós."},
+    {"input": "Write a haiku about the sea", "output": "Waves fold into foam..."},
+]
+
+
+class TestExampleBank:
+    """Tests for ExampleBank."""
+    
+    @pytest.fixture
+    def bank(self):
+        """A bank built from EXAMPLES."""
+        return ExampleBank.build(EXAMPLES)
+    
+    def test_tokenize(self):
+        """Test tokenize lowercases text and splits it into word tokens."""
+        assert tokenize("Hello, World! it's 2x") == ["hello", "world", "it", "s", "2x"]
+    
+    def test_build_from_generator(self):
+        """Test a bank can be built from a one-shot iterator and keeps example order."""
+        bank = ExampleBank.build(iter(EXAMPLES))
+        assert len(bank) == len(EXAMPLES)
+        assert [bank.get(i) for i in range(len(bank))] == EXAMPLES
+    
+    def test_get_out_of_range(self, bank):
+        """Test get raises IndexError past the last example."""
+        with pytest.raises(IndexError):
+            bank.get(len(EXAMPLES))
+    
+    def test_search_ranks_by_similarity(self, bank):
+        """Test search ranks examples by BM25 similarity to the query."""
+        assert bank.search("Translate thanks to French", k=1) == [EXAMPLES[2]]
+        assert bank.search_indices("translate into Spanish please", k=2) == [3, 2]
+        assert bank.search_indices("python string tricks", k=2) == [1, 0]
+    
+    def test_search_fills_with_first_examples(self, bank):
+        """Test results are filled with the first examples when too few match."""
+        assert bank.search_indices("haiku", k=3) == [4, 0, 1]
+        assert bank.search_indices("no overlap whatsoever", k=2) == [0, 1]
+    
+    def test_ties_at_top_k_boundary_go_to_earlier_examples(self):
+        """Test equally scored examples are returned in bank order, also where the top k cuts them."""
+        bank = ExampleBank.build([{"input": "same words", "output": str(i)} for i in range(500)])
+        assert bank.search_indices("same words", k=5) == [0, 1, 2, 3, 4]
+    
+    def test_search_k_bounds(self, bank):
+        """Test k of 0 returns nothing and k past the bank size returns every example."""
+        assert bank.search_indices("python", k=0) == []
+        assert sorted(bank.search_indices("python", k=50)) == list(range(len(EXAMPLES)))
+    
+    def test_dense_and_sparse_scoring_agree(self):
+        """Test the dense and sparse scoring paths both rank the matching examples first."""
+        examples = [{"input": f"common word{i % 7} item{i}", "output": str(i)} for i in range(200)]
+        bank = ExampleBank.build(examples)
+        # "common" hits every example (dense path), "item5" only one (sparse path)
+        assert bank.search_indices("common word3", k=3)[0] % 7 == 3
+        assert bank.search_indices("item5", k=1) == [5]
+    
+    def test_empty_bank(self):
+        """Test an empty bank builds and returns no results."""
+        bank = ExampleBank.build([])
+        assert len(bank) == 0
+        assert bank.search("anything") == []
+    
+    def test_unicode_round_trip(self):
+        """Test non-ASCII examples are stored and found intact."""
+        bank = ExampleBank.build([{"input": "日本語の質問", "output": "答え ✓"}])
+        assert bank.search("日本語の質問") == [{"input": "日本語の質問", "output": "答え ✓"}]
+    
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_save_and_load(self, bank, tmp_path, mmap):
+        """Test a saved bank loads, optionally memory-mapped, and answers queries identically."""
+        bank.save(str(tmp_path / "bank"))
+        loaded = ExampleBank.load(str(tmp_path / "bank"), mmap=mmap)
+        assert isinstance(loaded.postings_doc, np.memmap) == mmap
+        assert len(loaded) == len(bank)
+        for query in ["translate to French", "python", "sea haiku", "nothing"]:
+            assert loaded.search(query, k=3) == bank.search(query, k=3)
+    
+    def test_load_rejects_other_versions(self, bank, tmp_path):
+        """Test loading a bank saved in another format version raises ValueError."""
+        bank.save(str(tmp_path / "bank"))
+        (tmp_path / "bank" / "meta.json").write_text('{"version": 99}')
+        with pytest.raises(ValueError, match="Unsupported"):
+            ExampleBank.load(str(tmp_path / "bank"))
+    
+    def test_from_jsonl(self, tmp_path):
+        """Test from_jsonl builds a bank from a JSONL file, skipping blank lines."""
+        import json
+        path = tmp_path / "examples.jsonl"
+        path.write_text("\n".join(json.dumps(e) for e in EXAMPLES) + "\n\n", encoding="utf-8")
+        bank = ExampleBank.from_jsonl(str(path))
+        assert [bank.get(i) for i in range(len(bank))] == EXAMPLES
+    
+    def test_few_shot_uses_bank(self, bank):
+        """Test FewShotStrategy picks its examples from the bank by similarity to the prompt."""
+        strategy = FewShotStrategy(example_bank=bank)
+        prompt = "Translate cheese to French"
+        expected = FewShotStrategy(examples=bank.search(prompt, 2)).improve(prompt)
+        assert strategy.improve(prompt) == expected
+        assert "Bonjour." in expected
+    
+    def test_few_shot_bank_per_call(self, bank):
+        """Test a bank passed per call overrides the instance examples."""
+        strategy = FewShotStrategy(examples=[{"input": "a", "output": "b"}])
+        improved = strategy.improve("Reverse a list in Python", example_bank=bank, num_examples=1)
+        assert "text[::-1]" in improved
+        assert "Input: a" not in improved
+    
+    def test_few_shot_explicit_examples_override_bank(self, bank):
+        """Test explicit examples passed per call take precedence over the bank."""
+        strategy = FewShotStrategy(example_bank=bank)
+        improved = strategy.improve("Translate", examples=[{"input": "x", "output": "y"}])
+        assert "Input: x\nOutput: y" in improved
+        assert "Bonjour." not in improved
+    
+    def test_few_shot_bank_sections_not_compilable(self, bank):
+        """Test a bank-backed FewShotStrategy cannot be compiled into a pipeline."""
+        strategy = FewShotStrategy(example_bank=bank)
+        with pytest.raises(ValueError, match="example bank"):
+            strategy.get_sections()
@@ -4,8 +4,9 @@ Unit tests for FewShotStrategy class.
 
 import sys
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 import pytest
+from langchain_core.prompts import FewShotPromptTemplate, PromptTemplate
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -13,6 +14,21 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from strategies.few_shot import FewShotStrategy
 
 
+def reference_format(prompt, examples, num_examples=2):
+    """Render with FewShotPromptTemplate, as FewShotStrategy originally did."""
+    example_prompt = PromptTemplate(
+        input_variables=["input", "output"],
+        template="Input: {input}\nOutput: {output}"
+    )
+    return FewShotPromptTemplate(
+        examples=examples[:num_examples],
+        example_prompt=example_prompt,
+        prefix="Here are some examples:\n",
+        suffix="\nNow, following the pattern above:\n{prompt}",
+        input_variables=["prompt"]
+    ).format(prompt=prompt)
+
+
 class TestFewShotStrategy:
     """Tests for FewShotStrategy class."""
     
@@ -116,4 +132,87 @@ class TestFewShotStrategy:
         result = strategy.improve(original_prompt)
         
         assert original_prompt in result
-
+    
+    @pytest.mark.parametrize('examples', [
+        [{"input": f"Input {i}", "output": f"Output {i}"} for i in range(20)],
+        [{"input": "Escaped {{braces}}", "output": "}}"}, {"input": 7, "output": 2.5, "extra": "x"}],
+        [{"input": "Refers to {prompt}", "output": "ok"}],
+    ])
+    def test_cached_formatter_matches_few_shot_prompt_template(self, examples):
+        """Test the cached formatter is byte-identical to FewShotPromptTemplate."""
+        strategy = FewShotStrategy(examples=examples)
+        
+        for num_examples in (0, 1, 2, 20):
+            for prompt in ("Classify this", "", "Prompt with {braces}\n\nand lines"):
+                expected = reference_format(prompt, examples, num_examples)
+                assert strategy.improve(prompt, num_examples=num_examples) == expected
+                assert FewShotStrategy().improve(prompt, examples=examples, num_examples=num_examples) == expected
+    
+    def test_example_block_rendered_once(self):
+        """Test instance examples are pre-rendered once per num_examples."""
+        strategy = FewShotStrategy(examples=[{"input": "a", "output": "b"}, {"input": "c", "output": "d"}])
+        
+        with patch.object(FewShotStrategy, '_render_parts', wraps=FewShotStrategy._render_parts) as render:
+            for i in range(5):
+                strategy.improve(f"Prompt {i}")
+            strategy.improve("Prompt", num_examples=1)
+            strategy.improve("Prompt", num_examples=1)
+        
+        assert render.call_count == 2
+    
+    def test_cache_invalidated_when_examples_change(self):
+        """Test assigning new examples (or clear_cache after in-place edits) re-renders."""
+        strategy = FewShotStrategy(examples=[{"input": "Old", "output": "x"}])
+        assert "Input: Old" in strategy.improve("Test")
+        
+        strategy.examples = [{"input": "New", "output": "y"}]
+        result = strategy.improve("Test")
+        assert "Input: New" in result
+        assert "Input: Old" not in result
+        
+        strategy.examples.append({"input": "Appended", "output": "z"})
+        strategy.clear_cache()
+        assert "Input: Appended" in strategy.improve("Test")
+    
+    def test_in_place_edits_are_picked_up(self):
+        """Test appending to or editing the instance examples in place is never served stale."""
+        strategy = FewShotStrategy(examples=[{"input": "Old", "output": "x"}])
+        assert "Input: Old" in strategy.improve("Test")
+        
+        strategy.examples.append({"input": "Appended", "output": "z"})
+        assert "Input: Appended" in strategy.improve("Test")
+        
+        strategy.examples[0]["input"] = "Edited"
+        result = strategy.improve("Test")
+        assert "Input: Edited" in result
+        assert "Input: Old" not in result
+    
+    def test_per_call_examples_are_cached(self):
+        """Test examples passed per call are rendered once per example set and num_examples."""
+        strategy = FewShotStrategy()
+        examples = [{"input": "a", "output": "b"}, {"input": "c", "output": "d"}]
+        
+        with patch.object(FewShotStrategy, '_render_parts', wraps=FewShotStrategy._render_parts) as render:
+            for i in range(5):
+                strategy.improve(f"Prompt {i}", examples=[dict(e) for e in examples])
+            strategy.improve("Prompt", examples=examples, num_examples=1)
+            strategy.improve("Prompt", examples=[{"input": "e", "output": "f"}])
+        
+        assert render.call_count == 3
+    
+    def test_unhashable_example_values_render_uncached(self):
+        """Test examples with unhashable values still render."""
+        strategy = FewShotStrategy()
+        
+        result = strategy.improve("Test", examples=[{"input": ["a", "b"], "output": "x"}])
+        
+        assert "Input: ['a', 'b']" in result
+    
+    def test_invalid_examples_raise_like_before(self):
+        """Test malformed examples still raise KeyError."""
+        strategy = FewShotStrategy()
+        
+        with pytest.raises(KeyError):
+            strategy.improve("Test", examples=[{"input": "missing output"}])
+        with pytest.raises(KeyError):
+            strategy.improve("Test", examples=[{"input": "{unknown}", "output": "x"}])
@@ -0,0 +1,225 @@
+"""
+Unit tests for hedged requests.
+"""
+
+import asyncio
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, AsyncMock, patch
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from hedging import HedgePolicy, LatencyTracker
+from llm_client import LLMClient
+
+
+def warmed_policy(latency=0.01, **kwargs):
+    """Build a policy that has already learned a fast typical latency."""
+    policy = HedgePolicy(min_samples=5, min_delay=0.0, **kwargs)
+    for _ in range(5):
+        policy.latencies.record(latency)
+    return policy
+
+
+class TestHedging:
+    """Tests for LatencyTracker and HedgePolicy."""
+    
+    def test_latency_tracker_percentile(self):
+        """Test percentile over a sliding window."""
+        tracker = LatencyTracker(window=100)
+        assert tracker.percentile(0.95) is None
+        
+        for ms in range(1, 101):
+            tracker.record(ms / 1000)
+        
+        assert tracker.percentile(0.5) == pytest.approx(0.050, abs=0.002)
+        assert tracker.percentile(0.95) == pytest.approx(0.095, abs=0.002)
+        assert tracker.percentile(1.0) == pytest.approx(0.100)
+    
+    def test_no_hedging_while_learning(self):
+        """Test calls run directly until min_samples latencies are known."""
+        policy = HedgePolicy(min_samples=3)
+        backup = MagicMock()
+        
+        for _ in range(3):
+            assert policy.run(lambda: "primary", backup) == "primary"
+        
+        backup.assert_not_called()
+        assert policy.delay() is not None
+        assert policy.get_stats()['hedges_fired'] == 0
+    
+    def test_fast_primary_does_not_hedge(self):
+        """Test a primary answering within the delay never fires a hedge."""
+        policy = warmed_policy(latency=0.5)
+        backup = MagicMock()
+        
+        assert policy.run(lambda: "primary", backup) == "primary"
+        
+        backup.assert_not_called()
+        assert policy.get_stats()['hedges_fired'] == 0
+    
+    def test_hedges_still_fire_when_many_primaries_stall(self):
+        """Test stalled primaries neither delay callers nor queue the backups behind them."""
+        policy = warmed_policy(latency=0.05, max_workers=48)
+        release = threading.Event()
+        
+        def stalled():
+            release.wait(5)
+            return "primary"
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=48) as callers:
+            results = list(callers.map(lambda _: policy.run(stalled, lambda: "backup"), range(48)))
+        elapsed = time.perf_counter() - start
+        release.set()
+        
+        assert results == ["backup"] * 48
+        assert elapsed < 2
+        assert policy.get_stats()['hedges_won'] == 48
+    
+    def test_no_hedge_while_backup_limit_is_reached(self):
+        """Test no hedge fires while max_workers backups are still running."""
+        policy = warmed_policy(latency=0.05, max_workers=1)
+        release = threading.Event()
+        
+        def stalled():
+            release.wait(5)
+            return "stalled"
+        
+        def slow():
+            time.sleep(0.2)
+            return "primary"
+        
+        busy = threading.Thread(target=policy.run, args=(stalled, stalled))
+        busy.start()
+        deadline = time.monotonic() + 5
+        while policy.get_stats()['hedges_fired'] == 0:
+            assert time.monotonic() < deadline, "hedge did not fire"
+            time.sleep(0.01)
+        
+        assert policy.run(slow, lambda: "backup") == "primary"
+        assert policy.get_stats()['hedges_fired'] == 1
+        release.set()
+        busy.join()
+    
+    def test_fallback_latencies_are_not_learned(self):
+        """Test a fallback client's response times do not feed the primary's percentile."""
+        policy = warmed_policy(fallback=MagicMock())
+        
+        def slow_fail():
+            time.sleep(0.05)
+            raise RuntimeError("primary failed")
+        
+        async def aslow_fail():
+            await asyncio.sleep(0.05)
+            raise RuntimeError("primary failed")
+        
+        async def afallback():
+            return "fallback"
+        
+        assert policy.run(slow_fail, lambda: "fallback") == "fallback"
+        assert asyncio.run(policy.arun(aslow_fail, afallback)) == "fallback"
+        assert len(policy.latencies) == 5
+    
+    def test_slow_primary_is_hedged_and_backup_wins(self):
+        """Test a stalled primary fires a hedge whose answer is returned."""
+        policy = warmed_policy()
+        
+        def slow():
+            time.sleep(0.5)
+            return "primary"
+        
+        start = time.perf_counter()
+        assert policy.run(slow, lambda: "backup") == "backup"
+        assert time.perf_counter() - start < 0.4
+        
+        stats = policy.get_stats()
+        assert stats['hedges_fired'] == 1
+        assert stats['hedges_won'] == 1
+        assert stats['win_rate'] == 1.0
+    
+    def test_failed_backup_falls_back_to_primary(self):
+        """Test the primary still answers if the hedge fails."""
+        policy = warmed_policy()
+        
+        def slow():
+            time.sleep(0.1)
+            return "primary"
+        
+        def broken():
+            raise RuntimeError("backup down")
+        
+        assert policy.run(slow, broken) == "primary"
+        assert policy.get_stats()['hedges_won'] == 0
+    
+    def test_all_attempts_fail_raises_primary_error(self):
+        """Test the primary's error is raised when both attempts fail."""
+        policy = warmed_policy()
+        
+        def slow_fail():
+            time.sleep(0.05)
+            raise ValueError("primary failed")
+        
+        def fail():
+            raise RuntimeError("backup failed")
+        
+        with pytest.raises(ValueError, match="primary failed"):
+            policy.run(slow_fail, fail)
+    
+    def test_async_hedge_cancels_loser(self):
+        """Test the async path returns the winner and cancels the slow request."""
+        policy = warmed_policy()
+        cancelled = []
+        
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return "primary"
+        
+        async def fast():
+            return "backup"
+        
+        assert asyncio.run(policy.arun(slow, fast)) == "backup"
+        assert cancelled == [True]
+        assert policy.get_stats()['hedges_won'] == 1
+    
+    def test_max_delay_caps_learned_percentile(self):
+        """Test max_delay bounds the hedge delay."""
+        policy = warmed_policy(latency=10.0, max_delay=0.2)
+        
+        assert policy.delay() == 0.2
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_client_hedges_to_fallback(self, mock_chat_openai):
+        """Test LLMClient sends the duplicate request to the fallback client."""
+        fallback = MagicMock()
+        fallback.invoke.return_value = "from fallback"
+        fallback.ainvoke = AsyncMock(return_value="async from fallback")
+        client = LLMClient(provider="openai", hedge=warmed_policy(fallback=fallback))
+        
+        slow_chain = MagicMock()
+        slow_chain.invoke.side_effect = lambda kwargs: time.sleep(0.5) or "primary"
+        
+        async def slow_ainvoke(kwargs):
+            await asyncio.sleep(5)
+            return "primary"
+        
+        slow_chain.ainvoke.side_effect = slow_ainvoke
+        
+        with patch.object(client, '_get_chain', return_value=slow_chain):
+            assert client.invoke("Say {word}", word="hi") == "from fallback"
+            assert asyncio.run(client.ainvoke("Say {word}", word="hi")) == "async from fallback"
+        
+        fallback.invoke.assert_called_once_with("Say {word}", word="hi")
+        fallback.ainvoke.assert_awaited_once_with("Say {word}", word="hi")
+        assert client.hedge.get_stats()['hedges_won'] == 2
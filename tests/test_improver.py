@@ -2,7 +2,10 @@
 Unit tests for PromptImprover class.
 """
 
+import asyncio
 import sys
+import threading
+import time
 from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch
 import pytest
@@ -12,6 +15,17 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from improver import PromptImprover
 from llm_client import LLMClient
+from strategies import BaseStrategy, StrategyRegistry
+
+
+class ShoutStrategy(BaseStrategy):
+    """Strategy registered at runtime, for worker process tests."""
+    
+    def improve(self, prompt, **kwargs):
+        return prompt.upper() + "!"
+    
+    def get_strategy_name(self):
+        return "Shout"
 
 
 class TestPromptImprover:
@@ -234,3 +248,270 @@ class TestPromptImprover:
                 assert hasattr(improver.strategies[strategy], 'improve')
                 assert hasattr(improver.strategies[strategy], 'get_strategy_name')
 
+    
+    def test_aimprove_matches_improve(self):
+        """Test that aimprove returns the same result as improve."""
+        with patch('improver.LLMClient'):
+            improver = PromptImprover()
+            
+            sync_result = improver.improve("Solve 2 + 2", strategy='cot')
+            async_result = asyncio.run(improver.aimprove("Solve 2 + 2", strategy='cot'))
+            
+            assert async_result == sync_result
+    
+    def test_aimprove_many_concurrently(self):
+        """Test that many aimprove calls can run on one event loop."""
+        with patch('improver.LLMClient'):
+            improver = PromptImprover()
+            
+            async def run_all():
+                return await asyncio.gather(*(
+                    improver.aimprove(f"Prompt {i}", strategy='role') for i in range(50)
+                ))
+            
+            results = asyncio.run(run_all())
+            
+            assert len(results) == 50
+            assert "Prompt 7" in results[7]
+    
+    def test_aimprove_with_invalid_strategy(self):
+        """Test aimprove with invalid strategy."""
+        with patch('improver.LLMClient'):
+            improver = PromptImprover()
+            
+            with pytest.raises(ValueError, match="Unknown strategy"):
+                asyncio.run(improver.aimprove("Test prompt", strategy='invalid-strategy'))
+    
+    def test_improve_stream_matches_improve(self):
+        """Test that the streamed chunks join to the improve() result."""
+        with patch('improver.LLMClient'):
+            improver = PromptImprover()
+            
+            chunks = list(improver.improve_stream("Design a system", strategy='tot', num_branches=4))
+            
+            assert "".join(chunks) == improver.improve("Design a system", strategy='tot', num_branches=4)
+    
+    def test_improve_stream_with_invalid_strategy(self):
+        """Test that improve_stream rejects unknown strategies before streaming."""
+        with patch('improver.LLMClient'):
+            improver = PromptImprover()
+            
+            with pytest.raises(ValueError, match="Unknown strategy"):
+                improver.improve_stream("Test prompt", strategy='invalid-strategy')
+    
+    def test_aimprove_stream(self):
+        """Test async streaming of an improved prompt."""
+        with patch('improver.LLMClient'):
+            improver = PromptImprover()
+            
+            async def collect():
+                return [chunk async for chunk in improver.aimprove_stream("Solve 2 + 2", strategy='cot')]
+            
+            chunks = asyncio.run(collect())
+            
+            assert "".join(chunks) == improver.improve("Solve 2 + 2", strategy='cot')
+    
+    def test_offline_mode_creates_no_client(self):
+        """Test offline mode never constructs an LLMClient and still improves prompts."""
+        with patch('improver.LLMClient') as mock_llm_client_class, \
+                patch('llm_client.LLMClient') as mock_strategy_client_class:
+            improver = PromptImprover(offline=True)
+            
+            assert improver.llm_client is None
+            assert all(s.offline for s in improver.strategies.values())
+            for strategy in improver.get_available_strategies():
+                assert "Explain recursion" in improver.improve("Explain recursion", strategy=strategy)
+            mock_llm_client_class.assert_not_called()
+            mock_strategy_client_class.assert_not_called()
+    
+    def test_offline_mode_matches_online_output(self):
+        """Test offline mode renders exactly the same prompts as online mode."""
+        with patch('improver.LLMClient'):
+            online = PromptImprover()
+        offline = PromptImprover(offline=True)
+        
+        for strategy in online.get_available_strategies():
+            assert offline.improve("Plan a trip", strategy=strategy) == online.improve("Plan a trip", strategy=strategy)
+    
+    def test_offline_mode_rejects_llm_client(self):
+        """Test offline and an explicit llm_client are mutually exclusive."""
+        with pytest.raises(ValueError, match="offline"):
+            PromptImprover(llm_client=Mock(spec=LLMClient), offline=True)
+    
+    def test_improve_many_threads_keeps_order(self):
+        """Test improve_many returns results in input order."""
+        improver = PromptImprover(offline=True)
+        prompts = [f"Prompt {i}" for i in range(40)]
+        
+        results = improver.improve_many(prompts, strategy='tot', workers=8, num_branches=4)
+        
+        assert results == [improver.improve(p, strategy='tot', num_branches=4) for p in prompts]
+    
+    def test_improve_many_captures_item_exceptions(self):
+        """Test a failing item holds its exception and does not abort the batch."""
+        improver = PromptImprover(offline=True)
+        strategy = improver.strategies['role']
+        original = strategy.improve
+        
+        def flaky(prompt, **kwargs):
+            if prompt == "bad":
+                raise RuntimeError("boom")
+            return original(prompt, **kwargs)
+        
+        with patch.object(strategy, 'improve', side_effect=flaky):
+            results = improver.improve_many(["good", "bad", "also good"], strategy='role')
+        
+        assert "good" in results[0]
+        assert isinstance(results[1], RuntimeError)
+        assert "also good" in results[2]
+    
+    def test_improve_many_processes_match_sequential(self):
+        """Test the process pool renders the same prompts, in order, across chunks."""
+        improver = PromptImprover(offline=True)
+        prompts = [f"Prompt {i}" for i in range(25)]
+        
+        results = improver.improve_many(prompts, strategy='sot', workers=2, executor='process', chunksize=4)
+        
+        assert results == [improver.improve(p, strategy='sot') for p in prompts]
+    
+    def test_improve_many_processes_capture_exceptions(self):
+        """Test per-item exceptions are returned from worker processes."""
+        improver = PromptImprover(offline=True)
+        
+        results = improver.improve_many(
+            ["a", "b"], strategy='few-shot', workers=1, executor='process', examples=[{'input': 'x'}]
+        )
+        
+        assert len(results) == 2
+        assert all(isinstance(r, Exception) for r in results)
+    
+    def test_improve_many_processes_use_configured_strategy(self):
+        """Test worker processes render with the caller's strategy configuration and registry."""
+        registry = StrategyRegistry(entry_point_group=None)
+        registry.register('shout', ShoutStrategy)
+        improver = PromptImprover(offline=True, registry=registry)
+        improver.strategies['few-shot'].examples = [{'input': 'Q', 'output': 'A'}]
+        improver.strategies['role'].role = "a ship captain"
+        prompts = [f"Prompt {i}" for i in range(6)]
+        
+        outputs = {}
+        for strategy in ('few-shot', 'role', 'shout'):
+            threaded = improver.improve_many(prompts, strategy=strategy, executor='thread')
+            processed = improver.improve_many(prompts, strategy=strategy, workers=2, executor='process', chunksize=2)
+            assert processed == threaded
+            outputs[strategy] = processed[0]
+        
+        assert "Output: A" in outputs['few-shot']
+        assert "a ship captain" in outputs['role']
+        assert outputs['shout'] == "PROMPT 0!"
+    
+    def test_improve_many_processes_reject_unpicklable_strategy(self):
+        """Test a strategy that cannot be copied to workers is rejected up front."""
+        improver = PromptImprover(offline=True)
+        improver.strategies['role'].role = lambda: "not picklable"
+        
+        with pytest.raises(ValueError, match="executor='thread'"):
+            improver.improve_many(["a"], strategy='role', executor='process')
+    
+    def test_improve_many_validates_arguments(self):
+        """Test unknown strategies and executors are rejected up front."""
+        improver = PromptImprover(offline=True)
+        
+        assert improver.improve_many([], strategy='cot') == []
+        with pytest.raises(ValueError, match="Unknown strategy"):
+            improver.improve_many(["a"], strategy='invalid-strategy')
+        with pytest.raises(ValueError, match="Unknown executor"):
+            improver.improve_many(["a"], strategy='cot', executor='fiber')
+    
+    def test_improve_all_dedupes_aliases(self):
+        """Test improve_all runs each canonical strategy once."""
+        improver = PromptImprover(offline=True)
+        
+        results = improver.improve_all("Explain recursion")
+        
+        assert sorted(results) == sorted(['role', 'few-shot', 'cot', 'self-consistency', 'tot', 'sot', 'react'])
+        for key, improved in results.items():
+            assert improved == improver.improve("Explain recursion", strategy=key)
+    
+    def test_improve_all_shared_and_per_strategy_kwargs(self):
+        """Test shared kwargs reach every strategy and per_strategy kwargs only their strategy."""
+        improver = PromptImprover(offline=True)
+        
+        results = improver.improve_all(
+            "Plan a trip",
+            num_branches=7,
+            per_strategy={
+                'role': {'role': 'a travel agent'},
+                'skeleton-of-thought': {'num_points': 2},
+                'few-shot': {'examples': [{'input': 'a', 'output': 'b'}]},
+            }
+        )
+        
+        assert "at least 7 different" in results['tot']
+        assert results['role'].startswith("You are a travel agent.")
+        assert "Create 2 concise bullet points" in results['sot']
+        assert "Input: a\nOutput: b" in results['few-shot']
+    
+    def test_improve_all_in_completion_order(self):
+        """Test results are returned as strategies complete, with failures captured."""
+        improver = PromptImprover(offline=True)
+        slow = improver.strategies['cot']
+        failing = improver.strategies['react']
+        
+        def slow_improve(prompt, **kwargs):
+            time.sleep(0.2)
+            return "slow"
+        
+        with patch.object(slow, 'improve', side_effect=slow_improve), \
+                patch.object(failing, 'improve', side_effect=RuntimeError("boom")):
+            results = improver.improve_all("Test prompt")
+        
+        assert list(results)[-1] == 'cot'
+        assert results['cot'] == "slow"
+        assert isinstance(results['react'], RuntimeError)
+    
+    def test_dict_kwargs_are_shared_not_per_strategy(self):
+        """Test a shared kwarg named like a strategy (e.g. role) or holding a dict reaches every strategy."""
+        improver = PromptImprover(offline=True)
+        
+        results = improver.improve_all("Plan a trip", role="a travel agent")
+        
+        assert results['role'].startswith("You are a travel agent.")
+        with pytest.raises(ValueError, match="Unknown strategy"):
+            improver.improve_all("Plan a trip", per_strategy={'nope': {}})
+    
+    def test_iter_improve_all_yields_as_strategies_complete(self):
+        """Test results are yielded before the slowest strategy finishes."""
+        improver = PromptImprover(offline=True)
+        release = threading.Event()
+        
+        def slow_improve(prompt, **kwargs):
+            release.wait(5)
+            return "slow"
+        
+        with patch.object(improver.strategies['cot'], 'improve', side_effect=slow_improve):
+            results = improver.iter_improve_all("Test prompt")
+            first = [next(results) for _ in range(6)]
+            release.set()
+            last = list(results)
+        
+        assert 'cot' not in dict(first)
+        assert last == [('cot', "slow")]
+    
+    def test_aiter_improve_all(self):
+        """Test the async iterator yields every canonical strategy once."""
+        improver = PromptImprover(offline=True)
+        
+        async def collect():
+            return [key async for key, _ in improver.aiter_improve_all("Solve 2 + 2")]
+        
+        assert sorted(asyncio.run(collect())) == sorted(improver.improve_all("Solve 2 + 2"))
+    
+    def test_aimprove_all(self):
+        """Test the async fan-out returns every canonical strategy."""
+        improver = PromptImprover(offline=True)
+        
+        results = asyncio.run(improver.aimprove_all("Solve 2 + 2", per_strategy={'tot': {'num_branches': 2}}))
+        
+        assert len(results) == 7
+        assert results['tot'] == improver.improve("Solve 2 + 2", strategy='tot', num_branches=2)
@@ -0,0 +1,197 @@
+"""
+Unit tests for resumable, checkpointed batch jobs.
+"""
+
+import json
+import sys
+from pathlib import Path
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from batch import main as batch_main
+from improver import PromptImprover
+from jobs import BatchJob
+from strategies import ChainOfThoughtStrategy
+
+
+def write_input(path, count):
+    path.write_text("".join(f"Prompt number {i}\n" for i in range(1, count + 1)), encoding="utf-8")
+    return str(path)
+
+
+def read_output(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestBatchJob:
+    """Tests for BatchJob sharding, checkpointing and resuming."""
+    
+    def test_run_covers_every_line_once(self, tmp_path):
+        """Test a sharded run improves every input line exactly once."""
+        source = write_input(tmp_path / "in.txt", 50)
+        job = BatchJob(source, str(tmp_path / "job"), strategy="cot", shards=3, processes=1, offline=True)
+        
+        totals = job.run()
+        
+        assert totals["succeeded"] == totals["merged"] == 50
+        assert totals["skipped"] == totals["failed"] == 0
+        results = read_output(totals["output"])
+        assert sorted(r["id"] for r in results) == list(range(1, 51))
+        expected = PromptImprover(offline=True).improve("Prompt number 7", "cot")
+        assert next(r for r in results if r["id"] == 7)["improved_prompt"] == expected
+    
+    def test_shards_partition_lines(self, tmp_path):
+        """Test shards split the input into contiguous runs of lines that cover it exactly once."""
+        source = write_input(tmp_path / "in.txt", 10)
+        BatchJob(source, str(tmp_path / "job"), strategy="cot", shards=3, processes=1, offline=True).run()
+        
+        manifests = [
+            sorted(map(int, (tmp_path / "job" / f"shard-{shard:05d}.manifest").read_text().split()))
+            for shard in range(3)
+        ]
+        # Each shard gets one contiguous run of lines, numbered as in the whole file
+        assert [line for manifest in manifests for line in manifest] == list(range(1, 11))
+        assert all(manifest == list(range(manifest[0], manifest[-1] + 1)) for manifest in manifests)
+    
+    def test_shards_read_only_their_byte_range(self, tmp_path):
+        """Test byte ranges split at line starts, including multi-byte text and no final newline."""
+        source = tmp_path / "in.txt"
+        lines = [f"Prompt {'é' * (i % 7)} number {i}" for i in range(1, 41)]
+        source.write_text("\n".join(lines), encoding="utf-8")
+        job = BatchJob(str(source), str(tmp_path / "job"), strategy="cot", shards=4, processes=1, offline=True)
+        
+        totals = job.run()
+        
+        ranges = json.loads((tmp_path / "job" / "shards.json").read_text())
+        assert ranges[0]["start"] == 0 and ranges[-1]["end"] == source.stat().st_size
+        assert all(a["end"] == b["start"] for a, b in zip(ranges, ranges[1:]))
+        expected = {i: PromptImprover(offline=True).improve(line, "cot") for i, line in enumerate(lines, 1)}
+        assert {r["id"]: r["improved_prompt"] for r in read_output(totals["output"])} == expected
+    
+    def test_rerun_skips_finished_lines(self, tmp_path):
+        """Test running a finished job again skips every line and re-merges the output."""
+        source = write_input(tmp_path / "in.txt", 20)
+        BatchJob(source, str(tmp_path / "job"), strategy="cot", shards=2, processes=1, offline=True).run()
+        
+        totals = BatchJob(source, str(tmp_path / "job"), strategy="cot", shards=2, processes=1, offline=True).run()
+        
+        assert (totals["skipped"], totals["succeeded"], totals["merged"]) == (20, 0, 20)
+    
+    def test_resume_after_interrupt(self, tmp_path, monkeypatch):
+        """Test an interrupted job checkpoints finished lines and resumes with the rest."""
+        source = write_input(tmp_path / "in.txt", 30)
+        original = ChainOfThoughtStrategy.improve
+        calls = []
+        
+        def interrupted(self, prompt, **kwargs):
+            calls.append(prompt)
+            if len(calls) == 12:
+                raise KeyboardInterrupt
+            return original(self, prompt, **kwargs)
+        
+        monkeypatch.setattr(ChainOfThoughtStrategy, "improve", interrupted)
+        job = BatchJob(source, str(tmp_path / "job"), strategy="cot", shards=1, processes=1,
+                       checkpoint_every=5, offline=True)
+        with pytest.raises(KeyboardInterrupt):
+            job.run()
+        # Completed lines are checkpointed on the way out, not only every 5 items
+        assert len((tmp_path / "job" / "shard-00000.manifest").read_text().split()) == 11
+        
+        monkeypatch.setattr(ChainOfThoughtStrategy, "improve", original)
+        totals = job.run()
+        
+        assert (totals["skipped"], totals["succeeded"], totals["merged"]) == (11, 19, 30)
+        assert sorted(r["id"] for r in read_output(totals["output"])) == list(range(1, 31))
+    
+    def test_resume_repairs_partial_writes_and_dedupes(self, tmp_path):
+        """Test resuming truncates partial writes and merges each line only once."""
+        source = write_input(tmp_path / "in.txt", 10)
+        job = BatchJob(source, str(tmp_path / "job"), strategy="cot", shards=1, processes=1, offline=True)
+        job.run()
+        
+        # Simulate a crash after results were written but before they were checkpointed
+        manifest = tmp_path / "job" / "shard-00000.manifest"
+        manifest.write_text("".join(f"{i}\n" for i in range(1, 7)) + "7")
+        with open(tmp_path / "job" / "shard-00000.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"line": 9, "id": 9, "improved')
+        
+        totals = job.run()
+        
+        assert (totals["skipped"], totals["succeeded"], totals["merged"]) == (6, 4, 10)
+        results = read_output(totals["output"])
+        assert sorted(r["id"] for r in results) == list(range(1, 11))
+        assert all("line" not in r for r in results)
+    
+    def test_failures_are_retried(self, tmp_path):
+        """Test failed lines are not checkpointed and are retried on the next run."""
+        source = tmp_path / "in.jsonl"
+        source.write_text('{"prompt": "a"}\n{"prompt": "b", "strategy": "nope"}\n', encoding="utf-8")
+        job = BatchJob(str(source), str(tmp_path / "job"), strategy="cot", shards=1, processes=1, offline=True)
+        
+        first = job.run()
+        second = job.run()
+        
+        assert (first["succeeded"], first["failed"]) == (1, 1)
+        assert (second["skipped"], second["succeeded"], second["failed"]) == (1, 0, 1)
+        results = read_output(second["output"])
+        assert [r["id"] for r in results] == [1, 2]
+        assert "Unknown strategy" in results[1]["error"]
+    
+    def test_item_ids_and_kwargs(self, tmp_path):
+        """Test JSONL item ids, strategies and kwargs are honored in job mode."""
+        source = tmp_path / "in.jsonl"
+        source.write_text('{"id": "x", "prompt": "Cook", "strategy": "role", "kwargs": {"role": "a chef"}}\n',
+                          encoding="utf-8")
+        totals = BatchJob(str(source), str(tmp_path / "job"), shards=1, processes=1, offline=True).run()
+        
+        [result] = read_output(totals["output"])
+        assert result == {"id": "x", "strategy": "role",
+                          "improved_prompt": PromptImprover(offline=True).improve("Cook", "role", role="a chef")}
+    
+    def test_rejects_changed_job(self, tmp_path):
+        """Test reopening a job directory with a different definition raises ValueError."""
+        source = write_input(tmp_path / "in.txt", 5)
+        BatchJob(source, str(tmp_path / "job"), strategy="cot", shards=2, offline=True)
+        
+        with pytest.raises(ValueError, match="shards"):
+            BatchJob(source, str(tmp_path / "job"), strategy="cot", shards=3, offline=True)
+        with pytest.raises(ValueError, match="strategy"):
+            BatchJob(source, str(tmp_path / "job"), strategy="sot", shards=2, offline=True)
+    
+    def test_rejects_bad_arguments(self, tmp_path):
+        """Test invalid shard counts and formats raise ValueError."""
+        source = write_input(tmp_path / "in.txt", 1)
+        with pytest.raises(ValueError):
+            BatchJob(source, str(tmp_path / "job"), shards=0)
+        with pytest.raises(ValueError, match="Unknown format"):
+            BatchJob(source, str(tmp_path / "job"), format="csv")
+    
+    def test_worker_processes(self, tmp_path):
+        """Test shards run in worker processes and merge into the requested output file."""
+        source = write_input(tmp_path / "in.txt", 40)
+        totals = BatchJob(source, str(tmp_path / "job"), strategy="sot", shards=4, processes=2,
+                          offline=True, num_points=2).run(str(tmp_path / "merged.jsonl"))
+        
+        assert totals["merged"] == 40
+        results = read_output(tmp_path / "merged.jsonl")
+        expected = PromptImprover(offline=True).improve("Prompt number 3", "sot", num_points=2)
+        assert next(r for r in results if r["id"] == 3)["improved_prompt"] == expected
+    
+    def test_batch_cli_job_mode(self, tmp_path, capsys):
+        """Test `batch --job-dir` runs a job and skips finished lines when rerun."""
+        source = write_input(tmp_path / "in.txt", 6)
+        args = [source, "--job-dir", str(tmp_path / "job"), "--shards", "2", "--processes", "1", "-s", "cot", "--offline"]
+        
+        assert batch_main(args) == 0
+        assert batch_main(args) == 0
+        
+        assert "6 already done" in capsys.readouterr().err
+        assert len(read_output(tmp_path / "job" / "output.jsonl")) == 6
+    
+    def test_batch_cli_job_mode_needs_file(self, tmp_path):
+        """Test job mode refuses to read from stdin."""
+        with pytest.raises(SystemExit):
+            batch_main(["-", "--job-dir", str(tmp_path / "job"), "-s", "cot", "--offline"])
@@ -2,16 +2,19 @@
 Unit tests for LLMClient class.
 """
 
+import asyncio
 import sys
 import os
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
 import pytest
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from llm_client import LLMClient
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel, ParrotFakeChatModel
+from langchain_core.messages import AIMessage
 
 
 class TestLLMClient:
@@ -25,6 +28,9 @@ class TestLLMClient:
         
         assert client.provider == "openai"
         assert client.model_name == "gpt-4o-mini"
+        # The provider model is built on first use
+        mock_chat_openai.assert_not_called()
+        assert client.llm is mock_chat_openai.return_value
         mock_chat_openai.assert_called_once()
     
     @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
@@ -32,6 +38,7 @@ class TestLLMClient:
     def test_init_with_openai_default_model(self, mock_chat_openai):
         """Test LLMClient initialization with OpenAI default model."""
         client = LLMClient(provider="openai")
+        client.llm
         
         assert client.provider == "openai"
         assert client.model_name == "gpt-4o-mini"
@@ -43,6 +50,7 @@ class TestLLMClient:
         """Test LLMClient initialization with Gemini provider."""
         with patch('llm_client.GEMINI_AVAILABLE', True):
             client = LLMClient(provider="gemini", model_name="gemini-2.0-flash-exp")
+            client.llm
             
             assert client.provider == "gemini"
             assert client.model_name == "gemini-2.0-flash-exp"
@@ -68,6 +76,19 @@ class TestLLMClient:
             with pytest.raises(ValueError, match="GOOGLE_API_KEY not found"):
                 LLMClient(provider="gemini")
     
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_is_built_once(self, mock_chat_openai):
+        """Test the provider model is built lazily and reused."""
+        client = LLMClient(provider="openai", shared_pool=False)
+        
+        assert client.llm is client.llm
+        mock_chat_openai.assert_called_once()
+        
+        del client.llm
+        client.llm
+        assert mock_chat_openai.call_count == 2
+    
     def test_init_with_invalid_provider(self):
         """Test LLMClient initialization with invalid provider."""
         with pytest.raises(ValueError, match="Unknown provider"):
@@ -78,6 +99,7 @@ class TestLLMClient:
     def test_init_with_custom_temperature(self, mock_chat_openai):
         """Test LLMClient initialization with custom temperature."""
         client = LLMClient(provider="openai", temperature=0.5)
+        client.llm
         
         assert client.temperature == 0.5
         # Verify temperature was passed to ChatOpenAI
@@ -141,3 +163,226 @@ class TestLLMClient:
                 mock_prompt_template_class.from_messages.assert_called_once_with([("human", "Direct message")])
                 mock_chain.invoke.assert_called_once_with({})
 
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    @patch('llm_client.ChatPromptTemplate')
+    def test_ainvoke(self, mock_prompt_template_class, mock_chat_openai):
+        """Test LLMClient ainvoke method uses the async chain path."""
+        mock_chain = MagicMock()
+        mock_chain.ainvoke = AsyncMock(return_value="Async response")
+        
+        mock_prompt = MagicMock()
+        mock_intermediate = MagicMock()
+        mock_intermediate.__or__ = MagicMock(return_value=mock_chain)
+        mock_prompt.__or__ = MagicMock(return_value=mock_intermediate)
+        mock_prompt_template_class.from_template.return_value = mock_prompt
+        
+        client = LLMClient(provider="openai")
+        
+        with patch.object(client, 'llm', MagicMock()):
+            with patch.object(client, 'output_parser', MagicMock()):
+                result = asyncio.run(client.ainvoke("Test {variable}", variable="value"))
+                
+                assert result == "Async response"
+                mock_chain.ainvoke.assert_awaited_once_with({"variable": "value"})
+                mock_chain.invoke.assert_not_called()
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    @patch('llm_client.ChatPromptTemplate')
+    def test_ainvoke_direct(self, mock_prompt_template_class, mock_chat_openai):
+        """Test LLMClient ainvoke_direct method."""
+        mock_chain = MagicMock()
+        mock_chain.ainvoke = AsyncMock(return_value="Async direct response")
+        
+        mock_prompt = MagicMock()
+        mock_intermediate = MagicMock()
+        mock_intermediate.__or__ = MagicMock(return_value=mock_chain)
+        mock_prompt.__or__ = MagicMock(return_value=mock_intermediate)
+        mock_prompt_template_class.from_messages.return_value = mock_prompt
+        
+        client = LLMClient(provider="openai")
+        
+        with patch.object(client, 'llm', MagicMock()):
+            with patch.object(client, 'output_parser', MagicMock()):
+                result = asyncio.run(client.ainvoke_direct("Direct message"))
+                
+                assert result == "Async direct response"
+                mock_prompt_template_class.from_messages.assert_called_once_with([("human", "Direct message")])
+                mock_chain.ainvoke.assert_awaited_once_with({})
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    @patch('llm_client.ChatPromptTemplate')
+    def test_chain_cache_reuses_compiled_chain(self, mock_prompt_template_class, mock_chat_openai):
+        """Test that repeated templates reuse the compiled chain."""
+        client = LLMClient(provider="openai")
+        
+        client.invoke("Test {variable}", variable="a")
+        client.invoke("Test {variable}", variable="b")
+        client.invoke_direct("Direct message")
+        client.invoke_direct("Direct message")
+        
+        assert mock_prompt_template_class.from_template.call_count == 1
+        assert mock_prompt_template_class.from_messages.call_count == 1
+        stats = client.get_chain_cache_stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 2
+        assert stats['size'] == 2
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    @patch('llm_client.ChatPromptTemplate')
+    def test_chain_cache_evicts_least_recently_used(self, mock_prompt_template_class, mock_chat_openai):
+        """Test that the chain cache is bounded and evicts the LRU entry."""
+        client = LLMClient(provider="openai", chain_cache_size=2)
+        
+        client.invoke("A {x}", x=1)
+        client.invoke("B {x}", x=1)
+        client.invoke("A {x}", x=1)  # A becomes most recently used
+        client.invoke("C {x}", x=1)  # evicts B
+        client.invoke("A {x}", x=1)
+        client.invoke("B {x}", x=1)
+        
+        stats = client.get_chain_cache_stats()
+        assert stats['size'] == 2
+        assert stats['hits'] == 2
+        assert stats['misses'] == 4
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    @patch('llm_client.ChatPromptTemplate')
+    def test_chain_cache_disabled(self, mock_prompt_template_class, mock_chat_openai):
+        """Test that chain_cache_size=0 rebuilds the chain on every call."""
+        client = LLMClient(provider="openai", chain_cache_size=0)
+        
+        client.invoke("Test {variable}", variable="a")
+        client.invoke("Test {variable}", variable="a")
+        
+        assert mock_prompt_template_class.from_template.call_count == 2
+        assert client.get_chain_cache_stats()['size'] == 0
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_chain_cache_end_to_end_with_fake_model(self, mock_chat_openai):
+        """Test cached chains still fill in new variables on each call."""
+        client = LLMClient(provider="openai")
+        client.llm = ParrotFakeChatModel()
+        
+        assert client.invoke("Say {word}", word="hello") == "Say hello"
+        assert client.invoke("Say {word}", word="world") == "Say world"
+        
+        client.clear_chain_cache()
+        assert client.get_chain_cache_stats() == {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 128}
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_invoke_batch_preserves_order(self, mock_chat_openai):
+        """Test invoke_batch returns one result per input, in input order."""
+        client = LLMClient(provider="openai")
+        client.llm = ParrotFakeChatModel()
+        
+        inputs = [{"word": f"item-{i}"} for i in range(20)]
+        results = client.invoke_batch("Say {word}", inputs, max_concurrency=4)
+        
+        assert results == [f"Say item-{i}" for i in range(20)]
+        assert client.get_chain_cache_stats()['misses'] == 1
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_invoke_batch_reports_per_item_errors(self, mock_chat_openai):
+        """Test a failing item is returned as an exception without failing the batch."""
+        client = LLMClient(provider="openai")
+        client.llm = ParrotFakeChatModel()
+        
+        results = client.invoke_batch("Say {word}", [{"word": "a"}, {}, {"word": "c"}])
+        
+        assert results[0] == "Say a"
+        assert isinstance(results[1], Exception)
+        assert results[2] == "Say c"
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    @patch('llm_client.ChatPromptTemplate')
+    def test_invoke_batch_passes_max_concurrency(self, mock_prompt_template_class, mock_chat_openai):
+        """Test invoke_batch forwards max_concurrency to the runnable batch call."""
+        mock_chain = MagicMock()
+        mock_chain.batch.return_value = ["r1", "r2"]
+        mock_prompt = MagicMock()
+        mock_intermediate = MagicMock()
+        mock_intermediate.__or__ = MagicMock(return_value=mock_chain)
+        mock_prompt.__or__ = MagicMock(return_value=mock_intermediate)
+        mock_prompt_template_class.from_template.return_value = mock_prompt
+        
+        client = LLMClient(provider="openai")
+        result = client.invoke_batch("T {x}", [{"x": 1}, {"x": 2}], max_concurrency=3)
+        
+        assert result == ["r1", "r2"]
+        mock_chain.batch.assert_called_once_with(
+            [{"x": 1}, {"x": 2}],
+            config={"max_concurrency": 3},
+            return_exceptions=True
+        )
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_invoke_batch_empty(self, mock_chat_openai):
+        """Test invoke_batch with no inputs returns an empty list."""
+        client = LLMClient(provider="openai")
+        
+        assert client.invoke_batch("Say {word}", []) == []
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_ainvoke_batch(self, mock_chat_openai):
+        """Test ainvoke_batch returns ordered results and per-item errors."""
+        client = LLMClient(provider="openai")
+        client.llm = ParrotFakeChatModel()
+        
+        results = asyncio.run(client.ainvoke_batch(
+            "Say {word}", [{"word": "x"}, {}, {"word": "z"}], max_concurrency=2
+        ))
+        
+        assert results[0] == "Say x"
+        assert isinstance(results[1], Exception)
+        assert results[2] == "Say z"
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_stream_yields_chunks(self, mock_chat_openai):
+        """Test stream yields the response incrementally."""
+        client = LLMClient(provider="openai")
+        client.llm = GenericFakeChatModel(messages=iter([AIMessage(content="one two three")]))
+        
+        chunks = list(client.stream("Count {n}", n=3))
+        
+        assert len(chunks) > 1
+        assert "".join(chunks) == "one two three"
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_astream_yields_chunks(self, mock_chat_openai):
+        """Test astream yields the response incrementally."""
+        client = LLMClient(provider="openai")
+        client.llm = GenericFakeChatModel(messages=iter([AIMessage(content="one two three")]))
+        
+        async def collect():
+            return [chunk async for chunk in client.astream("Count {n}", n=3)]
+        
+        chunks = asyncio.run(collect())
+        
+        assert len(chunks) > 1
+        assert "".join(chunks) == "one two three"
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_stream_populates_response_cache(self, mock_chat_openai):
+        """Test a completed stream is cached and replayed as one chunk."""
+        from response_cache import ResponseCache
+        
+        client = LLMClient(provider="openai", cache=ResponseCache(path=":memory:"))
+        client.llm = GenericFakeChatModel(messages=iter([AIMessage(content="one two three")]))
+        
+        assert "".join(client.stream("Count {n}", n=3)) == "one two three"
+        assert list(client.stream("Count {n}", n=3)) == ["one two three"]
@@ -0,0 +1,238 @@
+"""
+Unit tests for dynamic micro-batching and batched strategy rendering.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from improver import PromptImprover
+from microbatch import MicroBatcher
+from server import ImproverServer
+
+PROMPTS = ["Explain recursion", "", "Braces {x} {{y}}", "Multi\n\nline  \n", "Ünïcödé 日本語"]
+
+KWARGS = {
+    'role': [{}, {"role": "a chef"}],
+    'few-shot': [{}, {"num_examples": 1}],
+    'cot': [{}],
+    'self-consistency': [{}, {"num_paths": 1}, {"num_paths": 5}],
+    'tot': [{}, {"num_branches": 2}],
+    'sot': [{}, {"num_points": 1}, {"num_points": 8}],
+    'react': [{}, {"domain": "web"}],
+}
+
+
+class TestMicroBatcher:
+    """Tests for MicroBatcher and batched improvement."""
+    
+    @pytest.mark.parametrize("strategy", list(KWARGS))
+    def test_improve_batch_matches_improve(self, strategy):
+        """Test improve_batch and aimprove_batch render exactly what improve does per prompt."""
+        improver = PromptImprover(offline=True)
+        for kwargs in KWARGS[strategy]:
+            expected = [improver.improve(prompt, strategy, **kwargs) for prompt in PROMPTS]
+            assert improver.improve_batch(PROMPTS, strategy, **kwargs) == expected
+            assert asyncio.run(improver.aimprove_batch(PROMPTS, strategy, **kwargs)) == expected
+    
+    def test_improve_batch_unknown_strategy(self):
+        """Test improve_batch rejects an unknown strategy with ValueError."""
+        with pytest.raises(ValueError, match="Unknown strategy"):
+            PromptImprover(offline=True).improve_batch(["x"], "nope")
+    
+    def test_groups_concurrent_submissions(self):
+        """Test concurrent submissions are dispatched as one batch per key."""
+        calls = []
+        
+        async def dispatch(key, items):
+            calls.append((key, list(items)))
+            return [f"{key}:{item}" for item in items]
+        
+        async def run():
+            batcher = MicroBatcher(dispatch, window=0.01)
+            results = await asyncio.gather(
+                *(batcher.submit("a", i) for i in range(3)),
+                batcher.submit("b", 9)
+            )
+            return results, batcher.get_stats()
+        
+        results, stats = asyncio.run(run())
+        
+        assert results == ["a:0", "a:1", "a:2", "b:9"]
+        assert sorted(calls) == [("a", [0, 1, 2]), ("b", [9])]
+        assert stats["batches"] == 2 and stats["items"] == 4 and stats["largest_batch"] == 3
+    
+    def test_max_batch_size_dispatches_early(self):
+        """Test a full batch is dispatched without waiting for the window."""
+        sizes = []
+        
+        async def dispatch(key, items):
+            sizes.append(len(items))
+            return items
+        
+        async def run():
+            batcher = MicroBatcher(dispatch, window=10, max_batch_size=4)
+            start = time.perf_counter()
+            results = await asyncio.gather(*(batcher.submit("k", i) for i in range(8)))
+            return results, time.perf_counter() - start
+        
+        results, elapsed = asyncio.run(run())
+        
+        assert results == list(range(8))
+        assert sizes == [4, 4]
+        assert elapsed < 1
+    
+    def test_window_bounds_latency(self):
+        """Test a lone submission waits about one window before dispatch."""
+        async def dispatch(key, items):
+            return items
+        
+        async def run():
+            batcher = MicroBatcher(dispatch, window=0.05)
+            start = time.perf_counter()
+            await batcher.submit("k", 1)
+            return time.perf_counter() - start
+        
+        assert 0.04 < asyncio.run(run()) < 1
+    
+    def test_per_item_and_group_errors(self):
+        """Test per-item exceptions reach their caller and a failed dispatch fails its whole group."""
+        async def dispatch(key, items):
+            if key == "broken":
+                raise RuntimeError("dispatch failed")
+            return [ValueError(item) if item == "bad" else item for item in items]
+        
+        async def run():
+            batcher = MicroBatcher(dispatch, window=0)
+            return await asyncio.gather(
+                batcher.submit("k", "good"),
+                batcher.submit("k", "bad"),
+                batcher.submit("broken", "x"),
+                return_exceptions=True
+            )
+        
+        good, bad, broken = asyncio.run(run())
+        
+        assert good == "good"
+        assert isinstance(bad, ValueError)
+        assert isinstance(broken, RuntimeError)
+    
+    def test_wrong_result_count_fails_group(self):
+        """Test a dispatch returning the wrong number of results fails every item in the group."""
+        async def dispatch(key, items):
+            return items[:1]
+        
+        async def run():
+            batcher = MicroBatcher(dispatch, window=0)
+            return await asyncio.gather(batcher.submit("k", 1), batcher.submit("k", 2), return_exceptions=True)
+        
+        assert all(isinstance(r, RuntimeError) for r in asyncio.run(run()))
+    
+    def test_cancelled_caller_does_not_break_group(self):
+        """Test cancelling one caller leaves the rest of its group unaffected."""
+        async def dispatch(key, items):
+            await asyncio.sleep(0.02)
+            return items
+        
+        async def run():
+            batcher = MicroBatcher(dispatch, window=0.01)
+            cancelled = asyncio.ensure_future(batcher.submit("k", 1))
+            kept = asyncio.ensure_future(batcher.submit("k", 2))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            return await kept
+        
+        assert asyncio.run(run()) == 2
+    
+    def test_drain_flushes_open_groups(self):
+        """Test drain dispatches groups whose window is still open."""
+        async def dispatch(key, items):
+            return items
+        
+        async def run():
+            batcher = MicroBatcher(dispatch, window=60)
+            pending = asyncio.ensure_future(batcher.submit("k", 1))
+            await asyncio.sleep(0)
+            await batcher.drain()
+            return await pending
+        
+        assert asyncio.run(run()) == 1
+    
+    def test_rejects_bad_arguments(self):
+        """Test a negative window or a max_batch_size below 1 raises ValueError."""
+        async def dispatch(key, items):
+            return items
+        
+        with pytest.raises(ValueError):
+            MicroBatcher(dispatch, window=-1)
+        with pytest.raises(ValueError):
+            MicroBatcher(dispatch, max_batch_size=0)
+    
+    def test_server_batches_concurrent_improve_requests(self):
+        """Test the server groups concurrent /improve requests by strategy and kwargs."""
+        calls = []
+        
+        class CountingImprover(PromptImprover):
+            async def aimprove_batch(self, prompts, strategy, **kwargs):
+                calls.append((strategy, len(prompts)))
+                return await super().aimprove_batch(prompts, strategy, **kwargs)
+        
+        async def run():
+            server = ImproverServer(CountingImprover(offline=True), port=0, batch_window=0.02)
+            results = await asyncio.gather(
+                *(server.handle("POST", "/improve", json.dumps({"prompt": f"p{i}", "strategy": "cot"}).encode())
+                  for i in range(5)),
+                server.handle("POST", "/improve", b'{"prompt": "r", "strategy": "role", "kwargs": {"role": "a chef"}}'),
+                server.handle("POST", "/improve", b'{"prompt": "x", "strategy": "nope"}')
+            )
+            stats = server.get_batching_stats()
+            await server.shutdown()
+            return results, stats
+        
+        results, stats = asyncio.run(run())
+        
+        improver = PromptImprover(offline=True)
+        assert [r[1]["improved_prompt"] for r in results[:5]] == [improver.improve(f"p{i}", "cot") for i in range(5)]
+        assert results[5][1]["improved_prompt"] == improver.improve("r", "role", role="a chef")
+        assert results[6][0] == 400
+        assert sorted(calls) == [("cot", 5), ("nope", 1), ("role", 1)]
+        assert stats["items"] == 7
+    
+    def test_server_without_batching(self):
+        """Test the server handles requests directly when batching is disabled."""
+        async def run():
+            server = ImproverServer(PromptImprover(offline=True), batch_window=None)
+            return await server.handle("POST", "/improve", b'{"prompt": "x", "strategy": "cot"}'), server
+        
+        (status, body), server = asyncio.run(run())
+        assert status == 200
+        assert server.get_batching_stats() is None
+    
+    def test_server_batch_endpoint_groups_items(self):
+        """Test /batch renders its items in one call per strategy and kwargs group."""
+        calls = []
+        
+        class CountingImprover(PromptImprover):
+            async def aimprove_batch(self, prompts, strategy, **kwargs):
+                calls.append((strategy, kwargs, len(prompts)))
+                return await super().aimprove_batch(prompts, strategy, **kwargs)
+        
+        payload = {"strategy": "cot", "items": ["a", "b", {"prompt": "c", "strategy": "sot"},
+                                                {"prompt": "d", "strategy": "sot", "kwargs": {"num_points": 2}}, "e"]}
+        
+        async def run():
+            server = ImproverServer(CountingImprover(offline=True))
+            return await server.handle("POST", "/batch", json.dumps(payload).encode())
+        
+        status, body = asyncio.run(run())
+        
+        assert status == 200
+        assert [r["id"] for r in body["results"]] == [0, 1, 2, 3, 4]
+        assert body["results"][3]["improved_prompt"] == PromptImprover(offline=True).improve("d", "sot", num_points=2)
+        assert sorted(calls, key=str) == sorted([("cot", {}, 3), ("sot", {}, 1), ("sot", {"num_points": 2}, 1)], key=str)
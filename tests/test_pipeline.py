@@ -0,0 +1,106 @@
+"""
+Unit tests for compiled multi-strategy pipelines.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from improver import PromptImprover
+from pipeline import CompiledPipeline
+from strategies.base import BaseStrategy, PromptSections
+
+
+class WrapStrategy(BaseStrategy):
+    """Strategy without structured sections, exercising the default get_sections."""
+    
+    def improve(self, prompt: str, **kwargs) -> str:
+        return f"<<\n{prompt}\n>>"
+    
+    def get_strategy_name(self) -> str:
+        return "Wrap"
+
+
+STRATEGY_KWARGS = [
+    {},
+    {'role': 'a chef', 'domain': 'cooking', 'num_paths': 6, 'num_branches': 5, 'num_points': 4},
+    {'examples': [{'input': 'a', 'output': 'b'}, {'input': 'c', 'output': 'd'}, {'input': 'e', 'output': 'f'}]},
+    {'examples': [{'input': 'a', 'output': 'b'}], 'num_examples': 0},
+]
+
+
+class TestPipeline:
+    """Tests for PromptSections, CompiledPipeline and PromptImprover pipelines."""
+    
+    @pytest.mark.parametrize('kwargs', STRATEGY_KWARGS)
+    def test_sections_render_like_improve(self, kwargs):
+        """Test every built-in strategy's sections render exactly its improve() output."""
+        improver = PromptImprover(offline=True)
+        
+        for key in improver.strategies.registry.keys():
+            strategy = improver.strategies[key]
+            assert strategy.get_sections(**kwargs).render("Explain recursion") == \
+                strategy.improve("Explain recursion", **kwargs), key
+    
+    def test_single_strategy_pipeline_matches_improve(self):
+        """Test a one-strategy pipeline renders the same prompt as improve()."""
+        improver = PromptImprover(offline=True)
+        
+        for key in improver.strategies.registry.keys():
+            assert improver.improve_pipeline("Plan a trip", [key]) == improver.improve("Plan a trip", strategy=key)
+    
+    def test_pipeline_merges_shared_sections(self):
+        """Test Task and Instructions sections appear once and instructions are renumbered."""
+        improver = PromptImprover(offline=True)
+        
+        result = improver.improve_pipeline("Design a cache", ['role', 'cot', 'tot', 'sot'], role="an architect")
+        
+        assert result.startswith("You are an architect.")
+        assert result.count("Task:") == 1
+        assert result.count("Instructions:") == 1
+        assert "Task: Design a cache\n" in result
+        assert "5. Generate at least 3 different possible approaches" in result
+        assert "8. Choose the best approach with clear reasoning" in result
+        assert "Step 1 - Generate Skeleton:" in result
+        assert result.endswith("Skeleton Generation:")
+        assert result.count("Design a cache") == 1
+    
+    def test_aliases_do_not_duplicate_sections(self):
+        """Test listing a strategy twice (or by alias) does not repeat its sections."""
+        improver = PromptImprover(offline=True)
+        
+        assert improver.improve_pipeline("Sort a list", ['cot', 'chain-of-thought']) == \
+            improver.improve("Sort a list", strategy='cot')
+    
+    def test_compiled_pipeline_reuse(self):
+        """Test a compiled pipeline renders many prompts and exposes its template."""
+        improver = PromptImprover(offline=True)
+        pipeline = improver.compile_pipeline(['react', 'self-consistency'], domain="finance", num_paths=2)
+        
+        assert isinstance(pipeline, CompiledPipeline)
+        assert pipeline.template.startswith("Task in the domain of finance: {prompt}")
+        assert pipeline("A") == pipeline.template.replace("{prompt}", "A")
+        assert "Instructions:\nUse the ReAct framework" in pipeline.render("B")
+        assert "1. Generate 2 different independent reasoning paths" in pipeline.render("B")
+        assert pipeline.render("B").endswith("Reasoning Paths:")
+    
+    def test_default_sections_for_unstructured_strategy(self):
+        """Test strategies without get_sections are fused around their improve() output."""
+        sections = WrapStrategy(offline=True).get_sections()
+        
+        assert sections.preamble == ["<<"]
+        assert sections.notes == [">>"]
+        merged = PromptSections.merge([sections, PromptSections(prompt_prefix="Task: ", cue="Go:")])
+        assert merged.render("P") == "<<\n\nTask: P\n\n>>\n\nGo:"
+    
+    def test_pipeline_validates_strategies(self):
+        """Test unknown or missing strategies are rejected."""
+        improver = PromptImprover(offline=True)
+        
+        with pytest.raises(ValueError, match="Unknown strategy"):
+            improver.compile_pipeline(['role', 'invalid-strategy'])
+        with pytest.raises(ValueError, match="at least one"):
+            improver.compile_pipeline([])
@@ -0,0 +1,119 @@
+"""
+Unit tests for RateLimiter and TokenBucket classes.
+"""
+
+import asyncio
+import sys
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from rate_limiter import RateLimiter, TokenBucket, estimate_tokens, get_rate_limiter
+from llm_client import LLMClient
+from langchain_core.language_models.fake_chat_models import ParrotFakeChatModel
+
+
+class TestRateLimiter:
+    """Tests for the client-side rate limiter."""
+    
+    def test_token_bucket_allows_burst_then_spaces_requests(self):
+        """Test the bucket grants its capacity, then queues at the refill rate."""
+        bucket = TokenBucket(rate_per_minute=60, capacity=2)
+        
+        assert bucket.reserve(1, now=bucket.updated_at) == 0
+        assert bucket.reserve(1, now=bucket.updated_at) == 0
+        # One unit per second: the third and fourth callers are released 1s apart
+        assert bucket.reserve(1, now=bucket.updated_at) == pytest.approx(1.0)
+        assert bucket.reserve(1, now=bucket.updated_at) == pytest.approx(2.0)
+    
+    def test_token_bucket_refills_over_time(self):
+        """Test elapsed time refills the bucket up to its capacity."""
+        bucket = TokenBucket(rate_per_minute=60, capacity=1)
+        start = bucket.updated_at
+        
+        assert bucket.reserve(1, now=start) == 0
+        assert bucket.reserve(1, now=start + 1.0) == 0
+        assert bucket.reserve(1, now=start + 100.0) == 0
+        assert bucket.level == 0
+    
+    def test_token_bucket_clamps_oversized_requests(self):
+        """Test a request larger than the capacity still gets scheduled."""
+        bucket = TokenBucket(rate_per_minute=60, capacity=10)
+        
+        assert bucket.reserve(1000, now=bucket.updated_at) == 0
+    
+    @patch('rate_limiter.time.sleep')
+    def test_acquire_blocks_when_over_request_budget(self, mock_sleep):
+        """Test acquire sleeps instead of failing once the budget is used up."""
+        limiter = RateLimiter(requests_per_minute=1)
+        
+        assert limiter.acquire() == 0
+        waited = limiter.acquire()
+        
+        assert waited == pytest.approx(60.0, rel=0.01)
+        mock_sleep.assert_called_once()
+        stats = limiter.get_stats()
+        assert stats['acquired'] == 2
+        assert stats['max_queue_depth'] == 1
+        assert stats['queue_depth'] == 0
+        assert stats['max_wait_seconds'] == pytest.approx(60.0, rel=0.01)
+    
+    @patch('rate_limiter.time.sleep')
+    def test_acquire_charges_token_budget(self, mock_sleep):
+        """Test prompt and expected output tokens count against the token budget."""
+        limiter = RateLimiter(tokens_per_minute=600, output_tokens=100)
+        
+        assert limiter.acquire(tokens=400) == 0
+        # 500 used, 100 left; the next 500-token request waits for 400 more at 10/s
+        assert limiter.acquire(tokens=400) == pytest.approx(40.0, rel=0.01)
+    
+    def test_aacquire_waits_without_blocking(self):
+        """Test the async path awaits asyncio.sleep for its reservation."""
+        limiter = RateLimiter(requests_per_minute=1)
+        
+        with patch('rate_limiter.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            asyncio.run(limiter.aacquire())
+            asyncio.run(limiter.aacquire())
+        
+        mock_sleep.assert_awaited_once()
+        assert limiter.get_stats()['queue_depth'] == 0
+    
+    def test_unlimited(self):
+        """Test a limiter without budgets never waits."""
+        limiter = RateLimiter()
+        
+        assert all(limiter.acquire(tokens=10_000) == 0 for _ in range(100))
+    
+    def test_get_rate_limiter_shared_per_model(self):
+        """Test the process-wide limiter is shared per provider/model."""
+        first = get_rate_limiter("openai", "test-shared-model", requests_per_minute=10)
+        second = get_rate_limiter("OpenAI", "test-shared-model")
+        other = get_rate_limiter("openai", "test-other-model", requests_per_minute=10)
+        
+        assert first is second
+        assert first is not other
+        assert second.requests_per_minute == 10
+    
+    def test_estimate_tokens(self):
+        """Test the token estimate heuristic."""
+        assert estimate_tokens("") == 1
+        assert estimate_tokens("x" * 400) == 100
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_client_acquires_for_every_call(self, mock_chat_openai):
+        """Test LLMClient acquires budget on sync, batch and async calls."""
+        limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=1_000_000)
+        client = LLMClient(provider="openai", rate_limiter=limiter)
+        client.llm = ParrotFakeChatModel()
+        
+        assert client.invoke("Say {word}", word="a") == "Say a"
+        assert client.invoke_direct("Hello") == "Hello"
+        assert client.invoke_batch("Say {word}", [{"word": "b"}, {"word": "c"}]) == ["Say b", "Say c"]
+        assert asyncio.run(client.ainvoke("Say {word}", word="d")) == "Say d"
+        
+        assert limiter.get_stats()['acquired'] == 5
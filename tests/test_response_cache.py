@@ -0,0 +1,213 @@
+"""
+Unit tests for ResponseCache class.
+"""
+
+import asyncio
+import sys
+import os
+import threading
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from response_cache import ResponseCache
+from llm_client import LLMClient
+from langchain_core.language_models.fake_chat_models import ParrotFakeChatModel
+
+
+class TestResponseCache:
+    """Tests for ResponseCache class."""
+    
+    def test_set_and_get(self, tmp_path):
+        """Test storing and retrieving a response."""
+        cache = ResponseCache(path=str(tmp_path / "cache.db"))
+        key = ResponseCache.make_key("openai", "gpt-4o-mini", 0.0, "Say {x}", {"x": 1})
+        
+        assert cache.get(key) is None
+        cache.set(key, "hello")
+        assert cache.get(key) == "hello"
+        assert cache.get_stats()['hits'] == 1
+        assert cache.get_stats()['misses'] == 1
+    
+    def test_make_key_distinguishes_request_fields(self):
+        """Test that every request field contributes to the key."""
+        base = ResponseCache.make_key("openai", "m", 0.0, "T {x}", {"x": 1})
+        
+        assert base == ResponseCache.make_key("openai", "m", 0, "T {x}", {"x": 1})
+        assert base != ResponseCache.make_key("gemini", "m", 0.0, "T {x}", {"x": 1})
+        assert base != ResponseCache.make_key("openai", "other", 0.0, "T {x}", {"x": 1})
+        assert base != ResponseCache.make_key("openai", "m", 0.5, "T {x}", {"x": 1})
+        assert base != ResponseCache.make_key("openai", "m", 0.0, "U {x}", {"x": 1})
+        assert base != ResponseCache.make_key("openai", "m", 0.0, "T {x}", {"x": 2})
+        assert base != ResponseCache.make_key("openai", "m", 0.0, "T {x}", {"x": 1}, kind="direct")
+    
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the database."""
+        path = str(tmp_path / "cache.db")
+        first = ResponseCache(path=path)
+        first.set("k", "persisted")
+        first.close()
+        
+        second = ResponseCache(path=path)
+        assert second.get("k") == "persisted"
+    
+    def test_shared_between_open_instances(self, tmp_path):
+        """Test that two open handles on one file see each other's writes."""
+        path = str(tmp_path / "cache.db")
+        writer = ResponseCache(path=path)
+        reader = ResponseCache(path=path)
+        
+        writer.set("k", "shared")
+        assert reader.get("k") == "shared"
+    
+    def test_ttl_expiry(self, tmp_path):
+        """Test that entries older than the TTL are treated as misses."""
+        cache = ResponseCache(path=str(tmp_path / "cache.db"), ttl=60)
+        
+        with patch('response_cache.time.time', return_value=1000.0):
+            cache.set("k", "v")
+        with patch('response_cache.time.time', return_value=1059.0):
+            assert cache.get("k") == "v"
+        with patch('response_cache.time.time', return_value=1061.0):
+            assert cache.get("k") is None
+        assert len(cache) == 0
+    
+    def test_purge_expired(self, tmp_path):
+        """Test bulk removal of expired entries."""
+        cache = ResponseCache(path=str(tmp_path / "cache.db"), ttl=10)
+        
+        with patch('response_cache.time.time', return_value=1000.0):
+            cache.set("old", "v")
+        with patch('response_cache.time.time', return_value=1020.0):
+            cache.set("new", "v")
+            assert cache.purge_expired() == 1
+        assert len(cache) == 1
+    
+    def test_max_entries_evicts_least_recently_used(self, tmp_path):
+        """Test LRU eviction by entry count."""
+        cache = ResponseCache(path=str(tmp_path / "cache.db"), max_entries=2)
+        
+        with patch('response_cache.time.time', return_value=1.0):
+            cache.set("a", "1")
+        with patch('response_cache.time.time', return_value=2.0):
+            cache.set("b", "2")
+        with patch('response_cache.time.time', return_value=3.0):
+            cache.get("a")  # a is now more recently used than b
+        with patch('response_cache.time.time', return_value=4.0):
+            cache.set("c", "3")
+        
+        assert len(cache) == 2
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+    
+    def test_max_bytes_evicts_least_recently_used(self, tmp_path):
+        """Test LRU eviction by total response size."""
+        cache = ResponseCache(path=str(tmp_path / "cache.db"), max_entries=None, max_bytes=10)
+        
+        with patch('response_cache.time.time', return_value=1.0):
+            cache.set("a", "xxxx")
+        with patch('response_cache.time.time', return_value=2.0):
+            cache.set("b", "yyyy")
+        with patch('response_cache.time.time', return_value=3.0):
+            cache.set("c", "zzzz")
+        
+        assert cache.get("a") is None
+        assert cache.get("b") == "yyyy"
+        assert cache.get("c") == "zzzz"
+        assert cache.get_stats()['bytes'] == 8
+    
+    def test_only_deterministic(self, tmp_path):
+        """Test that only_deterministic restricts caching to temperature 0."""
+        cache = ResponseCache(path=str(tmp_path / "cache.db"), only_deterministic=True)
+        
+        assert cache.should_cache(0)
+        assert not cache.should_cache(0.7)
+        assert ResponseCache(path=":memory:").should_cache(0.7)
+    
+    def test_clear(self, tmp_path):
+        """Test clearing all entries."""
+        cache = ResponseCache(path=str(tmp_path / "cache.db"))
+        cache.set("k", "v")
+        cache.clear()
+        
+        assert len(cache) == 0
+        assert cache.get_stats()['hits'] == 0
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_client_serves_hits_from_cache(self, mock_chat_openai, tmp_path):
+        """Test that LLMClient returns cached responses without calling the model."""
+        cache = ResponseCache(path=str(tmp_path / "cache.db"))
+        client = LLMClient(provider="openai", temperature=0, cache=cache)
+        client.llm = ParrotFakeChatModel()
+        
+        assert client.invoke("Say {word}", word="hi") == "Say hi"
+        client.llm = None  # any further model call would fail
+        assert client.invoke("Say {word}", word="hi") == "Say hi"
+        assert cache.get_stats()['hits'] == 1
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_client_respects_only_deterministic(self, mock_chat_openai, tmp_path):
+        """Test that non-zero temperature bypasses a deterministic-only cache."""
+        cache = ResponseCache(path=str(tmp_path / "cache.db"), only_deterministic=True)
+        client = LLMClient(provider="openai", temperature=0.7, cache=cache)
+        client.llm = ParrotFakeChatModel()
+        
+        client.invoke("Say {word}", word="hi")
+        client.invoke_direct("Hello")
+        
+        assert len(cache) == 0
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_client_batch_only_sends_misses(self, mock_chat_openai, tmp_path):
+        """Test that invoke_batch fills cached items and caches only successes."""
+        cache = ResponseCache(path=str(tmp_path / "cache.db"))
+        client = LLMClient(provider="openai", temperature=0, cache=cache)
+        client.llm = ParrotFakeChatModel()
+        client.invoke("Say {word}", word="a")
+        
+        results = client.invoke_batch("Say {word}", [{"word": "a"}, {"word": "b"}, {}])
+        
+        assert results[0] == "Say a"
+        assert results[1] == "Say b"
+        assert isinstance(results[2], Exception)
+        assert len(cache) == 2
+        assert cache.get_stats()['hits'] == 1
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_async_llm_client_keeps_sqlite_off_the_event_loop(self, mock_chat_openai, tmp_path):
+        """Test the async paths run cache reads and writes in worker threads, not on the loop."""
+        threads = []
+        
+        class RecordingCache(ResponseCache):
+            def get(self, key):
+                threads.append(threading.get_ident())
+                return super().get(key)
+            
+            def set(self, key, value):
+                threads.append(threading.get_ident())
+                super().set(key, value)
+        
+        cache = RecordingCache(path=str(tmp_path / "cache.db"))
+        client = LLMClient(provider="openai", temperature=0, cache=cache)
+        client.llm = ParrotFakeChatModel()
+        
+        async def run():
+            first = await client.ainvoke("Say {word}", word="hi")
+            second = await client.ainvoke("Say {word}", word="hi")
+            batch = await client.ainvoke_batch("Say {word}", [{"word": "hi"}, {"word": "new"}])
+            streamed = [chunk async for chunk in client.astream("Say {word}", word="streamed")]
+            return threading.get_ident(), [first, second, batch, "".join(streamed)]
+        
+        loop_thread, results = asyncio.run(run())
+        
+        assert results == ["Say hi", "Say hi", ["Say hi", "Say new"], "Say streamed"]
+        assert len(threads) == 8
+        assert loop_thread not in threads
@@ -0,0 +1,198 @@
+"""
+Unit tests for RouterClient class.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, AsyncMock, patch
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from router import RouterClient
+from improver import PromptImprover
+from strategies.role import RoleStrategy
+
+
+def make_backend(provider, response="ok", model_name="model"):
+    """Create a mock LLMClient-like backend."""
+    backend = MagicMock()
+    backend.provider = provider
+    backend.model_name = model_name
+    backend.invoke.return_value = response
+    backend.invoke_direct.return_value = response
+    backend.ainvoke = AsyncMock(return_value=response)
+    return backend
+
+
+class TestRouterClient:
+    """Tests for RouterClient class."""
+    
+    def test_init_validation(self):
+        """Test invalid router configurations are rejected."""
+        with pytest.raises(ValueError, match="at least one backend"):
+            RouterClient([])
+        with pytest.raises(ValueError, match="Unknown routing policy"):
+            RouterClient([make_backend("openai")], policy="random")
+        with pytest.raises(ValueError, match="one entry per backend"):
+            RouterClient([make_backend("openai")], costs=[1.0, 2.0])
+    
+    def test_routes_to_lowest_latency_backend(self):
+        """Test requests go to the backend with the best recent latency."""
+        slow = make_backend("openai", "slow")
+        fast = make_backend("gemini", "fast")
+        router = RouterClient([slow, fast])
+        router.stats[0].record_success(2.0)
+        router.stats[1].record_success(0.2)
+        
+        assert router.invoke("Say {x}", x=1) == "fast"
+        slow.invoke.assert_not_called()
+        fast.invoke.assert_called_once_with("Say {x}", x=1)
+    
+    def test_unmeasured_backends_are_tried_first(self):
+        """Test backends without latency samples get explored."""
+        measured = make_backend("openai", "measured")
+        fresh = make_backend("gemini", "fresh")
+        router = RouterClient([measured, fresh])
+        router.stats[0].record_success(0.1)
+        
+        assert router.invoke_direct("Hello") == "fresh"
+    
+    def test_fails_over_to_next_backend(self):
+        """Test a failing backend is skipped in favor of the next best one."""
+        broken = make_backend("openai")
+        broken.invoke.side_effect = RuntimeError("503")
+        healthy = make_backend("gemini", "healthy")
+        router = RouterClient([broken, healthy])
+        
+        assert router.invoke("Say {x}", x=1) == "healthy"
+        stats = router.get_stats()
+        assert stats[0]['failures'] == 1
+        assert stats[0]['error_rate'] > 0
+        assert stats[1]['requests'] == 1
+    
+    def test_degraded_backend_is_deprioritized(self):
+        """Test repeated failures put a backend behind healthy ones."""
+        flaky = make_backend("openai")
+        flaky.invoke.side_effect = RuntimeError("429")
+        healthy = make_backend("gemini", "healthy")
+        router = RouterClient([flaky, healthy], failure_threshold=2, cooldown=60)
+        router.stats[1].record_success(5.0)  # slower, but healthy
+        
+        for _ in range(2):
+            router.stats[0].record_failure(router.cooldown, router.failure_threshold)
+        
+        assert router.get_stats()[0]['degraded']
+        assert router.ranked_backends() == [1, 0]
+    
+    def test_all_backends_fail_raises_last_error(self):
+        """Test an error is raised when every backend fails."""
+        first = make_backend("openai")
+        first.invoke.side_effect = RuntimeError("first")
+        second = make_backend("gemini")
+        second.invoke.side_effect = RuntimeError("second")
+        router = RouterClient([first, second])
+        
+        with pytest.raises(RuntimeError):
+            router.invoke("Say {x}", x=1)
+    
+    def test_cost_policy(self):
+        """Test the cost policy prefers the cheaper backend."""
+        expensive = make_backend("openai", "expensive")
+        cheap = make_backend("gemini", "cheap")
+        router = RouterClient([expensive, cheap], policy="cost", costs=[5.0, 0.5])
+        
+        assert router.invoke("Say {x}", x=1) == "cheap"
+    
+    def test_ainvoke_fails_over(self):
+        """Test the async path fails over as well."""
+        broken = make_backend("openai")
+        broken.ainvoke = AsyncMock(side_effect=RuntimeError("timeout"))
+        healthy = make_backend("gemini", "async healthy")
+        router = RouterClient([broken, healthy])
+        
+        assert asyncio.run(router.ainvoke("Say {x}", x=1)) == "async healthy"
+    
+    def test_invoke_batch_resends_failed_items(self):
+        """Test failed batch items are re-sent to the next backend."""
+        first = make_backend("openai")
+        first.invoke_batch.return_value = ["a", RuntimeError("429"), "c"]
+        second = make_backend("gemini")
+        second.invoke_batch.return_value = ["b"]
+        router = RouterClient([first, second])
+        
+        results = router.invoke_batch("Say {x}", [{"x": "a"}, {"x": "b"}, {"x": "c"}])
+        
+        assert results == ["a", "b", "c"]
+        second.invoke_batch.assert_called_once_with("Say {x}", [{"x": "b"}], max_concurrency=8)
+    
+    @pytest.mark.parametrize('template, kwargs', [("Say {word}", {}), ("Say {", {})])
+    def test_invalid_request_is_raised_before_routing(self, template, kwargs):
+        """Test a prompt that cannot be rendered is raised without calling or penalizing any backend."""
+        first = make_backend("openai")
+        second = make_backend("gemini")
+        router = RouterClient([first, second], failure_threshold=1)
+        
+        with pytest.raises((KeyError, ValueError)):
+            router.invoke(template, **kwargs)
+        with pytest.raises((KeyError, ValueError)):
+            asyncio.run(router.ainvoke(template, **kwargs))
+        with pytest.raises((KeyError, ValueError)):
+            list(router.stream(template, **kwargs))
+        
+        first.invoke.assert_not_called()
+        first.ainvoke.assert_not_called()
+        first.stream.assert_not_called()
+        assert all(stats['failures'] == 0 for stats in router.get_stats())
+    
+    def test_backend_value_errors_fail_over(self):
+        """Test backend errors that subclass ValueError (e.g. bad JSON) still fail over and degrade."""
+        broken = make_backend("openai")
+        broken.invoke.side_effect = json.JSONDecodeError("Expecting value", "", 0)
+        healthy = make_backend("gemini", "healthy")
+        router = RouterClient([broken, healthy], failure_threshold=1)
+        
+        assert router.invoke("Say {x}", x=1) == "healthy"
+        assert router.get_stats()[0]['degraded']
+    
+    def test_invoke_batch_does_not_send_invalid_items(self):
+        """Test batch items whose prompt cannot be rendered are returned as errors, not sent."""
+        first = make_backend("openai")
+        first.invoke_batch.return_value = ["a", RuntimeError("429")]
+        second = make_backend("gemini")
+        second.invoke_batch.return_value = ["c"]
+        router = RouterClient([first, second])
+        
+        results = router.invoke_batch("Say {x}", [{"x": "a"}, {}, {"x": "c"}])
+        
+        assert results[0] == "a" and isinstance(results[1], KeyError) and results[2] == "c"
+        first.invoke_batch.assert_called_once_with("Say {x}", [{"x": "a"}, {"x": "c"}], max_concurrency=8)
+        second.invoke_batch.assert_called_once_with("Say {x}", [{"x": "c"}], max_concurrency=8)
+    
+    def test_stream_fails_over_before_first_chunk(self):
+        """Test streaming fails over if a backend errors before yielding."""
+        def broken_stream(*args, **kwargs):
+            raise RuntimeError("connect failed")
+            yield  # pragma: no cover
+        
+        broken = make_backend("openai")
+        broken.stream.side_effect = broken_stream
+        healthy = make_backend("gemini")
+        healthy.stream.side_effect = lambda *args, **kwargs: iter(["a", "b"])
+        router = RouterClient([broken, healthy])
+        
+        assert list(router.stream("Say {x}", x=1)) == ["a", "b"]
+    
+    def test_accepted_by_prompt_improver_and_strategies(self):
+        """Test RouterClient can be used wherever an LLMClient is accepted."""
+        router = RouterClient([make_backend("openai"), make_backend("gemini")])
+        
+        improver = PromptImprover(llm_client=router)
+        strategy = RoleStrategy(llm_client=router)
+        
+        assert improver.llm_client is router
+        assert strategy.llm_client is router
+        assert "Explain recursion" in improver.improve("Explain recursion", strategy='role')
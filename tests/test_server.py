@@ -0,0 +1,207 @@
+"""
+Unit tests for the asyncio HTTP service.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from improver import PromptImprover
+from server import ImproverServer
+
+
+async def request(port, method, path, payload=None, raw_body=None, headers=None):
+    """Send one request on a fresh connection and return (status, JSON body)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = raw_body if raw_body is not None else (json.dumps(payload).encode() if payload is not None else b"")
+    head = f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+    if method == "POST":
+        head += f"Content-Length: {len(body)}\r\n"
+    for name, value in (headers or {}).items():
+        head += f"{name}: {value}\r\n"
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status_line, _, rest = response.partition(b"\r\n")
+    return int(status_line.split()[1]), json.loads(rest.split(b"\r\n\r\n", 1)[1])
+
+
+def with_server(test, **kwargs):
+    """Run test(server) against a started server on a free port."""
+    async def run():
+        server = ImproverServer(PromptImprover(offline=True), port=0, **kwargs)
+        await server.start()
+        try:
+            return await test(server)
+        finally:
+            await server.shutdown(timeout=1)
+    return asyncio.run(run())
+
+
+class TestImproverServer:
+    """Tests for ImproverServer endpoints, HTTP handling and shutdown."""
+    
+    def test_health(self):
+        """Test GET /health reports ok."""
+        status, body = with_server(lambda s: request(s.port, "GET", "/health"))
+        assert (status, body) == (200, {"status": "ok"})
+    
+    def test_strategies(self):
+        """Test GET /strategies lists every strategy with its name and canonical key."""
+        status, body = with_server(lambda s: request(s.port, "GET", "/strategies"))
+        
+        assert status == 200
+        keys = [info["key"] for info in body["strategies"]]
+        assert keys == PromptImprover(offline=True).get_available_strategies()
+        assert {"name": "Chain of Thought", "key": "cot", "canonical": "cot"} in body["strategies"]
+    
+    def test_improve(self):
+        """Test POST /improve returns the improved prompt."""
+        payload = {"prompt": "Cook", "strategy": "role", "kwargs": {"role": "a chef"}}
+        status, body = with_server(lambda s: request(s.port, "POST", "/improve", payload))
+        
+        assert status == 200
+        assert body == {"strategy": "role",
+                        "improved_prompt": PromptImprover(offline=True).improve("Cook", "role", role="a chef")}
+    
+    def test_improve_errors(self):
+        """Test invalid /improve requests get a 400 with an error message."""
+        async def test(server):
+            return [
+                await request(server.port, "POST", "/improve", {"prompt": "x", "strategy": "nope"}),
+                await request(server.port, "POST", "/improve", {"prompt": 1, "strategy": "cot"}),
+                await request(server.port, "POST", "/improve", raw_body=b"{oops"),
+                await request(server.port, "POST", "/improve", [1]),
+                await request(server.port, "POST", "/improve", {"prompt": "x", "strategy": "cot", "kwargs": 3}),
+            ]
+        
+        results = with_server(test)
+        assert [status for status, _ in results] == [400] * 5
+        assert "Unknown strategy" in results[0][1]["error"]
+        assert results[2][1]["error"].startswith("Invalid JSON")
+    
+    def test_batch(self):
+        """Test POST /batch improves each item and reports errors per item."""
+        payload = {
+            "strategy": "cot",
+            "items": ["a", {"id": "x", "prompt": "b", "strategy": "sot", "kwargs": {"num_points": 2}},
+                      {"prompt": "c", "strategy": "nope"}, 5],
+        }
+        status, body = with_server(lambda s: request(s.port, "POST", "/batch", payload))
+        
+        improver = PromptImprover(offline=True)
+        assert status == 200
+        results = body["results"]
+        assert results[0] == {"id": 0, "strategy": "cot", "improved_prompt": improver.improve("a", "cot")}
+        assert results[1] == {"id": "x", "strategy": "sot", "improved_prompt": improver.improve("b", "sot", num_points=2)}
+        assert "Unknown strategy" in results[2]["error"]
+        assert results[3]["error"] == "Expected a JSON object or string"
+    
+    def test_batch_requires_items(self):
+        """Test /batch without an items array gets a 400."""
+        status, body = with_server(lambda s: request(s.port, "POST", "/batch", {"items": "a"}))
+        assert status == 400
+    
+    def test_routing_errors(self):
+        """Test unknown paths get a 404, wrong methods a 405, and query strings are ignored."""
+        async def test(server):
+            return [
+                (await request(server.port, "GET", "/nope"))[0],
+                (await request(server.port, "GET", "/improve"))[0],
+                (await request(server.port, "GET", "/health?verbose=1"))[0],
+            ]
+        
+        assert with_server(test) == [404, 405, 200]
+    
+    def test_body_limits(self):
+        """Test oversized bodies get a 413 and chunked bodies a 501."""
+        async def test(server):
+            return [
+                (await request(server.port, "POST", "/improve", raw_body=b"", headers={"Content-Length": "100"}))[0],
+                (await request(server.port, "POST", "/improve", raw_body=b"{}",
+                               headers={"Transfer-Encoding": "chunked"}))[0],
+            ]
+        
+        assert with_server(test, max_body_size=10) == [413, 501]
+    
+    def test_lines_over_stream_limit_are_rejected(self):
+        """Test request and header lines past the StreamReader limit get a 400 response."""
+        async def test(server):
+            long = "x" * (70 * 1024)
+            return [
+                await request(server.port, "GET", "/" + long),
+                await request(server.port, "GET", "/health", headers={"X-Long": long}),
+            ]
+        
+        assert with_server(test) == [
+            (400, {"error": "Request line too long"}),
+            (400, {"error": "Request headers too large"}),
+        ]
+    
+    def test_keep_alive(self):
+        """Test several requests are served on one keep-alive connection."""
+        async def test(server):
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            body = json.dumps({"prompt": "x", "strategy": "cot"}).encode()
+            statuses = []
+            for _ in range(3):
+                writer.write(f"POST /improve HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+                await writer.drain()
+                status_line = await reader.readline()
+                headers = {}
+                while (line := await reader.readline()) != b"\r\n":
+                    name, _, value = line.decode().partition(":")
+                    headers[name.lower()] = value.strip()
+                await reader.readexactly(int(headers["content-length"]))
+                statuses.append((int(status_line.split()[1]), headers["connection"]))
+            writer.close()
+            return statuses
+        
+        assert with_server(test) == [(200, "keep-alive")] * 3
+    
+    def test_graceful_shutdown(self):
+        """Test shutdown finishes in-flight requests, closes idle connections and refuses new ones."""
+        class SlowImprover(PromptImprover):
+            async def aimprove(self, prompt, strategy, **kwargs):
+                await asyncio.sleep(0.2)
+                return prompt
+            
+            async def aimprove_batch(self, prompts, strategy, **kwargs):
+                await asyncio.sleep(0.2)
+                return prompts
+        
+        async def run():
+            server = ImproverServer(SlowImprover(offline=True), port=0)
+            await server.start()
+            idle_reader, idle_writer = await asyncio.open_connection("127.0.0.1", server.port)
+            in_flight = asyncio.ensure_future(
+                request(server.port, "POST", "/improve", {"prompt": "done", "strategy": "cot"})
+            )
+            await asyncio.sleep(0.05)
+            await server.shutdown(timeout=5)
+            
+            # The in-flight request completes, the idle connection is closed, new ones are refused
+            assert await in_flight == (200, {"strategy": "cot", "improved_prompt": "done"})
+            assert await idle_reader.read() == b""
+            try:
+                await request(server.port, "GET", "/health")
+            except OSError:
+                return True
+            return False
+        
+        assert asyncio.run(run())
+    
+    def test_handle_without_sockets(self):
+        """Test handle() serves requests without starting the server."""
+        async def run():
+            server = ImproverServer()
+            return await server.handle("POST", "/improve", b'{"prompt": "x", "strategy": "cot"}')
+        
+        status, body = asyncio.run(run())
+        assert status == 200
+        assert body["improved_prompt"] == PromptImprover(offline=True).improve("x", "cot")
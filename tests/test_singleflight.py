@@ -0,0 +1,181 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+
+import asyncio
+import sys
+import os
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from singleflight import SingleFlight
+from llm_client import LLMClient
+
+
+def run_threads(count, target):
+    """Start count threads running target(index), released together, and join them."""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    
+    def worker(i):
+        barrier.wait()
+        results[i] = target(i)
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight and its use in LLMClient."""
+    
+    def test_concurrent_callers_share_one_call(self):
+        """Test concurrent sync callers with the same key run fn once."""
+        flight = SingleFlight()
+        calls = []
+        
+        def work():
+            calls.append(1)
+            time.sleep(0.2)
+            return "shared"
+        
+        results = run_threads(5, lambda i: flight.do("key", work))
+        
+        assert results == ["shared"] * 5
+        assert len(calls) == 1
+        stats = flight.get_stats()
+        assert stats['calls'] == 5
+        assert stats['executed'] == 1
+        assert stats['coalesced'] == 4
+        assert stats['in_flight'] == 0
+    
+    def test_different_keys_are_not_coalesced(self):
+        """Test callers with different keys each run their own call."""
+        flight = SingleFlight()
+        
+        assert flight.do("a", lambda: 1) == 1
+        assert flight.do("b", lambda: 2) == 2
+        assert flight.do("a", lambda: 3) == 3
+        assert flight.get_stats()['coalesced'] == 0
+    
+    def test_error_is_shared_and_not_remembered(self):
+        """Test waiting callers receive the leader's exception and the key is released."""
+        flight = SingleFlight()
+        
+        def fail():
+            time.sleep(0.2)
+            raise RuntimeError("provider down")
+        
+        def call(i):
+            try:
+                return flight.do("key", fail)
+            except RuntimeError as e:
+                return str(e)
+        
+        assert run_threads(3, call) == ["provider down"] * 3
+        assert flight.do("key", lambda: "recovered") == "recovered"
+    
+    def test_async_callers_share_one_call(self):
+        """Test concurrent coroutines with the same key await one call."""
+        flight = SingleFlight()
+        calls = []
+        
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "shared"
+        
+        async def main():
+            return await asyncio.gather(*(flight.ado("key", work) for _ in range(4)))
+        
+        assert asyncio.run(main()) == ["shared"] * 4
+        assert len(calls) == 1
+        assert flight.get_stats()['coalesced'] == 3
+        assert flight.get_stats()['in_flight'] == 0
+    
+    def test_async_cancelled_caller_does_not_cancel_others(self):
+        """Test cancelling one waiter leaves the shared call running for the rest."""
+        flight = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+        
+        async def main():
+            first = asyncio.ensure_future(flight.ado("key", work))
+            second = asyncio.ensure_future(flight.ado("key", work))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+        
+        assert asyncio.run(main()) == "done"
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_client_coalesces_identical_rendered_prompts(self, mock_chat_openai):
+        """Test LLMClient coalesces requests whose rendered prompts are identical."""
+        calls = []
+        
+        def slow_model(prompt_value):
+            calls.append(prompt_value.to_string())
+            time.sleep(0.2)
+            return "answer"
+        
+        client = LLMClient(provider="openai", coalescer=SingleFlight())
+        client.llm = RunnableLambda(slow_model)
+        
+        # Different templates and variables that render to the same prompt
+        requests = [
+            lambda: client.invoke("Improve: {prompt}", prompt="hello"),
+            lambda: client.invoke("Improve: hello"),
+            lambda: client.invoke("{verb}: {prompt}", verb="Improve", prompt="hello"),
+        ]
+        results = run_threads(3, lambda i: requests[i]())
+        
+        assert results == ["answer"] * 3
+        assert len(calls) == 1
+        assert client.get_coalescing_stats()['coalesced'] == 2
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_llm_client_async_coalescing(self, mock_chat_openai):
+        """Test concurrent ainvoke calls for the same prompt share one model call."""
+        calls = []
+        
+        async def slow_model(prompt_value):
+            calls.append(prompt_value.to_string())
+            await asyncio.sleep(0.05)
+            return "answer"
+        
+        client = LLMClient(provider="openai", coalescer=SingleFlight())
+        client.llm = RunnableLambda(lambda x: x, afunc=slow_model)
+        
+        async def main():
+            return await asyncio.gather(
+                client.ainvoke("Say {word}", word="hi"),
+                client.ainvoke("Say {word}", word="hi"),
+                client.ainvoke("Say {word}", word="bye"),
+            )
+        
+        assert asyncio.run(main()) == ["answer"] * 3
+        assert sorted(calls) == ["Human: Say bye", "Human: Say hi"]
+        assert client.get_coalescing_stats()['coalesced'] == 1
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('llm_client.ChatOpenAI')
+    def test_coalescing_disabled_by_default(self, mock_chat_openai):
+        """Test LLMClient does not coalesce unless a SingleFlight is given."""
+        client = LLMClient(provider="openai")
+        
+        assert client.coalescer is None
+        assert client.get_coalescing_stats() is None
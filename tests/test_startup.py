@@ -0,0 +1,86 @@
+"""
+Startup-time regression tests based on `python -X importtime`.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Provider SDKs that must only be imported when a provider model is built
+PROVIDER_MODULES = ('langchain_openai', 'langchain_google_genai', 'openai', 'google.generativeai')
+
+
+def imported_modules(*args, api_keys=True, daemon_socket=None):
+    """Run the interpreter with -X importtime and return the set of imported module names."""
+    env = {k: v for k, v in os.environ.items() if k not in ('OPENAI_API_KEY', 'GOOGLE_API_KEY')}
+    # Never forward to a daemon the developer may have running
+    env['PROMPT_IMPROVER_SOCKET'] = daemon_socket or str(PROJECT_ROOT / 'no-such-daemon.sock')
+    if api_keys:
+        env.update(OPENAI_API_KEY='test-key', GOOGLE_API_KEY='test-key')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    
+    modules = set()
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if line.startswith('import time:') and '|' in line:
+            name = line.rsplit('|', 1)[1].strip()
+            if name != 'imported package':
+                modules.add(name)
+    return modules
+
+
+class TestStartup:
+    """Tests that importing and starting the CLI stays cheap."""
+    
+    def test_import_llm_client_skips_provider_sdks(self):
+        """Test importing llm_client does not import any provider SDK."""
+        modules = imported_modules('-c', 'import llm_client')
+        
+        assert 'llm_client' in modules
+        assert not modules.intersection(PROVIDER_MODULES)
+    
+    def test_import_llm_client_defers_dotenv(self):
+        """Test importing llm_client does not load .env as a side effect."""
+        modules = imported_modules('-c', 'import llm_client')
+        
+        assert 'dotenv' not in modules
+    
+    def test_list_strategies_skips_provider_sdks(self):
+        """Test `main.py --list-strategies` never imports a provider SDK."""
+        modules = imported_modules('main.py', '--list-strategies')
+        
+        assert 'improver' in modules
+        assert not modules.intersection(PROVIDER_MODULES)
+    
+    def test_offline_cli_needs_no_api_key_or_sdk(self):
+        """Test `main.py --offline` runs without API keys, provider SDKs or .env loading."""
+        modules = imported_modules(
+            'main.py', 'Explain recursion', '--strategy', 'cot', '--offline', api_keys=False
+        )
+        
+        assert 'improver' in modules
+        assert not modules.intersection(PROVIDER_MODULES)
+        assert 'dotenv' not in modules
+    
+    def test_offline_cli_skips_langchain_core(self):
+        """Test `main.py --offline` and `--list-strategies` never import langchain_core."""
+        offline = imported_modules('main.py', 'Explain recursion', '--strategy', 'cot', '--offline')
+        listing = imported_modules('main.py', '--list-strategies')
+        
+        assert 'improver' in offline and 'improver' in listing
+        assert 'langchain_core' not in offline
+        assert 'langchain_core' not in listing
@@ -0,0 +1,157 @@
+"""
+Unit tests for the lazy strategy registry.
+"""
+
+import sys
+from importlib.metadata import EntryPoint
+from pathlib import Path
+from unittest.mock import Mock, patch
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from improver import PromptImprover
+from strategies import ChainOfThoughtStrategy, RoleStrategy
+from strategies.base import BaseStrategy
+from strategies.registry import StrategyMap, StrategyRegistry
+
+PLUGIN_SOURCE = '''
+from strategies.base import BaseStrategy
+
+
+class EchoStrategy(BaseStrategy):
+    def improve(self, prompt, **kwargs):
+        return f"Echo: {prompt}"
+
+    def get_strategy_name(self):
+        return "Echo"
+'''
+
+
+class UpperStrategy(BaseStrategy):
+    """Minimal strategy used to test registration."""
+    
+    def improve(self, prompt: str, **kwargs) -> str:
+        return prompt.upper()
+    
+    def get_strategy_name(self) -> str:
+        return "Upper"
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch):
+    """Write an importable third-party strategy module that is not yet imported."""
+    (tmp_path / 'echo_plugin.py').write_text(PLUGIN_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield 'echo_plugin'
+    sys.modules.pop('echo_plugin', None)
+
+
+class TestStrategyRegistry:
+    """Tests for StrategyRegistry, StrategyMap and their use in PromptImprover."""
+    
+    def test_aliases_resolve_to_canonical_key(self):
+        """Test aliases and mixed case resolve to one canonical key."""
+        registry = StrategyRegistry(entry_point_group=None)
+        
+        assert registry.resolve('cot') == 'cot'
+        assert registry.resolve('Chain-Of-Thought') == 'cot'
+        assert registry.resolve('tree-of-thought') == 'tot'
+        assert registry.resolve('skeleton-of-thought') == 'sot'
+        assert registry.aliases('cot') == ['chain-of-thought']
+        with pytest.raises(KeyError):
+            registry.resolve('unknown')
+    
+    def test_names_keep_aliases_next_to_their_key(self):
+        """Test all names are listed, each canonical key followed by its aliases."""
+        registry = StrategyRegistry(entry_point_group=None)
+        
+        assert registry.names() == [
+            'role', 'few-shot', 'cot', 'chain-of-thought', 'self-consistency',
+            'tot', 'tree-of-thought', 'sot', 'skeleton-of-thought', 'react'
+        ]
+        assert registry.keys() == ['role', 'few-shot', 'cot', 'self-consistency', 'tot', 'sot', 'react']
+    
+    def test_get_class_imports_builtins(self):
+        """Test built-in import paths resolve to the strategy classes."""
+        registry = StrategyRegistry(entry_point_group=None)
+        
+        assert registry.get_class('role') is RoleStrategy
+        assert registry.get_class('chain-of-thought') is ChainOfThoughtStrategy
+    
+    def test_register_rejects_taken_names(self):
+        """Test a name cannot be registered for two different strategies."""
+        registry = StrategyRegistry(entry_point_group=None)
+        
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register('upper', UpperStrategy, aliases=('cot',))
+        
+        registry.register('upper', UpperStrategy, aliases=('shout',))
+        assert registry.get_class('SHOUT') is UpperStrategy
+    
+    def test_strategy_map_builds_lazily_and_shares_alias_instances(self):
+        """Test instances are built on first access and aliases share them."""
+        strategies = StrategyMap(StrategyRegistry(entry_point_group=None), llm_client=Mock())
+        
+        assert strategies.built() == []
+        assert 'tree-of-thought' in strategies
+        assert 'unknown' not in strategies
+        assert len(strategies) == 10
+        assert strategies.built() == []
+        
+        assert strategies['cot'] is strategies['chain-of-thought']
+        assert strategies.built() == ['cot']
+        with pytest.raises(KeyError):
+            strategies['unknown']
+    
+    def test_strategy_map_offline(self):
+        """Test an offline map builds offline strategies."""
+        strategies = StrategyMap(StrategyRegistry(entry_point_group=None), offline=True)
+        
+        assert strategies['role'].offline
+        assert "Explain recursion" in strategies['role'].improve("Explain recursion")
+    
+    def test_strategy_map_offline_without_offline_parameter(self):
+        """Test plugin strategies whose __init__ takes no offline argument are still built offline."""
+        class LegacyStrategy(UpperStrategy):
+            def __init__(self, llm_client=None):
+                super().__init__(llm_client)
+        
+        registry = StrategyRegistry(entry_point_group=None)
+        registry.register('legacy', LegacyStrategy)
+        strategies = StrategyMap(registry, offline=True)
+        
+        assert strategies['legacy'].offline
+        assert strategies['legacy'].improve("hi") == "HI"
+        with pytest.raises(RuntimeError, match="offline"):
+            strategies['legacy'].llm_client
+    
+    def test_entry_point_strategies_load_on_demand(self, plugin_module):
+        """Test entry point strategies are discovered without importing them until used."""
+        entry_points = [
+            EntryPoint('echo', f'{plugin_module}:EchoStrategy', 'prompt_improver.strategies'),
+            EntryPoint('repeat', f'{plugin_module}:EchoStrategy', 'prompt_improver.strategies'),
+        ]
+        registry = StrategyRegistry()
+        
+        with patch('importlib.metadata.entry_points', return_value=entry_points) as mock_entry_points:
+            assert registry.resolve('role') == 'role'
+            mock_entry_points.assert_not_called()
+            
+            assert registry.resolve('repeat') == 'echo'
+            assert plugin_module not in sys.modules
+            
+            improver = PromptImprover(offline=True, registry=registry)
+            assert improver.improve("hi", strategy='echo') == "Echo: hi"
+            assert plugin_module in sys.modules
+            mock_entry_points.assert_called_once_with(group='prompt_improver.strategies')
+    
+    def test_improver_builds_strategies_on_first_use(self):
+        """Test PromptImprover construction instantiates no strategy."""
+        improver = PromptImprover(llm_client=Mock())
+        
+        assert improver.strategies.built() == []
+        improver.improve("Solve 2 + 2", strategy='chain-of-thought')
+        assert improver.strategies.built() == ['cot']
+        assert improver.get_strategy_info('chain-of-thought')['canonical'] == 'cot'
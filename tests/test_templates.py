@@ -0,0 +1,73 @@
+"""
+Unit tests for precompiled strategy templates.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from strategies import (
+    ChainOfThoughtStrategy,
+    SelfConsistencyStrategy,
+    TreeOfThoughtStrategy,
+    SkeletonOfThoughtStrategy,
+    ReActStrategy
+)
+from strategies.templates import CompiledTemplate
+
+TEMPLATED_STRATEGIES = [
+    ChainOfThoughtStrategy,
+    SelfConsistencyStrategy,
+    TreeOfThoughtStrategy,
+    SkeletonOfThoughtStrategy,
+    ReActStrategy,
+]
+
+PROMPTS = [
+    "Explain recursion",
+    "",
+    "Braces {stay} {{as}} they are",
+    "Multi-line\n\nprompt with trailing spaces   \n",
+    "Ünïcödé — 日本語 ✓",
+]
+
+
+class TestCompiledTemplate:
+    """Tests for CompiledTemplate and the strategies built on it."""
+    
+    def test_render(self):
+        """Test rendering fills every variable."""
+        template = CompiledTemplate("Task: {prompt} ({n})", ["prompt", "n"])
+        
+        assert template.render(prompt="x", n=3) == "Task: x (3)"
+        assert template.render(prompt="x", n=3, unused="y") == "Task: x (3)"
+        with pytest.raises(KeyError):
+            template.render(prompt="x")
+    
+    def test_variables_are_validated_once(self):
+        """Test placeholders must match the declared input variables."""
+        with pytest.raises(ValueError, match="do not match"):
+            CompiledTemplate("Task: {prompt}", ["prompt", "n"])
+        with pytest.raises(ValueError, match="do not match"):
+            CompiledTemplate("Task: {prompt} {n}", ["prompt"])
+    
+    @pytest.mark.parametrize('strategy_class', TEMPLATED_STRATEGIES)
+    def test_templates_compile_once_per_class(self, strategy_class):
+        """Test strategies share one class-level compiled template."""
+        assert isinstance(strategy_class.TEMPLATE, CompiledTemplate)
+        assert strategy_class(offline=True).TEMPLATE is strategy_class.TEMPLATE
+    
+    @pytest.mark.parametrize('strategy_class', TEMPLATED_STRATEGIES)
+    def test_output_matches_prompt_template(self, strategy_class):
+        """Test the fast renderer is byte-identical to langchain's PromptTemplate."""
+        compiled = strategy_class.TEMPLATE
+        prompt_template = compiled.to_prompt_template()
+        extra = {'num_paths': 4, 'num_branches': 7, 'num_points': 2, 'domain_context': " in the domain of law"}
+        
+        for prompt in PROMPTS:
+            variables = {name: extra.get(name, prompt) for name in compiled.input_variables}
+            variables['prompt'] = prompt
+            assert compiled.render(**variables) == prompt_template.format(**variables)
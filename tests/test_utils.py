@@ -10,7 +10,7 @@ import pytest
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils import print_improved_prompt, print_error, print_info
+from utils import print_improved_prompt, print_improved_prompt_stream, print_error, print_info
 
 
 class TestUtils:
@@ -34,6 +34,26 @@ class TestUtils:
         # Verify print was called (at least once for panels and text)
         assert mock_console.print.call_count >= 3
     
+    @patch('utils.Live')
+    @patch('utils.Console')
+    def test_print_improved_prompt_stream(self, mock_console_class, mock_live_class):
+        """Test print_improved_prompt_stream renders chunks as they arrive."""
+        mock_console = MagicMock()
+        mock_console_class.return_value = mock_console
+        mock_live = MagicMock()
+        mock_live_class.return_value.__enter__.return_value = mock_live
+        
+        result = print_improved_prompt_stream(
+            original="Original prompt",
+            chunks=iter(["Improved ", "prompt"]),
+            strategy="role"
+        )
+        
+        assert result == "Improved prompt"
+        mock_console_class.assert_called_once()
+        mock_live_class.assert_called_once()
+        assert mock_live.refresh.call_count == 2
+    
     @patch('utils.Console')
     def test_print_error(self, mock_console_class):
         """Test print_error function."""
@@ -68,3 +88,13 @@ class TestUtils:
         assert "Info:" in call_args
         assert "Test info message" in call_args
 
+    
+    @patch('utils.Console')
+    def test_print_improved_prompt_to_given_console(self, mock_console_class):
+        """Test print_improved_prompt prints to a given console instead of creating one."""
+        console = MagicMock()
+        
+        print_improved_prompt("Original prompt", "Improved prompt", "role", console)
+        
+        mock_console_class.assert_not_called()
+        assert console.print.call_count >= 3
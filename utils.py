@@ -1,10 +1,11 @@
 from rich.console import Console
 from rich.text import Text
 from rich.panel import Panel
-from typing import Optional
+from rich.live import Live
+from typing import Dict, Iterable, Optional, Union
 
 
-def print_improved_prompt(original: str, improved: str, strategy: str):
+def print_improved_prompt(original: str, improved: str, strategy: str, console: Optional[Console] = None):
     """
     Print the original and improved prompts with colored formatting.
     
@@ -12,8 +13,9 @@ def print_improved_prompt(original: str, improved: str, strategy: str):
         original: Original prompt
         improved: Improved prompt
         strategy: Strategy name used
+        console: Console to print to (default: a new Console on stdout)
     """
-    console = Console()
+    console = console or Console()
     
     # Print original prompt
     console.print(Panel(
@@ -39,14 +41,104 @@ def print_improved_prompt(original: str, improved: str, strategy: str):
     console.print(f"[yellow]{'='*70}[/yellow]")
 
 
-def print_error(message: str):
+def print_improved_prompt_stream(
+    original: str,
+    chunks: Iterable[str],
+    strategy: str,
+    console: Optional[Console] = None
+) -> str:
+    """
+    Print the original prompt, then render the improved prompt as chunks arrive.
+    
+    Args:
+        original: Original prompt
+        chunks: Iterable of improved prompt chunks (e.g. from improve_stream)
+        strategy: Strategy name used
+        console: Console to print to (default: a new Console on stdout)
+        
+    Returns:
+        The full improved prompt
+    """
+    console = console or Console()
+    
+    # Print original prompt
+    console.print(Panel(
+        Text(original, style="blue"),
+        title="[bold green]Original Prompt[/bold green]",
+        border_style="green"
+    ))
+    
+    console.print()
+    
+    # Print strategy info
+    console.print(f"[bold yellow]Strategy:[/bold yellow] [cyan]{strategy}[/cyan]")
+    console.print()
+    
+    # Render the improved prompt panel, updating it as each chunk arrives
+    improved = Text(style="bright_blue")
+    panel = Panel(
+        improved,
+        title="[bold green]Improved Prompt[/bold green]",
+        border_style="bright_green"
+    )
+    with Live(panel, console=console, refresh_per_second=20, transient=False) as live:
+        for chunk in chunks:
+            improved.append(chunk)
+            live.refresh()
+    
+    console.print()
+    console.print(f"[yellow]{'='*70}[/yellow]")
+    return improved.plain
+
+
+def print_improved_prompts(
+    original: str,
+    results: Dict[str, Union[str, Exception]],
+    strategies: Dict[str, str],
+    console: Optional[Console] = None
+):
+    """
+    Print the original prompt once, then the improved prompt of each strategy.
+    
+    Args:
+        original: Original prompt
+        results: Improved prompt (or exception) per strategy key, e.g. from improve_all
+        strategies: Display name per strategy key
+        console: Console to print to (default: a new Console on stdout)
+    """
+    console = console or Console()
+    
+    # Print original prompt
+    console.print(Panel(
+        Text(original, style="blue"),
+        title="[bold green]Original Prompt[/bold green]",
+        border_style="green"
+    ))
+    
+    for key, improved in results.items():
+        console.print()
+        console.print(f"[bold yellow]Strategy:[/bold yellow] [cyan]{strategies.get(key, key)}[/cyan]")
+        if isinstance(improved, Exception):
+            console.print(f"[bold red]Error:[/bold red] {improved}")
+            continue
+        console.print(Panel(
+            Text(improved, style="bright_blue"),
+            title="[bold green]Improved Prompt[/bold green]",
+            border_style="bright_green"
+        ))
+    
+    console.print()
+    console.print(f"[yellow]{'='*70}[/yellow]")
+
+
+def print_error(message: str, console: Optional[Console] = None):
     """Print an error message with colored formatting."""
-    console = Console()
+    console = console or Console()
     console.print(f"[bold red]Error:[/bold red] {message}")
 
 
-def print_info(message: str):
+def print_info(message: str, console: Optional[Console] = None):
     """Print an info message with colored formatting."""
-    console = Console()
+    console = console or Console()
     console.print(f"[bold cyan]Info:[/bold cyan] {message}")
 